@@ -0,0 +1,35 @@
+"""
+Gunicorn settings of the production WSGI server.
+
+Defaults follow the (2 x CPU) + 1 rule with a few threads per worker, and
+every value can be overridden per deployment.
+"""
+
+import multiprocessing
+from os import getenv
+
+bind = getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+workers = int(getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+
+threads = int(getenv("GUNICORN_THREADS", "4"))
+
+worker_class = "gthread"
+
+timeout = int(getenv("GUNICORN_TIMEOUT", "30"))
+
+graceful_timeout = int(getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+keepalive = int(getenv("GUNICORN_KEEPALIVE", "5"))
+
+max_requests = int(getenv("GUNICORN_MAX_REQUESTS", "2000"))
+
+max_requests_jitter = int(getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+# Each worker loads the application itself, so the loguru file sinks are opened
+# per process instead of being inherited from the master
+preload_app = False
+
+accesslog = "-"
+
+errorlog = "-"
@@ -95,6 +95,41 @@ DATABASES = {
     }
 }
 
+# One read replica alias per host in POSTGRES_REPLICA_HOSTS (comma separated),
+# with the primary's database name and credentials
+DATABASE_REPLICAS = []
+
+for number, host in enumerate(
+    filter(None, getenv("POSTGRES_REPLICA_HOSTS", "").split(",")), start=1
+):
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["core_apps.common.db_router.ReplicaRouter"]
+
+REDIS_CACHE_URL = getenv("REDIS_CACHE_URL")
+
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+            "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+        }
+    }
+else:
+    # Per-process stand-in, counters are not shared between workers
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
@@ -142,6 +177,8 @@ SITE_ID = 1
 STATIC_URL = '/static/'
 STATIC_ROOT = str(BASE_DIR / "staticfiles")
 
+STATEMENT_CACHE_DIR = getenv("STATEMENT_CACHE_DIR", str(BASE_DIR / "statement_cache"))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -234,9 +271,18 @@ CELERY_BEAT_SCHEDULE = {
     "apply-daily-interest": {
         "task": "apply_daily_interest",
     },
-    "detect-suspicious-activities": {
-        "task": "detect_suspicious_activities",
-    }
+    "checkpoint-ledger-balances": {
+        "task": "checkpoint_ledger_balances",
+    },
+    "evict-statement-cache": {
+        "task": "evict_statement_cache",
+    },
+    "maintain-transaction-partitions": {
+        "task": "maintain_transaction_partitions",
+    },
+    "resume-stale-payment-batches": {
+        "task": "resume_stale_payment_batches",
+    },
 }
 
 CLOUDINARY_CLOUD_NAME = getenv("CLOUDINARY_CLOUD_NAME")
@@ -0,0 +1,66 @@
+from os import getenv, path
+from django.core.exceptions import ImproperlyConfigured
+from dotenv import load_dotenv
+from .base import *  # noqa
+from .base import BASE_DIR, DATABASES
+
+
+production_env_file = path.join(BASE_DIR, ".envs", ".env.production")
+
+if path.isfile(production_env_file):
+    load_dotenv(production_env_file)
+
+SECRET_KEY = getenv("SECRET_KEY")
+
+# OTPs, pending operations, idempotency locks, login counters and refresh token
+# families must be shared by every worker process, so there is no LocMem fallback
+REDIS_CACHE_URL = getenv("REDIS_CACHE_URL")
+
+if not REDIS_CACHE_URL:
+    raise ImproperlyConfigured("REDIS_CACHE_URL must be set in production")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_CACHE_URL,
+        "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+    }
+}
+
+DEBUG = False
+
+SITE_NAME = getenv("SITE_NAME")
+
+ALLOWED_HOSTS = getenv("ALLOWED_HOSTS", "").split(",")
+
+ADMIN_URL = getenv("ADMIN_URL")
+
+EMAIL_BACKEND = "djcelery_email.backends.CeleryEmailBackend"
+EMAIL_HOST = getenv("EMAIL_HOST")
+EMAIL_PORT = getenv("EMAIL_PORT")
+EMAIL_HOST_USER = getenv("EMAIL_HOST_USER")
+EMAIL_HOST_PASSWORD = getenv("EMAIL_HOST_PASSWORD")
+EMAIL_USE_TLS = getenv("EMAIL_USE_TLS", "True") == "True"
+DEFAULT_FROM_EMAIL = getenv("DEFAULT_FROM_EMAIL")
+DOMAIN = getenv("DOMAIN")
+ADMIN_EMAIL = getenv("ADMIN_EMAIL")
+
+MAX_UPLOAD_SIZE = 1 * 1024 * 1024
+
+CSRF_TRUSTED_ORIGINS = getenv("CSRF_TRUSTED_ORIGINS", "").split(",")
+
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+
+LOCKOUT_DURATION = timedelta(minutes=int(getenv("LOCKOUT_MINUTES", "15")))
+
+LOGIN_ATTEMPTS = int(getenv("LOGIN_ATTEMPTS", "3"))
+
+OTP_EXPIRATION = timedelta(minutes=int(getenv("OTP_EXPIRATION_MINUTES", "5")))
+
+# Persistent connections: Postgres, and every replica, must accept
+# workers x threads connections per API container
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = int(getenv("CONN_MAX_AGE", "60"))
+    database["CONN_HEALTH_CHECKS"] = True
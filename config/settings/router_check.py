@@ -0,0 +1,30 @@
+"""
+Local settings with a SQLite primary and a SQLite "replica", for running
+check_replica_routing without a Postgres replica:
+
+    DJANGO_SETTINGS_MODULE=config.settings.router_check \
+        python manage.py check_replica_routing
+"""
+
+from .local import *  # noqa
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
+    "replica_1": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+        "TEST": {"MIRROR": "default"},
+    },
+}
+
+DATABASE_REPLICAS = ["replica_1"]
+
+# Sticky reads only need one process here
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from .models import BankAccount
+from .models import BalanceCheckpoint, BankAccount, BatchShard, LedgerEntry, PaymentBatch
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -118,4 +118,87 @@ class BankAccountAdmin(admin.ModelAdmin):
         if db_field.name == "verified_by":
             kwargs["queryset"] = User.objects.filter(is_staff=True)
 
-        return super().formfield_for_foreignkey(db_field, request, **kwargs)
\ No newline at end of file
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+@admin.register(BatchShard)
+class BatchShardAdmin(admin.ModelAdmin):
+    list_display = [
+        "job_name",
+        "run_key",
+        "lower_bound",
+        "upper_bound",
+        "status",
+        "attempts",
+        "finished_at",
+    ]
+    list_filter = ["job_name", "status"]
+    search_fields = ["run_key"]
+    readonly_fields = [
+        "job_name",
+        "run_key",
+        "lower_bound",
+        "upper_bound",
+        "result",
+        "error",
+        "started_at",
+        "finished_at",
+        "created_at",
+        "updated_at",
+    ]
+
+
+@admin.register(PaymentBatch)
+class PaymentBatchAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "user",
+        "sender_account",
+        "status",
+        "total_lines",
+        "succeeded_lines",
+        "failed_lines",
+        "total_amount",
+        "created_at",
+    ]
+    list_filter = ["status"]
+    search_fields = ["user__email", "sender_account__account_number"]
+    readonly_fields = [
+        "user",
+        "sender_account",
+        "total_lines",
+        "total_amount",
+        "succeeded_lines",
+        "failed_lines",
+        "started_at",
+        "finished_at",
+        "created_at",
+        "updated_at",
+    ]
+
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+    list_display = [
+        "account",
+        "system_account",
+        "entry_type",
+        "amount",
+        "transaction_id",
+        "created_at",
+    ]
+    list_filter = ["entry_type", "system_account"]
+    search_fields = ["account__account_number"]
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(BalanceCheckpoint)
+class BalanceCheckpointAdmin(admin.ModelAdmin):
+    list_display = ["account", "as_of", "balance"]
+    search_fields = ["account__account_number"]
+    readonly_fields = ["account", "as_of", "balance", "created_at", "updated_at"]
@@ -0,0 +1,84 @@
+from decimal import Decimal
+from typing import Dict, Optional
+
+from django.db import connection, models
+from django.utils import timezone
+
+from .models import BankAccount
+
+
+def adjust_balance(
+    instance: models.Model, field_name: str, delta: Decimal
+) -> Optional[Decimal]:
+    """
+    Add ``delta`` to a balance column with one conditional UPDATE ... RETURNING.
+
+    The row is only written when the balance stays non-negative, so a debit can
+    never race another one past zero. Returns the new balance (and sets it on
+    ``instance``), or None when the balance would have gone negative.
+    """
+    model = type(instance)
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.get_field(field_name).column)
+    pk_column = connection.ops.quote_name(model._meta.pk.column)
+
+    sql = f"""
+        UPDATE {table}
+        SET {column} = {column} + %s,
+            updated_at = %s
+        WHERE {pk_column} = %s
+          AND {column} + %s >= 0
+        RETURNING {column}
+    """
+    params = [
+        delta,
+        timezone.now(),
+        model._meta.pk.get_db_prep_value(instance.pk, connection),
+        delta,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+    new_balance = Decimal(row[0])
+    setattr(instance, field_name, new_balance)
+    return new_balance
+
+
+def adjust_account_balance(account: BankAccount, delta: Decimal) -> Optional[Decimal]:
+    return adjust_balance(account, "account_balance", delta)
+
+
+def adjust_card_balance(virtual_card, delta: Decimal) -> Optional[Decimal]:
+    return adjust_balance(virtual_card, "balance", delta)
+
+
+def credit_accounts(deltas: Dict[object, Decimal]) -> int:
+    """
+    Credit many bank accounts with one UPDATE ... FROM (VALUES ...).
+
+    ``deltas`` maps account primary keys to the (positive) amount to add.
+    Returns the number of accounts updated.
+    """
+    if not deltas:
+        return 0
+
+    table = connection.ops.quote_name(BankAccount._meta.db_table)
+    pk_field = BankAccount._meta.pk
+    values_sql = ", ".join(["(%s::uuid, %s::numeric)"] * len(deltas))
+
+    sql = f"""
+        UPDATE {table} AS a
+        SET account_balance = a.account_balance + v.delta,
+            updated_at = %s
+        FROM (VALUES {values_sql}) AS v (id, delta)
+        WHERE a.id = v.id
+    """
+    params = [timezone.now()]
+    for pk, delta in deltas.items():
+        params.extend([pk_field.get_db_prep_value(pk, connection), delta])
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
@@ -0,0 +1,173 @@
+from datetime import timedelta
+from decimal import Decimal
+from os import getenv
+from typing import Callable, Dict, List, Optional
+
+from celery import chord, group
+from dateutil import parser
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from loguru import logger
+
+from core_apps.common.db_router import read_from_replica
+
+from .emails import send_suspicious_activity_alert
+from .interest import run_daily_interest
+from .models import BankAccount, BatchShard
+from .suspicious import find_suspicious_activities
+
+BATCH_SHARD_SIZE = int(getenv("BATCH_SHARD_SIZE", "5000"))
+
+
+def _run_interest_shard(accounts: QuerySet, run_key: str) -> dict:
+    result = run_daily_interest(parser.parse(run_key).date(), accounts=accounts)
+    return {
+        "processed": result.accounts_processed,
+        "credited": result.accounts_credited,
+        "total_interest": str(result.total_interest),
+    }
+
+
+def _finalize_interest(run_key: str, results: List[dict]) -> str:
+    processed = sum(result.get("processed", 0) for result in results)
+    total_interest = sum(
+        (Decimal(result.get("total_interest", "0")) for result in results),
+        Decimal("0.00"),
+    )
+    return (
+        f"Applied daily interest to {processed} savings accounts for {run_key}, "
+        f"total {total_interest}"
+    )
+
+
+def _run_suspicious_shard(accounts: QuerySet, run_key: str) -> dict:
+    with read_from_replica():
+        activities = find_suspicious_activities(accounts, now=parser.parse(run_key))
+        return {"processed": accounts.count(), "activities": activities}
+
+
+def _finalize_suspicious(run_key: str, results: List[dict]) -> str:
+    # Users owning accounts in several shards are reported by each of them.
+    suspicious_activities = list(
+        dict.fromkeys(
+            activity for result in results for activity in result.get("activities", [])
+        )
+    )
+    if not suspicious_activities:
+        return "Suspicious activity check completed. No suspicious activities detected"
+
+    num_activities = send_suspicious_activity_alert(suspicious_activities)
+    if num_activities > 0:
+        return (
+            f"Suspicious activity check completed. {num_activities} suspicious "
+            f"activities detected and reported "
+        )
+    return (
+        f"Suspicious activity check completed. Activities "
+        f"detected but alert email failed to send "
+    )
+
+
+# run_shard(accounts, run_key) -> dict processes the accounts of one shard,
+# finalize(run_key, results) combines the results of every succeeded shard
+SHARDED_JOBS: Dict[str, Dict[str, Callable]] = {
+    "daily_interest": {
+        "run_shard": _run_interest_shard,
+        "finalize": _finalize_interest,
+    },
+    "suspicious_activities": {
+        "run_shard": _run_suspicious_shard,
+        "finalize": _finalize_suspicious,
+    },
+}
+
+
+def plan_shards(
+    job_name: str, run_key: str, shard_size: Optional[int] = None
+) -> List[BatchShard]:
+    """
+    Split the BankAccount primary keys into contiguous ranges of ``shard_size``.
+
+    Shards are only planned once per run; calling this again for the same run,
+    even concurrently, returns the existing shards so a re-dispatch never double
+    processes a range.
+    """
+    existing = list(BatchShard.objects.filter(job_name=job_name, run_key=run_key))
+    if existing:
+        return existing
+
+    shard_size = shard_size or BATCH_SHARD_SIZE
+    boundaries = [None]
+    account_ids = (
+        BankAccount.objects.order_by("id")
+        .values_list("id", flat=True)
+        .iterator(chunk_size=shard_size)
+    )
+    for position, account_id in enumerate(account_ids):
+        if position and position % shard_size == 0:
+            boundaries.append(account_id)
+    boundaries.append(None)
+
+    shards = [
+        BatchShard(
+            job_name=job_name,
+            run_key=run_key,
+            shard_number=shard_number,
+            lower_bound=lower_bound,
+            upper_bound=upper_bound,
+        )
+        for shard_number, (lower_bound, upper_bound) in enumerate(
+            zip(boundaries, boundaries[1:])
+        )
+    ]
+    try:
+        with transaction.atomic():
+            return BatchShard.objects.bulk_create(shards)
+    except IntegrityError:
+        # Another dispatch planned the run first, keep its shards
+        return list(BatchShard.objects.filter(job_name=job_name, run_key=run_key))
+
+
+def is_resumable(shard: BatchShard) -> bool:
+    """
+    Failed shards, and running shards that started longer ago than a task may
+    run, which the hard time limit or a worker crash killed mid-run.
+    """
+    if shard.status == BatchShard.ShardStatus.FAILED:
+        return True
+    stale_before = timezone.now() - timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT)
+    return (
+        shard.status == BatchShard.ShardStatus.RUNNING
+        and shard.started_at is not None
+        and shard.started_at < stale_before
+    )
+
+
+def dispatch_sharded_job(
+    job_name: str,
+    run_key: str,
+    shard_size: Optional[int] = None,
+    only_failed: bool = False,
+) -> int:
+    """
+    Fan a job out as one Celery task per shard, with a chord callback that
+    aggregates the shard results. Returns the number of shards dispatched.
+    """
+    from .tasks import aggregate_batch_shards, run_batch_shard
+
+    if job_name not in SHARDED_JOBS:
+        raise ValueError(f"Unknown sharded job: {job_name}")
+
+    shards = plan_shards(job_name, run_key, shard_size)
+    if only_failed:
+        shards = [shard for shard in shards if is_resumable(shard)]
+    if not shards:
+        logger.info(f"No shards to dispatch for {job_name} [{run_key}]")
+        return 0
+
+    header = group(run_batch_shard.s(str(shard.id)) for shard in shards)
+    chord(header)(aggregate_batch_shards.s(job_name, run_key))
+    logger.info(f"Dispatched {len(shards)} shards for {job_name} [{run_key}]")
+    return len(shards)
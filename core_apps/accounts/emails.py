@@ -5,6 +5,7 @@ from django.utils.html import strip_tags
 from django.utils.translation import gettext_lazy as _
 from loguru import logger
 from core_apps.accounts.models import BankAccount
+from core_apps.common.notifications import email_event, queue_emails
 
 
 def send_account_creation_email(user, bank_account):
@@ -63,55 +64,40 @@ def send_full_activation_email(account: BankAccount) -> None:
 def send_deposit_email(
     user, user_email, amount, currency, new_balance, account_number
 ) -> None:
-    subject = _("Deposit Confirmation")
-    from_email = settings.DEFAULT_FROM_EMAIL
-    recipient_list = [user_email]
-    context = {
-        "user": user,
-        "amount": amount,
-        "currency": currency,
-        "new_balance": new_balance,
-        "account_number": account_number,
-        "site_name": settings.SITE_NAME,
-    }
-    html_email = render_to_string("emails/deposit_confirmation.html", context)
-    plain_email = strip_tags(html_email)
-    email = EmailMultiAlternatives(subject, plain_email, from_email, recipient_list)
-    email.attach_alternative(html_email, "text/html")
-    try:
-        email.send()
-        logger.info(f"Deposit Confirmation email sent to: {user_email}")
-    except Exception as e:
-        logger.error(
-            f"Failed to send deposit confirmation email to  {user_email}. Error: {str(e)}"
+    queue_emails(
+        email_event(
+            "deposit_confirmation",
+            _("Deposit Confirmation"),
+            user_email,
+            {
+                "user_full_name": user.full_name,
+                "amount": amount,
+                "currency": currency,
+                "new_balance": new_balance,
+                "account_number": account_number,
+            },
         )
+    )
 
 
 def send_withdrawal_email(
     user, user_email, amount, currency, new_balance, account_number
 ) -> None:
-    subject = _("Withdrawal Confirmation")
-    from_email = settings.DEFAULT_FROM_EMAIL
-    recipient_list = [user_email]
-    context = {
-        "user": user,
-        "amount": amount,
-        "currency": currency,
-        "new_balance": new_balance,
-        "account_number": account_number,
-        "site_name": settings.SITE_NAME,
-    }
-    html_email = render_to_string("emails/withdrawal_confirmation.html", context)
-    plain_email = strip_tags(html_email)
-    email = EmailMultiAlternatives(subject, plain_email, from_email, recipient_list)
-    email.attach_alternative(html_email, "text/html")
-    try:
-        email.send()
-        logger.info(f"Withdrawal Confirmation email sent to: {user_email}")
-    except Exception as e:
-        logger.error(
-            f"Failed to send withdrawal confirmation email to  {user_email}. Error: {str(e)}"
+    queue_emails(
+        email_event(
+            "withdrawal_confirmation",
+            _("Withdrawal Confirmation"),
+            user_email,
+            {
+                "user_full_name": user.full_name,
+                "amount": amount,
+                "currency": currency,
+                "new_balance": new_balance,
+                "account_number": account_number,
+            },
         )
+    )
+
 
 def send_transfer_email(
     sender_name,
@@ -126,8 +112,6 @@ def send_transfer_email(
     receiver_account_number,
 ) -> None:
     subject = _("Transfer Notification")
-    from_email = settings.DEFAULT_FROM_EMAIL
-
     common_context = {
         "amount": amount,
         "currency": currency,
@@ -135,66 +119,43 @@ def send_transfer_email(
         "receiver_account_number": receiver_account_number,
         "sender_name": sender_name,
         "receiver_name": receiver_name,
-        "site_name": settings.SITE_NAME,
-    }
-
-    sender_context = {
-        **common_context,
-        "user": sender_name,
-        "is_sender": True,
-        "new_balance": sender_new_balance,
     }
-    sender_html_email = render_to_string(
-        "emails/transfer_notification.html", sender_context
+    # Both emails go out in one batch over one SMTP connection
+    queue_emails(
+        email_event(
+            "transfer_notification",
+            subject,
+            sender_email,
+            {
+                **common_context,
+                "user_full_name": sender_name,
+                "is_sender": True,
+                "new_balance": sender_new_balance,
+            },
+        ),
+        email_event(
+            "transfer_notification",
+            subject,
+            receiver_email,
+            {
+                **common_context,
+                "user_full_name": receiver_name,
+                "is_sender": False,
+                "new_balance": receiver_new_balance,
+            },
+        ),
     )
-    sender_plain_email = strip_tags(sender_html_email)
-    sender_email_obj = EmailMultiAlternatives(
-        subject, sender_plain_email, from_email, [sender_email]
-    )
-    sender_email_obj.attach_alternative(sender_html_email, "text/html")
-    receiver_context = {
-        **common_context,
-        "user": receiver_name,
-        "is_sender": False,
-        "new_balance": receiver_new_balance,
-    }
-    receiver_html_email = render_to_string(
-        "emails/transfer_notification.html", receiver_context
-    )
-    receiver_plain_email = strip_tags(receiver_html_email)
-    receiver_email_obj = EmailMultiAlternatives(
-        subject, receiver_plain_email, from_email, [receiver_email]
-    )
-    receiver_email_obj.attach_alternative(receiver_html_email, "text/html")
-    try:
-        sender_email_obj.send()
-        receiver_email_obj.send()
-        logger.info(
-            f"Transfer notification emails sent to sender: {sender_email} and receiver: "
-            f"{receiver_email}"
-        )
-    except Exception as e:
-        logger.error(f"Failed to send transfer notification emails. Error: {str(e)}")
 
 
 def send_transfer_otp_email(email, otp) -> None:
-    subject = _("Your OTP for Transfer Authorization")
-    from_email = settings.DEFAULT_FROM_EMAIL
-    recipient_list = [email]
-    context = {
-        "otp": otp,
-        "expiry_time": settings.OTP_EXPIRATION,
-        "site_name": settings.SITE_NAME,
-    }
-    html_email = render_to_string("emails/transfer_otp_email.html", context)
-    plain_email = strip_tags(html_email)
-    email = EmailMultiAlternatives(subject, plain_email, from_email, recipient_list)
-    email.attach_alternative(html_email, "text/html")
-    try:
-        email.send()
-        logger.info(f"OTP email sent successfully to: {email}")
-    except Exception as e:
-        logger.error(f"Failed to send OTP email email to  {email}. Error: {str(e)}")
+    queue_emails(
+        email_event(
+            "transfer_otp_email",
+            _("Your OTP for Transfer Authorization"),
+            email,
+            {"otp": otp, "expiry_time": str(settings.OTP_EXPIRATION)},
+        )
+    )
 
 
 def send_suspicious_activity_alert(suspicious_activities):
@@ -0,0 +1,153 @@
+"""
+Incremental counterpart of suspicious.py.
+
+Every committed money movement updates sliding-window counters in the cache
+and is checked against the rules of the nightly scan, in a fixed number of
+cache calls however much history there is.
+"""
+
+import time
+from decimal import Decimal
+from os import getenv
+from typing import List, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from loguru import logger
+
+from .models import BankAccount, Transaction
+
+FRAUD_WINDOW_BUCKETS = int(getenv("FRAUD_WINDOW_BUCKETS", "12"))
+
+CACHE_PREFIX = "fraud"
+
+
+def _window_seconds() -> int:
+    return int(getenv("TIME_WINDOW_HOURS")) * 60 * 60
+
+
+def _bucket_seconds() -> int:
+    return max(_window_seconds() // FRAUD_WINDOW_BUCKETS, 1)
+
+
+def _to_cents(amount: Decimal) -> int:
+    return int(Decimal(amount) * 100)
+
+
+def _add_to_window(name: str, delta: int, now: float) -> int:
+    """
+    Add ``delta`` to the current bucket of the ``name`` counter and return the
+    total over the whole window.
+    """
+    bucket_seconds = _bucket_seconds()
+    current_bucket = int(now // bucket_seconds)
+    key = f"{CACHE_PREFIX}:{name}:{current_bucket}"
+    timeout = _window_seconds() + bucket_seconds
+
+    cache.add(key, 0, timeout)
+    cache.incr(key, delta)
+
+    keys = [
+        f"{CACHE_PREFIX}:{name}:{bucket}"
+        for bucket in range(current_bucket - FRAUD_WINDOW_BUCKETS + 1, current_bucket + 1)
+    ]
+    return sum(cache.get_many(keys).values())
+
+
+def _first_in_window(rule: str, subject: str) -> bool:
+    """Only alert once per rule and subject within a time window."""
+    return cache.add(f"{CACHE_PREFIX}:alerted:{rule}:{subject}", 1, _window_seconds())
+
+
+def score_activity(
+    user,
+    amount: Decimal,
+    sender_account: Optional[BankAccount] = None,
+    receiver_account: Optional[BankAccount] = None,
+    now: Optional[float] = None,
+) -> List[str]:
+    """
+    Record one committed money movement and return a description per rule it
+    breaches. Alerts for the breaches are sent asynchronously.
+    """
+    LARGE_TRANSACTION_THRESHOLD = Decimal(getenv("LARGE_TRANSACTION_THRESHOLD"))
+
+    FREQUENT_TRANSACTION_THRESHOLD = int(getenv("FREQUENT_TRANSACTION_THRESHOLD"))
+
+    now = now or time.time()
+    amount = Decimal(amount)
+    suspicious_activities = []
+
+    if amount >= LARGE_TRANSACTION_THRESHOLD:
+        suspicious_activities.append(
+            f"Large transaction detected: {amount} by user {user.email}"
+        )
+
+    transaction_count = _add_to_window(f"user:{user.pk}:count", 1, now)
+    if transaction_count >= FREQUENT_TRANSACTION_THRESHOLD and _first_in_window(
+        "frequent", str(user.pk)
+    ):
+        suspicious_activities.append(
+            f"Frequent transactions detected: {transaction_count} by user {user.email}"
+        )
+
+    deltas = {}
+    if sender_account is not None:
+        deltas[sender_account] = deltas.get(sender_account, 0) - _to_cents(amount)
+    if receiver_account is not None:
+        deltas[receiver_account] = deltas.get(receiver_account, 0) + _to_cents(amount)
+
+    for account, delta in deltas.items():
+        if not delta:
+            continue
+        total_change = Decimal(
+            _add_to_window(f"account:{account.pk}:change", delta, now)
+        ) / 100
+        if abs(total_change) > LARGE_TRANSACTION_THRESHOLD and _first_in_window(
+            "balance_change", str(account.pk)
+        ):
+            suspicious_activities.append(
+                f"Large balance change detected: {total_change} by user "
+                f"{account.account_number}"
+            )
+
+    if suspicious_activities:
+        from .tasks import alert_suspicious_activities
+
+        alert_suspicious_activities.delay(suspicious_activities)
+
+    return suspicious_activities
+
+
+def _score_safely(**kwargs) -> None:
+    # Scoring must never turn a committed transfer into a failed request.
+    try:
+        score_activity(**kwargs)
+    except Exception as e:
+        logger.error(f"Failed to score activity for fraud detection: {str(e)}")
+
+
+def score_on_commit(
+    user,
+    amount: Decimal,
+    sender_account: Optional[BankAccount] = None,
+    receiver_account: Optional[BankAccount] = None,
+) -> None:
+    """Score a money movement once the surrounding database transaction commits."""
+    transaction.on_commit(
+        lambda: _score_safely(
+            user=user,
+            amount=amount,
+            sender_account=sender_account,
+            receiver_account=receiver_account,
+        )
+    )
+
+
+def score_transaction_on_commit(bank_transaction: Transaction) -> None:
+    score_on_commit(
+        user=bank_transaction.user,
+        amount=bank_transaction.amount,
+        sender_account=bank_transaction.sender_account,
+        receiver_account=bank_transaction.receiver_account,
+    )
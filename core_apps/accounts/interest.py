@@ -0,0 +1,171 @@
+import time
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from loguru import logger
+
+from .ledger import post_movements
+from .models import BankAccount, Transaction
+
+INTEREST_CHUNK_SIZE = 2000
+
+
+@dataclass
+class InterestRunResult:
+    business_date: date
+    accounts_processed: int
+    accounts_credited: int
+    total_interest: Decimal
+    elapsed_seconds: float
+
+    @property
+    def accounts_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return float(self.accounts_processed)
+        return self.accounts_processed / self.elapsed_seconds
+
+
+def _tiered_rate_sql() -> Tuple[str, list]:
+    """Build a SQL CASE expression mirroring BankAccount.annual_interest_rate."""
+    whens = []
+    params = []
+    default_rate = Decimal("0.0000")
+    for upper_bound, rate in BankAccount.INTEREST_TIERS:
+        if upper_bound is None:
+            default_rate = rate
+            continue
+        whens.append("WHEN account_balance < %s THEN %s")
+        params.extend([upper_bound, rate])
+    return f"CASE {' '.join(whens)} ELSE %s END", params + [default_rate]
+
+
+def _credit_chunk(account_ids: List, business_date: date) -> List[Tuple]:
+    """
+    Credit one chunk of savings accounts with a single UPDATE ... FROM.
+
+    Accounts already credited for ``business_date`` are skipped by the WHERE
+    clause, which is what makes re-running the job for the same day a no-op.
+    Returns (account_id, user_id, interest) for every row that was updated.
+    """
+    table = connection.ops.quote_name(BankAccount._meta.db_table)
+    pk_field = BankAccount._meta.pk
+    rate_sql, rate_params = _tiered_rate_sql()
+    placeholders = ", ".join(["%s"] * len(account_ids))
+
+    sql = f"""
+        UPDATE {table} AS a
+        SET account_balance = a.account_balance + v.interest,
+            last_interest_date = %s,
+            updated_at = %s
+        FROM (
+            SELECT id, ROUND(account_balance * ({rate_sql}) / 365, 2) AS interest
+            FROM {table}
+            WHERE id IN ({placeholders})
+        ) AS v
+        WHERE a.id = v.id
+          AND a.account_type = %s
+          AND (a.last_interest_date IS NULL OR a.last_interest_date < %s)
+        RETURNING a.id, a.user_id, v.interest
+    """
+    params = [
+        business_date,
+        timezone.now(),
+        *rate_params,
+        *[pk_field.get_db_prep_value(pk, connection) for pk in account_ids],
+        BankAccount.AccountType.SAVINGS,
+        business_date,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def run_daily_interest(
+    business_date: Optional[date] = None,
+    chunk_size: int = INTEREST_CHUNK_SIZE,
+    accounts: Optional[QuerySet] = None,
+) -> InterestRunResult:
+    """
+    Apply one day of interest to every savings account in chunks.
+
+    ``accounts`` narrows the run to a subset of bank accounts, e.g. one
+    primary-key range when the job is sharded across workers.
+
+    Each chunk is credited and its INTEREST transactions written in a single
+    database transaction, so a failure never leaves a balance credited without
+    its transaction row (or the other way round).
+    """
+    business_date = business_date or timezone.localdate()
+    started = time.monotonic()
+
+    if accounts is None:
+        accounts = BankAccount.objects.all()
+
+    pending = accounts.filter(
+        Q(last_interest_date__isnull=True) | Q(last_interest_date__lt=business_date),
+        account_type=BankAccount.AccountType.SAVINGS,
+    ).order_by("id")
+
+    processed = 0
+    credited = 0
+    total_interest = Decimal("0.00")
+    last_id = None
+
+    while True:
+        chunk = pending if last_id is None else pending.filter(id__gt=last_id)
+        account_ids = list(chunk.values_list("id", flat=True)[:chunk_size])
+        if not account_ids:
+            break
+        last_id = account_ids[-1]
+
+        with transaction.atomic():
+            rows = _credit_chunk(account_ids, business_date)
+            interest_transactions = []
+            for account_id, user_id, interest in rows:
+                interest = Decimal(interest)
+                if interest <= 0:
+                    continue
+                total_interest += interest
+                interest_transactions.append(
+                    Transaction(
+                        user_id=user_id,
+                        amount=interest,
+                        transaction_type=Transaction.TransactionType.INTEREST,
+                        description="Daily interest applied",
+                        receiver_id=user_id,
+                        receiver_account_id=account_id,
+                        status=Transaction.TransactionStatus.COMPLETED,
+                    )
+                )
+            Transaction.objects.bulk_create(interest_transactions)
+            post_movements(
+                (
+                    interest_transaction.receiver_account_id,
+                    interest_transaction.amount,
+                    interest_transaction,
+                    interest_transaction.description,
+                )
+                for interest_transaction in interest_transactions
+            )
+
+        processed += len(rows)
+        credited += len(interest_transactions)
+
+    result = InterestRunResult(
+        business_date=business_date,
+        accounts_processed=processed,
+        accounts_credited=credited,
+        total_interest=total_interest,
+        elapsed_seconds=time.monotonic() - started,
+    )
+    logger.info(
+        f"Daily interest for {business_date}: {result.accounts_processed} accounts "
+        f"processed, {result.accounts_credited} credited, total {result.total_interest} "
+        f"({result.accounts_per_second:.1f} accounts/s)"
+    )
+    return result
@@ -0,0 +1,242 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from os import getenv
+from typing import Iterable, List, Optional, Tuple
+
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from loguru import logger
+
+from core_apps.common.db_router import stick_to_primary
+
+from .models import BalanceCheckpoint, BankAccount, LedgerEntry, Transaction
+
+CHECKPOINT_CHUNK_SIZE = int(getenv("CHECKPOINT_CHUNK_SIZE", "2000"))
+
+# Entries get created_at before their transaction commits, so checkpoints are
+# taken this far in the past, longer than any transaction that posts entries
+CHECKPOINT_SETTLE_SECONDS = int(getenv("CHECKPOINT_SETTLE_SECONDS", "600"))
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+BALANCE_FIELD = DecimalField(max_digits=14, decimal_places=2)
+
+SIGNED_AMOUNT = Case(
+    When(entry_type=LedgerEntry.EntryType.DEBIT, then=-F("amount")),
+    default=F("amount"),
+    output_field=BALANCE_FIELD,
+)
+
+# (account_id, delta, transaction, description), a negative delta is a debit
+Movement = Tuple[object, Decimal, Optional[Transaction], str]
+
+
+def _build_entry(
+    account_id,
+    delta: Decimal,
+    transaction: Optional[Transaction],
+    description: str,
+    system_account: str = "",
+) -> LedgerEntry:
+    return LedgerEntry(
+        account_id=account_id,
+        system_account=system_account,
+        transaction=transaction,
+        entry_type=(
+            LedgerEntry.EntryType.DEBIT if delta < 0 else LedgerEntry.EntryType.CREDIT
+        ),
+        amount=abs(delta),
+        description=description or "",
+    )
+
+
+def contra_account(transaction: Optional[Transaction]) -> str:
+    """The system account that takes the other side of money entering or leaving."""
+    SystemAccount = LedgerEntry.SystemAccount
+    if transaction is None:
+        # Teller deposits have no transaction
+        return SystemAccount.CASH_CLEARING
+    if transaction.transaction_type == Transaction.TransactionType.INTEREST:
+        return SystemAccount.INTEREST_EXPENSE
+    if (
+        transaction.transaction_type == Transaction.TransactionType.DEPOSIT
+        and transaction.sender_account_id == transaction.receiver_account_id
+    ):
+        # Card top-ups move money from the bank account to the card
+        return SystemAccount.CARD_CLEARING
+    if transaction.transaction_type == Transaction.TransactionType.TRANSFER:
+        raise ValueError(f"Transfer {transaction.pk} does not balance")
+    return SystemAccount.CASH_CLEARING
+
+
+def _contra_entries(movements: List[Movement]) -> List[LedgerEntry]:
+    """
+    One system account leg for every posting that does not net to zero. A
+    posting is the movements of one transaction, or one movement without a
+    transaction.
+    """
+    nets = defaultdict(Decimal)
+    postings = {}
+    for index, (account_id, delta, transaction, description) in enumerate(movements):
+        if transaction is not None:
+            key = ("transaction", id(transaction))
+        else:
+            key = ("movement", index)
+        nets[key] += delta
+        postings.setdefault(key, (transaction, description))
+    return [
+        _build_entry(
+            None, -nets[key], transaction, description, contra_account(transaction)
+        )
+        for key, (transaction, description) in postings.items()
+        if nets[key]
+    ]
+
+
+def post_movements(
+    movements: Iterable[Movement], user_ids: Iterable = ()
+) -> List[LedgerEntry]:
+    """
+    Append one ledger entry per movement, plus the system account legs that
+    balance them. Call it inside the balance update's transaction. The users of
+    the movements' transactions, and ``user_ids``, read from the primary for a
+    while after it commits. Returns the entries of the bank accounts.
+    """
+    from .rollups import record_ledger_entries
+
+    movements = [movement for movement in movements if movement[1]]
+    entries = [
+        _build_entry(account_id, delta, transaction, description)
+        for account_id, delta, transaction, description in movements
+    ]
+    entries = LedgerEntry.objects.bulk_create(entries, batch_size=1000)
+    LedgerEntry.objects.bulk_create(_contra_entries(movements), batch_size=1000)
+    record_ledger_entries(entries)
+
+    movers = set(user_ids)
+    for entry in entries:
+        if entry.transaction is not None:
+            movers.update([entry.transaction.sender_id, entry.transaction.receiver_id])
+    stick_to_primary(movers)
+    return entries
+
+
+def post_movement(
+    account: BankAccount,
+    delta: Decimal,
+    transaction: Optional[Transaction] = None,
+    description: str = "",
+) -> List[LedgerEntry]:
+    return post_movements(
+        [(account.pk, delta, transaction, description)], user_ids=[account.user_id]
+    )
+
+
+def ledger_imbalance() -> Decimal:
+    """Sum of every entry, credits positive. Zero while the books balance."""
+    total = LedgerEntry.objects.aggregate(total=Sum(SIGNED_AMOUNT))["total"]
+    return total or Decimal("0.00")
+
+
+def balance_at(account: BankAccount, at: datetime) -> Decimal:
+    """
+    Balance of ``account`` at time ``at``.
+
+    Starts from the latest checkpoint at or before ``at`` (an index seek on
+    account + as_of) and only sums the entries posted after it, so the cost is
+    bounded by the checkpoint interval rather than the account's history.
+    """
+    checkpoint = (
+        BalanceCheckpoint.objects.filter(account=account, as_of__lte=at)
+        .order_by("-as_of")
+        .values("as_of", "balance")
+        .first()
+    )
+    since = checkpoint["as_of"] if checkpoint else EPOCH
+    opening = checkpoint["balance"] if checkpoint else Decimal("0.00")
+
+    movement = LedgerEntry.objects.filter(
+        account=account, created_at__gt=since, created_at__lte=at
+    ).aggregate(total=Sum(SIGNED_AMOUNT))["total"]
+    return opening + (movement or Decimal("0.00"))
+
+
+def _balances_as_of(account_ids: List, as_of: datetime):
+    last_checkpoint = BalanceCheckpoint.objects.filter(
+        account=OuterRef("pk"), as_of__lte=as_of
+    ).order_by("-as_of")
+    movements = (
+        LedgerEntry.objects.filter(
+            account=OuterRef("pk"),
+            created_at__gt=Coalesce(OuterRef("checkpoint_as_of"), Value(EPOCH)),
+            created_at__lte=as_of,
+        )
+        .order_by()
+        .values("account")
+        .annotate(total=Sum(SIGNED_AMOUNT))
+        .values("total")
+    )
+    zero = Value(Decimal("0.00"), output_field=BALANCE_FIELD)
+    return (
+        BankAccount.objects.filter(id__in=account_ids)
+        .annotate(
+            checkpoint_as_of=Subquery(last_checkpoint.values("as_of")[:1]),
+            checkpoint_balance=Coalesce(
+                Subquery(
+                    last_checkpoint.values("balance")[:1], output_field=BALANCE_FIELD
+                ),
+                zero,
+            ),
+        )
+        .annotate(
+            balance=F("checkpoint_balance")
+            + Coalesce(Subquery(movements, output_field=BALANCE_FIELD), zero)
+        )
+        .values_list("id", "balance")
+    )
+
+
+def create_checkpoints(
+    as_of: Optional[datetime] = None, chunk_size: int = CHECKPOINT_CHUNK_SIZE
+) -> int:
+    """
+    Write a checkpoint for every bank account, rolled forward from its previous
+    checkpoint. Returns the number of checkpoints written.
+
+    ``as_of`` defaults to CHECKPOINT_SETTLE_SECONDS ago, so no entry dated
+    before it can still be uncommitted and missed by the checkpoint.
+    """
+    as_of = as_of or timezone.now() - timedelta(seconds=CHECKPOINT_SETTLE_SECONDS)
+    created = 0
+    last_id = None
+    accounts = BankAccount.objects.order_by("id")
+
+    while True:
+        chunk = accounts if last_id is None else accounts.filter(id__gt=last_id)
+        account_ids = list(chunk.values_list("id", flat=True)[:chunk_size])
+        if not account_ids:
+            break
+        last_id = account_ids[-1]
+
+        checkpoints = BalanceCheckpoint.objects.bulk_create(
+            [
+                BalanceCheckpoint(account_id=account_id, as_of=as_of, balance=balance)
+                for account_id, balance in _balances_as_of(account_ids, as_of)
+            ],
+            ignore_conflicts=True,
+        )
+        created += len(checkpoints)
+
+    logger.info(f"Wrote {created} balance checkpoints as of {as_of}")
+    return created
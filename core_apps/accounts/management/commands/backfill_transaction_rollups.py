@@ -0,0 +1,47 @@
+from dateutil import parser
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from core_apps.accounts.models import LedgerEntry, Transaction
+from core_apps.accounts.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily and monthly transaction rollups from history"
+
+    def add_arguments(self, parser_):
+        parser_.add_argument(
+            "--start", help="First day to rebuild (default: the oldest transaction)"
+        )
+        parser_.add_argument("--end", help="Last day to rebuild (default: today)")
+
+    def handle(self, *args, **options):
+        try:
+            end_date = (
+                parser.parse(options["end"]).date()
+                if options["end"]
+                else timezone.localdate()
+            )
+            if options["start"]:
+                start_date = parser.parse(options["start"]).date()
+            else:
+                oldest = [
+                    model.objects.aggregate(oldest=Min("created_at"))["oldest"]
+                    for model in (Transaction, LedgerEntry)
+                ]
+                oldest = min(filter(None, oldest), default=None)
+                if oldest is None:
+                    self.stdout.write("No transactions to roll up")
+                    return
+                start_date = timezone.localdate(oldest)
+        except ValueError as e:
+            raise CommandError(f"Invalid date format: {e}")
+
+        if start_date > end_date:
+            raise CommandError("--start must not be after --end")
+
+        start_date, end_date = rebuild_rollups(start_date, end_date)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt transaction rollups from {start_date} to {end_date}")
+        )
@@ -0,0 +1,114 @@
+import multiprocessing
+import resource
+import time
+from tempfile import TemporaryFile
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand, CommandError
+
+from core_apps.accounts.statements import (
+    STATEMENT_MAX_ROWS,
+    STATEMENT_ROWS_PER_PAGE,
+    StatementTooLargeError,
+    render_statement_pages,
+)
+
+ROW = [
+    "2026-01-01 12:00:00",
+    "Transfer",
+    "$1250.00",
+    "Monthly rent for the apartment...",
+    "Completed",
+    "Jane Sender",
+    "John Receiver",
+]
+
+
+def _synthetic_pages(rows: int):
+    for start in range(0, rows, STATEMENT_ROWS_PER_PAGE):
+        yield [ROW] * min(STATEMENT_ROWS_PER_PAGE, rows - start)
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _render(rows: int, results) -> None:
+    """Render and build the email like generate_transaction_pdf does."""
+    started_rss = _max_rss_mb()
+    started = time.perf_counter()
+    try:
+        with TemporaryFile() as output:
+            render_statement_pages(
+                _synthetic_pages(rows), "Statement benchmark", output
+            )
+            size = output.tell()
+            output.seek(0)
+            email = EmailMessage(
+                "Statement", "", settings.DEFAULT_FROM_EMAIL, ["user@example.com"]
+            )
+            email.attach("statement.pdf", output.read(), "application/pdf")
+            email.message().as_bytes()
+    except StatementTooLargeError:
+        results.put(None)
+        return
+    elapsed = time.perf_counter() - started
+    results.put((elapsed, _max_rss_mb() - started_rss, size))
+
+
+class Command(BaseCommand):
+    help = (
+        "Record the time, memory growth and PDF size of rendering and emailing "
+        "statements of N rows, and fail if a statement of STATEMENT_MAX_ROWS rows "
+        "grows memory past --max-rss-mb"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[1000, 10000, STATEMENT_MAX_ROWS, 100000, 1000000],
+            help="Row counts to render (default: 1000 10000 the cap 100000 1000000)",
+        )
+        parser.add_argument(
+            "--max-rss-mb",
+            type=int,
+            default=256,
+            help="Memory a statement at the row cap may add (default: 256)",
+        )
+
+    def handle(self, *args, **options):
+        context = multiprocessing.get_context("fork")
+        over_budget = []
+        for rows in options["rows"]:
+            if rows < 1:
+                raise CommandError("--rows must be at least 1")
+            # Each size renders in a fresh process, so its peak RSS is its own
+            results = context.Queue()
+            process = context.Process(target=_render, args=(rows, results))
+            process.start()
+            result = results.get()
+            process.join()
+
+            if result is None:
+                self.stdout.write(
+                    f"{rows} rows: refused, over the cap of {STATEMENT_MAX_ROWS}"
+                )
+                continue
+            elapsed, rss_growth_mb, size = result
+            self.stdout.write(
+                f"{rows} rows: {elapsed:.1f}s, peak RSS +{rss_growth_mb:.0f} MB, "
+                f"PDF {size / 1024 ** 2:.1f} MB"
+            )
+            if rss_growth_mb > options["max_rss_mb"]:
+                over_budget.append(rows)
+
+        if over_budget:
+            raise CommandError(
+                f"Statements of {over_budget} rows grew memory past "
+                f"{options['max_rss_mb']} MB"
+            )
+        self.stdout.write(self.style.SUCCESS("Statement memory stays within budget"))
@@ -0,0 +1,122 @@
+import threading
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from core_apps.accounts.models import BankAccount
+from core_apps.accounts.transfers import TransferError, execute_transfer
+
+
+class Command(BaseCommand):
+    help = (
+        "Run transfers in opposite directions between two accounts from many "
+        "threads at once and fail if money is created or lost. The transfers "
+        "are real, so only run it against a test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("first_account", help="Account number of the first account")
+        parser.add_argument(
+            "second_account", help="Account number of the second account"
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Threads per direction (default: 8)",
+        )
+        parser.add_argument(
+            "--transfers",
+            type=int,
+            default=50,
+            help="Transfers made by each thread (default: 50)",
+        )
+        parser.add_argument(
+            "--amount", default="1.00", help="Amount of each transfer (default: 1.00)"
+        )
+
+    def _balances(self, account_numbers):
+        return dict(
+            BankAccount.objects.filter(account_number__in=account_numbers).values_list(
+                "account_number", "account_balance"
+            )
+        )
+
+    def handle(self, *args, **options):
+        try:
+            amount = Decimal(options["amount"])
+        except InvalidOperation:
+            raise CommandError("--amount must be a decimal number")
+        if amount <= 0 or options["threads"] < 1 or options["transfers"] < 1:
+            raise CommandError("--amount, --threads and --transfers must be positive")
+
+        first, second = options["first_account"], options["second_account"]
+        accounts = {
+            account.account_number: account
+            for account in BankAccount.objects.select_related("user").filter(
+                account_number__in=[first, second]
+            )
+        }
+        if len(accounts) != 2:
+            raise CommandError("Both accounts must exist and be different")
+        before = self._balances(accounts)
+
+        completed = Counter()
+        rejected = Counter()
+        errors = []
+        lock = threading.Lock()
+
+        def worker(sender, receiver):
+            try:
+                for _ in range(options["transfers"]):
+                    try:
+                        execute_transfer(
+                            accounts[sender].user,
+                            sender,
+                            receiver,
+                            amount,
+                            "Concurrency check",
+                        )
+                        outcome = completed
+                    except TransferError:
+                        outcome = rejected
+                    with lock:
+                        outcome[sender] += 1
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+            finally:
+                close_old_connections()
+
+        threads = [
+            threading.Thread(target=worker, args=direction)
+            for direction in [(first, second), (second, first)]
+            for _ in range(options["threads"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        after = self._balances(accounts)
+        expected = {
+            first: before[first] - (completed[first] - completed[second]) * amount,
+            second: before[second] - (completed[second] - completed[first]) * amount,
+        }
+        self.stdout.write(
+            f"{sum(completed.values())} transfers completed, "
+            f"{sum(rejected.values())} rejected, {len(errors)} failed"
+        )
+        for account_number in (first, second):
+            self.stdout.write(
+                f"{account_number}: {before[account_number]} -> "
+                f"{after[account_number]} (expected {expected[account_number]})"
+            )
+
+        if errors:
+            raise CommandError(f"Transfers failed: {errors[0]!r}")
+        if sum(after.values()) != sum(before.values()) or after != expected:
+            raise CommandError("Balances are not conserved")
+        self.stdout.write(self.style.SUCCESS("Balances are conserved"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core_apps.accounts.ledger import ledger_imbalance
+
+
+class Command(BaseCommand):
+    help = "Fail if the ledger entries, system accounts included, do not net to zero"
+
+    def handle(self, *args, **options):
+        imbalance = ledger_imbalance()
+        if imbalance:
+            raise CommandError(f"The ledger is out of balance by {imbalance}")
+        self.stdout.write(self.style.SUCCESS("The ledger balances"))
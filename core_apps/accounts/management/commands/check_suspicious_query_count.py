@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core_apps.accounts.models import BankAccount
+from core_apps.accounts.suspicious import find_suspicious_activities
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the suspicious activity rules over growing sets of accounts and fail "
+        "if the number of queries grows with them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000, 10000],
+            help="Numbers of accounts to scan (default: 10 100 1000 10000)",
+        )
+
+    def handle(self, *args, **options):
+        counts = {}
+        for size in sorted(options["sizes"]):
+            accounts = BankAccount.objects.filter(
+                pk__in=BankAccount.objects.order_by("id").values("id")[:size]
+            )
+            with CaptureQueriesContext(connection) as queries:
+                activities = find_suspicious_activities(accounts)
+            counts[size] = len(queries.captured_queries)
+            self.stdout.write(
+                f"{size} accounts: {counts[size]} queries, "
+                f"{len(activities)} suspicious activities"
+            )
+
+        if len(set(counts.values())) > 1:
+            raise CommandError(f"Query count grows with the number of accounts: {counts}")
+        self.stdout.write(self.style.SUCCESS("Query count is constant"))
@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core_apps.accounts.views import TransactionListAPIView
+
+User = get_user_model()
+
+PAGE_SIZES = [10, 100]
+
+
+class Command(BaseCommand):
+    help = (
+        "Request the transaction list at page sizes 10 and 100 and fail if the "
+        "number of queries grows with the page size"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--email",
+            help="User whose transactions to list (default: the user with the most "
+            "sent transactions)",
+        )
+
+    def _get_user(self, email):
+        if email:
+            user = User.objects.filter(email=email).first()
+        else:
+            user = (
+                User.objects.annotate(num_sent=Count("sent_transactions"))
+                .order_by("-num_sent")
+                .first()
+            )
+        if user is None:
+            raise CommandError("No user to list transactions for")
+        return user
+
+    def handle(self, *args, **options):
+        user = self._get_user(options["email"])
+        factory = APIRequestFactory()
+        view = TransactionListAPIView.as_view()
+
+        failures = []
+        for mode, params in [("page", {}), ("cursor", {"pagination": "cursor"})]:
+            counts = {}
+            for page_size in PAGE_SIZES:
+                request = factory.get(
+                    "/api/v1/accounts/transactions/",
+                    {**params, "page_size": page_size},
+                )
+                force_authenticate(request, user=user)
+                with CaptureQueriesContext(connection) as queries:
+                    response = view(request)
+                if response.status_code != 200:
+                    raise CommandError(
+                        f"The transaction list returned {response.status_code}"
+                    )
+                counts[page_size] = len(queries.captured_queries)
+                self.stdout.write(
+                    f"{mode} pagination, page size {page_size}: "
+                    f"{counts[page_size]} queries"
+                )
+            if len(set(counts.values())) > 1:
+                failures.append(f"{mode} pagination {counts}")
+
+        if failures:
+            raise CommandError(
+                f"Query count grows with the page size: {', '.join(failures)}"
+            )
+        self.stdout.write(self.style.SUCCESS("Query count is constant"))
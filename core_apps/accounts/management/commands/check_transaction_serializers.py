@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core_apps.accounts.models import Transaction
+from core_apps.accounts.serializers import (
+    TRANSACTION_ROW_FIELDS,
+    TransactionRowSerializer,
+    TransactionSerializer,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Serialize the same transactions with TransactionSerializer and "
+        "TransactionRowSerializer and fail if their output differs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=1000,
+            help="Number of the most recent transactions to compare (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        if options["limit"] < 1:
+            raise CommandError("--limit must be at least 1")
+
+        ids = list(
+            Transaction.objects.order_by("-created_at", "-id").values_list(
+                "id", flat=True
+            )[: options["limit"]]
+        )
+        instances = Transaction.objects.select_related(
+            "sender", "receiver", "sender_account", "receiver_account"
+        ).in_bulk(ids)
+        rows = {
+            row["id"]: row
+            for row in Transaction.objects.filter(id__in=ids).values(
+                *TRANSACTION_ROW_FIELDS
+            )
+        }
+
+        mismatches = []
+        for transaction_id in ids:
+            expected = dict(TransactionSerializer(instances[transaction_id]).data)
+            actual = TransactionRowSerializer(rows[transaction_id]).data
+            if actual != expected:
+                mismatches.append((transaction_id, expected, actual))
+
+        for transaction_id, expected, actual in mismatches[:10]:
+            fields = sorted(
+                key
+                for key in expected.keys() | actual.keys()
+                if expected.get(key) != actual.get(key)
+            )
+            self.stdout.write(
+                f"{transaction_id}: "
+                + ", ".join(
+                    f"{key} {expected.get(key)!r} != {actual.get(key)!r}"
+                    for key in fields
+                )
+            )
+
+        self.stdout.write(f"{len(ids)} transactions compared")
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} transactions serialize differently")
+        self.stdout.write(
+            self.style.SUCCESS("Both serializers produce the same output")
+        )
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from core_apps.accounts.partitions import (
+    TRANSACTION_PARTITIONS_AHEAD,
+    TRANSACTION_RETENTION_MONTHS,
+    archive_partitions,
+    ensure_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly transaction partitions ahead of time and move the "
+        "ones past the retention horizon to the archive table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=TRANSACTION_PARTITIONS_AHEAD,
+            help="How many months after the current one get a partition",
+        )
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=TRANSACTION_RETENTION_MONTHS,
+            help="How many months of transactions stay in the hot table",
+        )
+        parser.add_argument(
+            "--skip-archive",
+            action="store_true",
+            help="Only create partitions, do not archive old ones",
+        )
+
+    def handle(self, *args, **options):
+        created = ensure_partitions(months_ahead=options["months_ahead"])
+        for name in created:
+            self.stdout.write(f"Created {name}")
+
+        if not options["skip_archive"]:
+            archived = archive_partitions(
+                retention_months=options["retention_months"]
+            )
+            for name in archived:
+                self.stdout.write(f"Archived {name}")
+
+        self.stdout.write(self.style.SUCCESS("Transaction partitions are up to date"))
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.15 on 2026-10-18 20:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_bankaccount_interest_rate_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bankaccount",
+            name="last_interest_date",
+            field=models.DateField(
+                blank=True,
+                help_text="Business date on which daily interest was last applied",
+                null=True,
+                verbose_name="Last Interest Date",
+            ),
+        ),
+    ]
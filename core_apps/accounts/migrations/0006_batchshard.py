@@ -0,0 +1,95 @@
+# Generated by Django 4.2.15 on 2026-10-18 20:21
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_bankaccount_last_interest_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BatchShard",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("job_name", models.CharField(max_length=50, verbose_name="Job Name")),
+                (
+                    "run_key",
+                    models.CharField(
+                        help_text="Identifies one run of the job, e.g. the business date",
+                        max_length=50,
+                        verbose_name="Run Key",
+                    ),
+                ),
+                (
+                    "lower_bound",
+                    models.UUIDField(blank=True, null=True, verbose_name="Lower Bound"),
+                ),
+                (
+                    "upper_bound",
+                    models.UUIDField(blank=True, null=True, verbose_name="Upper Bound"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Attempts"
+                    ),
+                ),
+                (
+                    "result",
+                    models.JSONField(blank=True, default=dict, verbose_name="Result"),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Error")),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Started At"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Finished At"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Batch Shard",
+                "verbose_name_plural": "Batch Shards",
+                "ordering": ["job_name", "run_key", "lower_bound"],
+                "indexes": [
+                    models.Index(
+                        fields=["job_name", "run_key", "status"],
+                        name="accounts_ba_job_nam_26b619_idx",
+                    )
+                ],
+            },
+        ),
+    ]
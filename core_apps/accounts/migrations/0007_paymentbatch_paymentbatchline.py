@@ -0,0 +1,194 @@
+# Generated by Django 4.2.15 on 2026-10-18 21:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("accounts", "0006_batchshard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PaymentBatch",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("awaiting_otp", "Awaiting OTP"),
+                            ("queued", "Queued"),
+                            ("processing", "Processing"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="awaiting_otp",
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "total_lines",
+                    models.PositiveIntegerField(default=0, verbose_name="Total Lines"),
+                ),
+                (
+                    "total_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=14,
+                        verbose_name="Total Amount",
+                    ),
+                ),
+                (
+                    "succeeded_lines",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Succeeded Lines"
+                    ),
+                ),
+                (
+                    "failed_lines",
+                    models.PositiveIntegerField(default=0, verbose_name="Failed Lines"),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Started At"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Finished At"
+                    ),
+                ),
+                (
+                    "sender_account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payment_batches",
+                        to="accounts.bankaccount",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payment_batches",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Payment Batch",
+                "verbose_name_plural": "Payment Batches",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="PaymentBatchLine",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "line_number",
+                    models.PositiveIntegerField(verbose_name="Line Number"),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=12, verbose_name="Amount"
+                    ),
+                ),
+                (
+                    "description",
+                    models.CharField(
+                        blank=True,
+                        max_length=500,
+                        null=True,
+                        verbose_name="Description",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "error",
+                    models.CharField(blank=True, max_length=255, verbose_name="Error"),
+                ),
+                (
+                    "batch",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lines",
+                        to="accounts.paymentbatch",
+                    ),
+                ),
+                (
+                    "receiver_account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payment_batch_lines",
+                        to="accounts.bankaccount",
+                    ),
+                ),
+                (
+                    "transaction",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="payment_batch_line",
+                        to="accounts.transaction",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Payment Batch Line",
+                "verbose_name_plural": "Payment Batch Lines",
+                "ordering": ["batch", "line_number"],
+                "indexes": [
+                    models.Index(
+                        fields=["batch", "status"],
+                        name="accounts_pa_batch_i_8e0bfc_idx",
+                    )
+                ],
+                "unique_together": {("batch", "line_number")},
+            },
+        ),
+    ]
@@ -0,0 +1,136 @@
+# Generated by Django 4.2.15 on 2026-10-18 21:24
+
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+import uuid
+
+
+def create_opening_checkpoints(apps, schema_editor):
+    """
+    Balances that exist before the ledger have no entries behind them, so
+    record them as the first checkpoint of every account.
+    """
+    BankAccount = apps.get_model("accounts", "BankAccount")
+    BalanceCheckpoint = apps.get_model("accounts", "BalanceCheckpoint")
+    as_of = timezone.now()
+    checkpoints = [
+        BalanceCheckpoint(account_id=account_id, as_of=as_of, balance=balance)
+        for account_id, balance in BankAccount.objects.values_list(
+            "id", "account_balance"
+        ).iterator()
+    ]
+    BalanceCheckpoint.objects.bulk_create(checkpoints, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_paymentbatch_paymentbatchline"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LedgerEntry",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "entry_type",
+                    models.CharField(
+                        choices=[("debit", "Debit"), ("credit", "Credit")],
+                        max_length=6,
+                        verbose_name="Entry Type",
+                    ),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=12, verbose_name="Amount"
+                    ),
+                ),
+                (
+                    "description",
+                    models.CharField(
+                        blank=True, max_length=500, verbose_name="Description"
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="ledger_entries",
+                        to="accounts.bankaccount",
+                    ),
+                ),
+                (
+                    "transaction",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="ledger_entries",
+                        to="accounts.transaction",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ledger Entry",
+                "verbose_name_plural": "Ledger Entries",
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["account", "created_at"],
+                        name="accounts_le_account_a66391_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="BalanceCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("as_of", models.DateTimeField(verbose_name="As Of")),
+                (
+                    "balance",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=14, verbose_name="Balance"
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_checkpoints",
+                        to="accounts.bankaccount",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Balance Checkpoint",
+                "verbose_name_plural": "Balance Checkpoints",
+                "ordering": ["-as_of"],
+                "unique_together": {("account", "as_of")},
+            },
+        ),
+        migrations.RunPython(create_opening_checkpoints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.15 on 2026-10-18 21:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("accounts", "0008_ledgerentry_balancecheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatementArtifact",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "account_number",
+                    models.CharField(
+                        blank=True, max_length=20, verbose_name="Account Number"
+                    ),
+                ),
+                ("start_date", models.DateField(verbose_name="Start Date")),
+                ("end_date", models.DateField(verbose_name="End Date")),
+                (
+                    "file_name",
+                    models.CharField(max_length=255, verbose_name="File Name"),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(max_length=64, verbose_name="Content Hash"),
+                ),
+                ("size", models.PositiveIntegerField(verbose_name="Size")),
+                (
+                    "last_accessed_at",
+                    models.DateTimeField(verbose_name="Last Accessed At"),
+                ),
+                ("expires_at", models.DateTimeField(verbose_name="Expires At")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="statement_artifacts",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Statement Artifact",
+                "verbose_name_plural": "Statement Artifacts",
+                "indexes": [
+                    models.Index(
+                        fields=["last_accessed_at"],
+                        name="accounts_st_last_ac_9afdda_idx",
+                    )
+                ],
+                "unique_together": {
+                    ("user", "account_number", "start_date", "end_date")
+                },
+            },
+        ),
+    ]
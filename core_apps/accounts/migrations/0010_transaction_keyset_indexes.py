@@ -0,0 +1,39 @@
+# Generated by Django 4.2.15 on 2026-10-18 21:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_statementartifact"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["sender", "created_at"], name="accounts_tr_sender__781392_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["receiver", "created_at"], name="accounts_tr_receive_65f779_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["sender_account", "created_at"],
+                name="accounts_tr_sender__4135e7_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["receiver_account", "created_at"],
+                name="accounts_tr_receive_120e56_idx",
+            ),
+        ),
+    ]
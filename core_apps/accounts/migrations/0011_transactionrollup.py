@@ -0,0 +1,114 @@
+# Generated by Django 4.2.15 on 2026-10-18 22:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0010_transaction_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TransactionRollup",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("day", "Day"), ("month", "Month")],
+                        max_length=5,
+                        verbose_name="Period",
+                    ),
+                ),
+                ("period_start", models.DateField(verbose_name="Period Start")),
+                (
+                    "transaction_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Transaction Count"
+                    ),
+                ),
+                (
+                    "inflow",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=14,
+                        verbose_name="Inflow",
+                    ),
+                ),
+                (
+                    "outflow",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=14,
+                        verbose_name="Outflow",
+                    ),
+                ),
+                (
+                    "deposit_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=14,
+                        verbose_name="Deposit Amount",
+                    ),
+                ),
+                (
+                    "withdrawal_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=14,
+                        verbose_name="Withdrawal Amount",
+                    ),
+                ),
+                (
+                    "transfer_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=14,
+                        verbose_name="Transfer Amount",
+                    ),
+                ),
+                (
+                    "interest_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=14,
+                        verbose_name="Interest Amount",
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transaction_rollups",
+                        to="accounts.bankaccount",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Transaction Rollup",
+                "verbose_name_plural": "Transaction Rollups",
+                "ordering": ["-period_start"],
+                "unique_together": {("account", "period", "period_start")},
+            },
+        ),
+    ]
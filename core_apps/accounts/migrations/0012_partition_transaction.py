@@ -0,0 +1,251 @@
+# Generated by Django 4.2.15 on 2026-10-18 22:31
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+import uuid
+
+PARTITIONS_AHEAD = 3
+
+
+def _month_bounds(year, month):
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return (
+        datetime(year, month, 1, tzinfo=dt_timezone.utc),
+        datetime(next_year, next_month, 1, tzinfo=dt_timezone.utc),
+    )
+
+
+def partition_transactions(apps, schema_editor):
+    """
+    Rebuild the transaction table as a table partitioned by month on
+    created_at, with a partition for every month that has rows plus a few
+    months ahead, and copy the existing rows into it.
+
+    There is no reverse: once months have been archived the rows live in two
+    tables, so going back means restoring a backup taken before this migration.
+    """
+    Transaction = apps.get_model("accounts", "Transaction")
+    table = Transaction._meta.db_table
+    legacy_table = f"{table}_unpartitioned"
+    quote = schema_editor.quote_name
+
+    schema_editor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(legacy_table)}")
+    schema_editor.execute(
+        f"CREATE TABLE {quote(table)} (LIKE {quote(legacy_table)} INCLUDING DEFAULTS) "
+        f"PARTITION BY RANGE (created_at)"
+    )
+    schema_editor.execute(
+        f"CREATE TABLE {quote(table + '_default')} PARTITION OF {quote(table)} DEFAULT"
+    )
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(created_at) FROM {quote(legacy_table)}")
+        oldest = cursor.fetchone()[0] or timezone.now()
+    now = timezone.now()
+    year, month = oldest.year, oldest.month
+    last = now.year * 12 + now.month - 1 + PARTITIONS_AHEAD
+    while year * 12 + month - 1 <= last:
+        schema_editor.execute(
+            f"CREATE TABLE {quote(f'{table}_p{year:04d}_{month:02d}')} "
+            f"PARTITION OF {quote(table)} FOR VALUES FROM (%s) TO (%s)",
+            _month_bounds(year, month),
+        )
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    schema_editor.execute(
+        f"INSERT INTO {quote(table)} SELECT * FROM {quote(legacy_table)}"
+    )
+    schema_editor.execute(f"DROP TABLE {quote(legacy_table)}")
+
+    # The partition key has to be part of the primary key.
+    schema_editor.execute(f"ALTER TABLE {quote(table)} ADD PRIMARY KEY (id, created_at)")
+    for field in Transaction._meta.local_fields:
+        if field.remote_field is None:
+            continue
+        schema_editor.execute(
+            schema_editor._create_fk_sql(
+                Transaction, field, "_fk_%(to_table)s_%(to_column)s"
+            )
+        )
+        schema_editor.execute(schema_editor._create_index_sql(Transaction, fields=[field]))
+    for index in Transaction._meta.indexes:
+        schema_editor.add_index(Transaction, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("accounts", "0011_transactionrollup"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="paymentbatchline",
+            name="transaction",
+            field=models.OneToOneField(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="payment_batch_line",
+                to="accounts.transaction",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ledgerentry",
+            name="transaction",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="ledger_entries",
+                to="accounts.transaction",
+            ),
+        ),
+        migrations.RunPython(partition_transactions),
+        migrations.CreateModel(
+            name="ArchivedTransaction",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=12,
+                        verbose_name="Amount",
+                    ),
+                ),
+                (
+                    "description",
+                    models.CharField(
+                        blank=True,
+                        max_length=500,
+                        null=True,
+                        verbose_name="Description",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "transaction_type",
+                    models.CharField(
+                        choices=[
+                            ("deposit", "Deposit"),
+                            ("withdrawal", "Withdrawal"),
+                            ("transfer", "Transfer"),
+                            ("interest", "Interest"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "receiver",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "receiver_account",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="accounts.bankaccount",
+                    ),
+                ),
+                (
+                    "sender",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "sender_account",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="accounts.bankaccount",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived Transaction",
+                "verbose_name_plural": "Archived Transactions",
+                "db_table": "accounts_archivedtransaction",
+                "ordering": ["-created_at"],
+                "managed": False,
+                "indexes": [
+                    models.Index(
+                        fields=["sender", "created_at"],
+                        name="accounts_ar_sender__2986bc_idx",
+                    ),
+                    models.Index(
+                        fields=["receiver", "created_at"],
+                        name="accounts_ar_receive_c849bf_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql=[
+                "CREATE TABLE accounts_archivedtransaction "
+                "(LIKE accounts_transaction INCLUDING DEFAULTS) "
+                "PARTITION BY RANGE (created_at)",
+                "ALTER TABLE accounts_archivedtransaction "
+                "ADD PRIMARY KEY (id, created_at)",
+                "CREATE INDEX accounts_ar_sender__2986bc_idx "
+                "ON accounts_archivedtransaction (sender_id, created_at)",
+                "CREATE INDEX accounts_ar_receive_c849bf_idx "
+                "ON accounts_archivedtransaction (receiver_id, created_at)",
+            ],
+            reverse_sql="DROP TABLE accounts_archivedtransaction",
+        ),
+    ]
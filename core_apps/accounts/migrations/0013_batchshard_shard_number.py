@@ -0,0 +1,42 @@
+# Generated by Django 4.2.15 on 2026-10-18 23:40
+
+from django.db import migrations, models
+
+
+def number_shards(apps, schema_editor):
+    BatchShard = apps.get_model("accounts", "BatchShard")
+    runs = BatchShard.objects.values_list("job_name", "run_key").distinct()
+    for job_name, run_key in runs.order_by():
+        shards = BatchShard.objects.filter(job_name=job_name, run_key=run_key)
+        ordered = shards.order_by(models.F("lower_bound").asc(nulls_first=True))
+        for shard_number, shard in enumerate(ordered):
+            shard.shard_number = shard_number
+            shard.save(update_fields=["shard_number"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_partition_transaction"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="batchshard",
+            name="shard_number",
+            field=models.PositiveIntegerField(default=0, verbose_name="Shard Number"),
+        ),
+        migrations.RunPython(number_shards, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name="batchshard",
+            options={
+                "ordering": ["job_name", "run_key", "shard_number"],
+                "verbose_name": "Batch Shard",
+                "verbose_name_plural": "Batch Shards",
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name="batchshard",
+            unique_together={("job_name", "run_key", "shard_number")},
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 4.2.15 on 2026-10-19 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+SIGNED_AMOUNT = "CASE WHEN e.entry_type = 'debit' THEN -e.amount ELSE e.amount END"
+
+# Teller deposits have no transaction, their contra leg is cash
+POST_TELLER_CONTRA_LEGS = """
+    INSERT INTO accounts_ledgerentry
+        (id, created_at, updated_at, account_id, system_account, transaction_id,
+         entry_type, amount, description)
+    SELECT gen_random_uuid(), e.created_at, e.created_at, NULL, 'cash_clearing', NULL,
+           CASE WHEN e.entry_type = 'debit' THEN 'credit' ELSE 'debit' END,
+           e.amount, e.description
+    FROM accounts_ledgerentry e
+    WHERE e.transaction_id IS NULL AND e.account_id IS NOT NULL
+"""
+
+POST_TRANSACTION_CONTRA_LEGS = f"""
+    INSERT INTO accounts_ledgerentry
+        (id, created_at, updated_at, account_id, system_account, transaction_id,
+         entry_type, amount, description)
+    SELECT gen_random_uuid(), MIN(e.created_at), MIN(e.created_at), NULL,
+           CASE
+               WHEN t.transaction_type = 'interest' THEN 'interest_expense'
+               WHEN t.transaction_type = 'deposit'
+                    AND t.sender_account_id = t.receiver_account_id
+                   THEN 'card_clearing'
+               ELSE 'cash_clearing'
+           END,
+           e.transaction_id,
+           CASE WHEN SUM({SIGNED_AMOUNT}) > 0 THEN 'debit' ELSE 'credit' END,
+           ABS(SUM({SIGNED_AMOUNT})), MIN(e.description)
+    FROM accounts_ledgerentry e
+    JOIN (
+        SELECT id, transaction_type, sender_account_id, receiver_account_id
+        FROM accounts_transaction
+        UNION ALL
+        SELECT id, transaction_type, sender_account_id, receiver_account_id
+        FROM accounts_archivedtransaction
+    ) t ON t.id = e.transaction_id
+    WHERE e.account_id IS NOT NULL
+    GROUP BY e.transaction_id, t.transaction_type, t.sender_account_id,
+             t.receiver_account_id
+    HAVING SUM({SIGNED_AMOUNT}) <> 0
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0013_batchshard_shard_number"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ledgerentry",
+            name="system_account",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("cash_clearing", "Cash Clearing"),
+                    ("card_clearing", "Card Clearing"),
+                    ("interest_expense", "Interest Expense"),
+                ],
+                max_length=20,
+                verbose_name="System Account",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ledgerentry",
+            name="account",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="ledger_entries",
+                to="accounts.bankaccount",
+            ),
+        ),
+        # Balance the entries posted before system accounts existed
+        migrations.RunSQL(
+            sql=[POST_TELLER_CONTRA_LEGS, POST_TRANSACTION_CONTRA_LEGS],
+            reverse_sql="DELETE FROM accounts_ledgerentry WHERE account_id IS NULL",
+        ),
+        migrations.AddConstraint(
+            model_name="ledgerentry",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    models.Q(("account__isnull", False), ("system_account", "")),
+                    models.Q(
+                        ("account__isnull", True),
+                        models.Q(("system_account", ""), _negated=True),
+                    ),
+                    _connector="OR",
+                ),
+                name="ledger_entry_one_account",
+            ),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from core_apps.common.models import TimeStampedModel
@@ -71,6 +72,21 @@ class BankAccount(TimeStampedModel):
         default=0.00,
         help_text=_("Annual interest rate as a decimal (e.g 0.0150 for 1.50%)")
     )
+    last_interest_date = models.DateField(
+        _("Last Interest Date"),
+        null=True,
+        blank=True,
+        help_text=_("Business date on which daily interest was last applied"),
+    )
+
+    # (upper balance bound, annual rate) pairs, checked in order. The last tier
+    # has no upper bound.
+    INTEREST_TIERS = [
+        (Decimal("100000"), Decimal("0.0050")),
+        (Decimal("500000"), Decimal("0.0100")),
+        (None, Decimal("0.0150")),
+    ]
+
     def __str__(self) -> str:
         return (
             f"{self.user.full_name}'s {self.get_currency_display()} - "
@@ -83,12 +99,9 @@ class BankAccount(TimeStampedModel):
             return Decimal("0.0000")
 
         balance = self.account_balance
-        if balance < Decimal("100000"):
-            return Decimal("0.0050")
-        elif Decimal("100000") <= balance < Decimal("500000"):
-            return Decimal("0.0100")
-        else:
-            return Decimal("0.0150")
+        for upper_bound, rate in self.INTEREST_TIERS:
+            if upper_bound is None or balance < upper_bound:
+                return rate
 
     def apply_daily_interest(self):
         if self.account_type == self.AccountType.SAVINGS:
@@ -100,9 +113,10 @@ class BankAccount(TimeStampedModel):
                 f"Applying daily interest {interest} to account {self.account_number}"
             )
             self.account_balance += interest
+            self.last_interest_date = timezone.localdate()
             self.save()
 
-            Transaction.objects.create(
+            interest_transaction = Transaction.objects.create(
                 user=self.user,
                 amount=interest,
                 transaction_type=Transaction.TransactionType.INTEREST,
@@ -111,6 +125,11 @@ class BankAccount(TimeStampedModel):
                 receiver_account=self,
                 status=Transaction.TransactionStatus.COMPLETED,
             )
+            from .ledger import post_movement
+
+            post_movement(
+                self, interest, interest_transaction, interest_transaction.description
+            )
             return interest
         return Decimal("0.00")
 
@@ -123,10 +142,21 @@ class BankAccount(TimeStampedModel):
         if self.account_balance < 0:
             raise ValidationError(_("Account balance cannot be negative."))
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "is_primary" in field_names:
+            instance._loaded_is_primary = instance.is_primary
+        return instance
+
     def save(self, *args, **kwargs) -> None:
-        if self.is_primary:
-            BankAccount.objects.filter(user=self.user).update(is_primary=False)
+        # Only demote the user's other accounts when this one becomes primary.
+        if self.is_primary and getattr(self, "_loaded_is_primary", None) is not True:
+            BankAccount.objects.filter(user_id=self.user_id).exclude(pk=self.pk).update(
+                is_primary=False
+            )
         super().save(*args, **kwargs)
+        self._loaded_is_primary = self.is_primary
 
 
 class Transaction(TimeStampedModel):
@@ -184,4 +214,413 @@ class Transaction(TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
-        indexes = [models.Index(fields=["created_at"])]
\ No newline at end of file
+        indexes = [
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["sender", "created_at"]),
+            models.Index(fields=["receiver", "created_at"]),
+            models.Index(fields=["sender_account", "created_at"]),
+            models.Index(fields=["receiver_account", "created_at"]),
+        ]
+
+
+class ArchivedTransaction(TimeStampedModel):
+    """
+    Transactions past the retention horizon. Each month is a partition that was
+    detached from the transaction table, compacted and attached to this one,
+    keeping only the indexes statements need. The table is managed by
+    partitions.py.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+        db_constraint=False,
+    )
+    amount = models.DecimalField(
+        _("Amount"), decimal_places=2, max_digits=12, default=0.00
+    )
+    description = models.CharField(
+        _("Description"), max_length=500, null=True, blank=True
+    )
+    receiver = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+        db_constraint=False,
+    )
+    sender = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+        db_constraint=False,
+    )
+    receiver_account = models.ForeignKey(
+        BankAccount,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+        db_constraint=False,
+    )
+    sender_account = models.ForeignKey(
+        BankAccount,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+        db_constraint=False,
+    )
+    status = models.CharField(
+        choices=Transaction.TransactionStatus.choices,
+        max_length=20,
+        default=Transaction.TransactionStatus.PENDING,
+    )
+    transaction_type = models.CharField(
+        choices=Transaction.TransactionType.choices, max_length=20
+    )
+
+    def __str__(self) -> str:
+        return f"{self.transaction_type} - {self.amount} - {self.status}"
+
+    class Meta:
+        managed = False
+        db_table = "accounts_archivedtransaction"
+        verbose_name = _("Archived Transaction")
+        verbose_name_plural = _("Archived Transactions")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["sender", "created_at"]),
+            models.Index(fields=["receiver", "created_at"]),
+        ]
+
+
+def _hot_or_archived_transaction(transaction_id):
+    """
+    The Transaction with this id, or the ArchivedTransaction once its month has
+    been archived. Archiving keeps the ids, so references stay resolvable.
+    """
+    if transaction_id is None:
+        return None
+    return (
+        Transaction.objects.filter(pk=transaction_id).first()
+        or ArchivedTransaction.objects.filter(pk=transaction_id).first()
+    )
+
+
+class BatchShard(TimeStampedModel):
+    class ShardStatus(models.TextChoices):
+        PENDING = ("pending", _("Pending"))
+        RUNNING = ("running", _("Running"))
+        SUCCEEDED = ("succeeded", _("Succeeded"))
+        FAILED = ("failed", _("Failed"))
+
+    job_name = models.CharField(_("Job Name"), max_length=50)
+    run_key = models.CharField(
+        _("Run Key"),
+        max_length=50,
+        help_text=_("Identifies one run of the job, e.g. the business date"),
+    )
+    shard_number = models.PositiveIntegerField(_("Shard Number"), default=0)
+    lower_bound = models.UUIDField(_("Lower Bound"), null=True, blank=True)
+    upper_bound = models.UUIDField(_("Upper Bound"), null=True, blank=True)
+    status = models.CharField(
+        _("Status"),
+        max_length=10,
+        choices=ShardStatus.choices,
+        default=ShardStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    result = models.JSONField(_("Result"), default=dict, blank=True)
+    error = models.TextField(_("Error"), blank=True)
+    started_at = models.DateTimeField(_("Started At"), null=True, blank=True)
+    finished_at = models.DateTimeField(_("Finished At"), null=True, blank=True)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.job_name} [{self.run_key}] {self.lower_bound} - {self.upper_bound}"
+        )
+
+    def get_accounts(self) -> models.QuerySet:
+        accounts = BankAccount.objects.all()
+        if self.lower_bound:
+            accounts = accounts.filter(id__gte=self.lower_bound)
+        if self.upper_bound:
+            accounts = accounts.filter(id__lt=self.upper_bound)
+        return accounts
+
+    class Meta:
+        verbose_name = _("Batch Shard")
+        verbose_name_plural = _("Batch Shards")
+        ordering = ["job_name", "run_key", "shard_number"]
+        unique_together = ["job_name", "run_key", "shard_number"]
+        indexes = [models.Index(fields=["job_name", "run_key", "status"])]
+
+
+class PaymentBatch(TimeStampedModel):
+    class BatchStatus(models.TextChoices):
+        AWAITING_OTP = ("awaiting_otp", _("Awaiting OTP"))
+        QUEUED = ("queued", _("Queued"))
+        PROCESSING = ("processing", _("Processing"))
+        COMPLETED = ("completed", _("Completed"))
+        FAILED = ("failed", _("Failed"))
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="payment_batches"
+    )
+    sender_account = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="payment_batches"
+    )
+    status = models.CharField(
+        _("Status"),
+        max_length=20,
+        choices=BatchStatus.choices,
+        default=BatchStatus.AWAITING_OTP,
+    )
+    total_lines = models.PositiveIntegerField(_("Total Lines"), default=0)
+    total_amount = models.DecimalField(
+        _("Total Amount"), decimal_places=2, max_digits=14, default=0.00
+    )
+    succeeded_lines = models.PositiveIntegerField(_("Succeeded Lines"), default=0)
+    failed_lines = models.PositiveIntegerField(_("Failed Lines"), default=0)
+    started_at = models.DateTimeField(_("Started At"), null=True, blank=True)
+    finished_at = models.DateTimeField(_("Finished At"), null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"Payment batch {self.id} - {self.total_lines} lines - {self.status}"
+
+    @property
+    def processed_lines(self) -> int:
+        return self.succeeded_lines + self.failed_lines
+
+    @property
+    def lines_per_second(self) -> float:
+        if not (self.started_at and self.finished_at):
+            return 0.0
+        elapsed = (self.finished_at - self.started_at).total_seconds()
+        return self.processed_lines / max(elapsed, 0.001)
+
+    class Meta:
+        verbose_name = _("Payment Batch")
+        verbose_name_plural = _("Payment Batches")
+        ordering = ["-created_at"]
+
+
+class PaymentBatchLine(TimeStampedModel):
+    class LineStatus(models.TextChoices):
+        PENDING = ("pending", _("Pending"))
+        SUCCEEDED = ("succeeded", _("Succeeded"))
+        FAILED = ("failed", _("Failed"))
+
+    batch = models.ForeignKey(
+        PaymentBatch, on_delete=models.CASCADE, related_name="lines"
+    )
+    line_number = models.PositiveIntegerField(_("Line Number"))
+    receiver_account = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="payment_batch_lines"
+    )
+    amount = models.DecimalField(_("Amount"), decimal_places=2, max_digits=12)
+    description = models.CharField(
+        _("Description"), max_length=500, null=True, blank=True
+    )
+    status = models.CharField(
+        _("Status"),
+        max_length=10,
+        choices=LineStatus.choices,
+        default=LineStatus.PENDING,
+    )
+    error = models.CharField(_("Error"), max_length=255, blank=True)
+    # The transaction table is partitioned, so its primary key is
+    # (id, created_at) and cannot be the target of a foreign key constraint.
+    # Once the month is archived the id refers to an ArchivedTransaction, so
+    # read it with get_transaction() rather than the accessor.
+    transaction = models.OneToOneField(
+        Transaction,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="payment_batch_line",
+        db_constraint=False,
+    )
+
+    def __str__(self) -> str:
+        return f"Line {self.line_number} of batch {self.batch_id} - {self.status}"
+
+    def get_transaction(self):
+        return _hot_or_archived_transaction(self.transaction_id)
+
+    class Meta:
+        verbose_name = _("Payment Batch Line")
+        verbose_name_plural = _("Payment Batch Lines")
+        ordering = ["batch", "line_number"]
+        unique_together = ["batch", "line_number"]
+        indexes = [models.Index(fields=["batch", "status"])]
+
+
+class LedgerEntry(TimeStampedModel):
+    """
+    One debit or credit of a bank account or of one of the bank's own system
+    accounts. Every posting is double-entry: transfers post a leg on each
+    customer account, and money entering or leaving the bank (deposits,
+    withdrawals, card top-ups, interest) posts its contra leg to a system
+    account, so the entries of a posting always net to zero.
+    """
+
+    class EntryType(models.TextChoices):
+        DEBIT = ("debit", _("Debit"))
+        CREDIT = ("credit", _("Credit"))
+
+    class SystemAccount(models.TextChoices):
+        CASH_CLEARING = ("cash_clearing", _("Cash Clearing"))
+        CARD_CLEARING = ("card_clearing", _("Card Clearing"))
+        INTEREST_EXPENSE = ("interest_expense", _("Interest Expense"))
+
+    account = models.ForeignKey(
+        BankAccount,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="ledger_entries",
+    )
+    system_account = models.CharField(
+        _("System Account"),
+        max_length=20,
+        choices=SystemAccount.choices,
+        blank=True,
+    )
+    # Refers to an ArchivedTransaction once the month is archived, see
+    # PaymentBatchLine.transaction
+    transaction = models.ForeignKey(
+        Transaction,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="ledger_entries",
+        db_constraint=False,
+    )
+    entry_type = models.CharField(
+        _("Entry Type"), max_length=6, choices=EntryType.choices
+    )
+    amount = models.DecimalField(_("Amount"), decimal_places=2, max_digits=12)
+    description = models.CharField(_("Description"), max_length=500, blank=True)
+
+    def __str__(self) -> str:
+        if self.account_id is None:
+            return f"{self.entry_type} {self.amount} - {self.system_account}"
+        return f"{self.entry_type} {self.amount} - {self.account.account_number}"
+
+    def get_transaction(self):
+        return _hot_or_archived_transaction(self.transaction_id)
+
+    @property
+    def signed_amount(self) -> Decimal:
+        if self.entry_type == self.EntryType.DEBIT:
+            return -self.amount
+        return self.amount
+
+    def save(self, *args, **kwargs) -> None:
+        if not self._state.adding:
+            raise ValidationError(_("Ledger entries are append-only."))
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError(_("Ledger entries are append-only."))
+
+    class Meta:
+        verbose_name = _("Ledger Entry")
+        verbose_name_plural = _("Ledger Entries")
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["account", "created_at"])]
+        constraints = [
+            models.CheckConstraint(
+                check=(
+                    models.Q(account__isnull=False, system_account="")
+                    | (models.Q(account__isnull=True) & ~models.Q(system_account=""))
+                ),
+                name="ledger_entry_one_account",
+            )
+        ]
+
+
+class BalanceCheckpoint(TimeStampedModel):
+    account = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="balance_checkpoints"
+    )
+    as_of = models.DateTimeField(_("As Of"))
+    balance = models.DecimalField(_("Balance"), decimal_places=2, max_digits=14)
+
+    def __str__(self) -> str:
+        return f"{self.account.account_number} - {self.balance} as of {self.as_of}"
+
+    class Meta:
+        verbose_name = _("Balance Checkpoint")
+        verbose_name_plural = _("Balance Checkpoints")
+        ordering = ["-as_of"]
+        unique_together = ["account", "as_of"]
+
+
+class StatementArtifact(TimeStampedModel):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="statement_artifacts"
+    )
+    account_number = models.CharField(_("Account Number"), max_length=20, blank=True)
+    start_date = models.DateField(_("Start Date"))
+    end_date = models.DateField(_("End Date"))
+    file_name = models.CharField(_("File Name"), max_length=255)
+    content_hash = models.CharField(_("Content Hash"), max_length=64)
+    size = models.PositiveIntegerField(_("Size"))
+    last_accessed_at = models.DateTimeField(_("Last Accessed At"))
+    expires_at = models.DateTimeField(_("Expires At"))
+
+    def __str__(self) -> str:
+        return (
+            f"Statement for {self.user.email} {self.account_number or 'all accounts'} "
+            f"{self.start_date} - {self.end_date}"
+        )
+
+    class Meta:
+        verbose_name = _("Statement Artifact")
+        verbose_name_plural = _("Statement Artifacts")
+        unique_together = ["user", "account_number", "start_date", "end_date"]
+        indexes = [models.Index(fields=["last_accessed_at"])]
+
+
+class TransactionRollup(TimeStampedModel):
+    class Period(models.TextChoices):
+        DAY = ("day", _("Day"))
+        MONTH = ("month", _("Month"))
+
+    account = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="transaction_rollups"
+    )
+    period = models.CharField(_("Period"), max_length=5, choices=Period.choices)
+    period_start = models.DateField(_("Period Start"))
+    transaction_count = models.PositiveIntegerField(_("Transaction Count"), default=0)
+    inflow = models.DecimalField(
+        _("Inflow"), decimal_places=2, max_digits=14, default=0.00
+    )
+    outflow = models.DecimalField(
+        _("Outflow"), decimal_places=2, max_digits=14, default=0.00
+    )
+    deposit_amount = models.DecimalField(
+        _("Deposit Amount"), decimal_places=2, max_digits=14, default=0.00
+    )
+    withdrawal_amount = models.DecimalField(
+        _("Withdrawal Amount"), decimal_places=2, max_digits=14, default=0.00
+    )
+    transfer_amount = models.DecimalField(
+        _("Transfer Amount"), decimal_places=2, max_digits=14, default=0.00
+    )
+    interest_amount = models.DecimalField(
+        _("Interest Amount"), decimal_places=2, max_digits=14, default=0.00
+    )
+
+    def __str__(self) -> str:
+        return f"{self.account.account_number} {self.period} {self.period_start}"
+
+    class Meta:
+        verbose_name = _("Transaction Rollup")
+        verbose_name_plural = _("Transaction Rollups")
+        ordering = ["-period_start"]
+        unique_together = ["account", "period", "period_start"]
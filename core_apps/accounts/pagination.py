@@ -1,6 +1,105 @@
-from rest_framework.pagination import PageNumberPagination
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import List, Optional, Tuple
+
+from dateutil import parser
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on (created_at, id), newest first.
+
+    The cursor is the position of the last row of the previous page, so every
+    page is an index range scan that starts where the last one stopped,
+    without a COUNT(*) or an OFFSET. The query is given as a list of branches
+    that are unioned, so an OR across several indexed columns can be served by
+    one index scan per branch.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def decode_cursor(self, request) -> Optional[Tuple]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, pk = urlsafe_b64decode(encoded.encode()).decode().split("|")
+            return parser.isoparse(created_at), uuid.UUID(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row) -> str:
+        if isinstance(row, dict):
+            created_at, pk = row["created_at"], row["id"]
+        else:
+            created_at, pk = row.created_at, row.pk
+        position = f"{created_at.isoformat()}|{pk}"
+        return urlsafe_b64encode(position.encode()).decode()
+
+    def get_page_queryset(self, branches: List[QuerySet], request) -> QuerySet:
+        self.request = request
+        self.current_page_size = page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        parts = []
+        for branch in branches:
+            if position:
+                created_at, pk = position
+                branch = branch.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+                )
+            # Each branch only needs to contribute one page worth of rows.
+            parts.append(branch.order_by(*self.ordering)[: page_size + 1])
+
+        queryset = parts[0].union(*parts[1:]) if len(parts) > 1 else parts[0]
+        if len(parts) > 1:
+            queryset = queryset.order_by(*self.ordering)[: page_size + 1]
+        return queryset
+
+    def set_page(self, rows: list) -> list:
+        self.has_next = len(rows) > self.current_page_size
+        self.page = rows[: self.current_page_size]
+        return self.page
+
+    def paginate_branches(self, branches: List[QuerySet], request) -> list:
+        return self.set_page(list(self.get_page_queryset(branches, request)))
+
+    async def apaginate_branches(self, branches: List[QuerySet], request) -> list:
+        queryset = self.get_page_queryset(branches, request)
+        return self.set_page([row async for row in queryset])
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
@@ -0,0 +1,200 @@
+import re
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from os import getenv
+from typing import List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from loguru import logger
+
+from .models import ArchivedTransaction, Transaction
+
+TRANSACTION_PARTITIONS_AHEAD = int(getenv("TRANSACTION_PARTITIONS_AHEAD", "3"))
+
+TRANSACTION_RETENTION_MONTHS = int(getenv("TRANSACTION_RETENTION_MONTHS", "24"))
+
+HOT_TABLE = Transaction._meta.db_table
+
+ARCHIVE_TABLE = ArchivedTransaction._meta.db_table
+
+# Catches rows outside every monthly partition, until their month is created
+DEFAULT_PARTITION = f"{HOT_TABLE}_default"
+
+PARTITION_NAME = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def partition_bounds(month: date) -> Tuple[datetime, datetime]:
+    next_month = add_months(month, 1)
+    return (
+        datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc),
+        datetime(next_month.year, next_month.month, 1, tzinfo=dt_timezone.utc),
+    )
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = PARTITION_NAME.search(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def _quote(name: str) -> str:
+    return connection.ops.quote_name(name)
+
+
+def list_partitions(table: str) -> List[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            ORDER BY child.relname
+            """,
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _create_partition(cursor, month: date) -> str:
+    name = partition_name(HOT_TABLE, month)
+    lower, upper = partition_bounds(month)
+    cursor.execute(
+        f"CREATE TABLE {_quote(name)} "
+        f"(LIKE {_quote(HOT_TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    # Attaching fails while the default partition holds rows of this month
+    cursor.execute(
+        f"""
+        WITH moved AS (
+            DELETE FROM {_quote(DEFAULT_PARTITION)}
+            WHERE created_at >= %s AND created_at < %s
+            RETURNING *
+        )
+        INSERT INTO {_quote(name)} SELECT * FROM moved
+        """,
+        [lower, upper],
+    )
+    cursor.execute(
+        f"ALTER TABLE {_quote(HOT_TABLE)} ATTACH PARTITION {_quote(name)} "
+        f"FOR VALUES FROM (%s) TO (%s)",
+        [lower, upper],
+    )
+    return name
+
+
+def ensure_partitions(
+    months_ahead: int = TRANSACTION_PARTITIONS_AHEAD, today: Optional[date] = None
+) -> List[str]:
+    """
+    Create the monthly partitions from the current month to ``months_ahead``
+    months from now. Returns the names of the partitions that were created.
+    """
+    current = month_start(today or timezone.localdate())
+    existing = set(list_partitions(HOT_TABLE)) | set(list_partitions(ARCHIVE_TABLE))
+
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if partition_name(HOT_TABLE, month) in existing:
+                continue
+            created.append(_create_partition(cursor, month))
+
+    if created:
+        logger.info(f"Created transaction partitions: {', '.join(created)}")
+    return created
+
+
+def _archive_partition(cursor, name: str, month: date) -> str:
+    archived_name = partition_name(ARCHIVE_TABLE, month)
+    lower, upper = partition_bounds(month)
+
+    cursor.execute(f"ALTER TABLE {_quote(HOT_TABLE)} DETACH PARTITION {_quote(name)}")
+
+    # The month is copied into a compact table instead of being re-attached as
+    # is: pages are filled completely since archived rows are never updated,
+    # rows over toast_tuple_target have their text compressed with lz4, and
+    # only the archive's own indexes are built when it is attached.
+    cursor.execute(
+        f"CREATE TABLE {_quote(archived_name)} "
+        f"(LIKE {_quote(ARCHIVE_TABLE)} INCLUDING DEFAULTS) "
+        f"WITH (fillfactor = 100, toast_tuple_target = 128)"
+    )
+    for column in ("description", "status", "transaction_type"):
+        cursor.execute(
+            f"ALTER TABLE {_quote(archived_name)} "
+            f"ALTER COLUMN {_quote(column)} SET COMPRESSION lz4"
+        )
+    cursor.execute(
+        f"INSERT INTO {_quote(archived_name)} SELECT * FROM {_quote(name)} "
+        f"ORDER BY created_at"
+    )
+    cursor.execute(f"DROP TABLE {_quote(name)}")
+    cursor.execute(
+        f"ALTER TABLE {_quote(ARCHIVE_TABLE)} ATTACH PARTITION {_quote(archived_name)} "
+        f"FOR VALUES FROM (%s) TO (%s)",
+        [lower, upper],
+    )
+    return archived_name
+
+
+def archive_partitions(
+    retention_months: int = TRANSACTION_RETENTION_MONTHS, today: Optional[date] = None
+) -> List[str]:
+    """
+    Move every monthly partition that ended more than ``retention_months`` ago
+    from the transaction table to the archive table, one month per database
+    transaction. Rows keep their ids, so ledger entries and payment batch lines
+    still find them through get_transaction(). Returns the archived partitions.
+    """
+    horizon = add_months(month_start(today or timezone.localdate()), -retention_months)
+
+    archived = []
+    for name in list_partitions(HOT_TABLE):
+        month = partition_month(name)
+        if month is None or add_months(month, 1) > horizon:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            archived.append(_archive_partition(cursor, name, month))
+
+    if archived:
+        logger.info(f"Archived transaction partitions: {', '.join(archived)}")
+    return archived
+
+
+def transaction_history(filters: Q, start_date: date, end_date: date) -> List[QuerySet]:
+    """
+    The transactions matching ``filters`` between two dates, newest first, as one
+    queryset per table. Archived months are all older than the hot ones, so the
+    querysets can be read one after the other.
+
+    The range is compared on created_at itself rather than its date so the
+    planner can prune partitions, which keeps the archive query free when the
+    range is recent.
+    """
+    lower = datetime.combine(start_date, time.min, tzinfo=dt_timezone.utc)
+    upper = datetime.combine(
+        end_date + timedelta(days=1), time.min, tzinfo=dt_timezone.utc
+    )
+    return [
+        model.objects.filter(filters, created_at__gte=lower, created_at__lt=upper)
+        .order_by("-created_at")
+        for model in (Transaction, ArchivedTransaction)
+    ]
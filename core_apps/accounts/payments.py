@@ -0,0 +1,252 @@
+import time
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from os import getenv
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+from loguru import logger
+
+from .balances import adjust_account_balance, credit_accounts
+from .fraud import score_transaction_on_commit
+from .ledger import post_movements
+from .models import BankAccount, PaymentBatch, PaymentBatchLine, Transaction
+from .transfers import run_with_retry
+
+PAYMENT_BATCH_MAX_LINES = int(getenv("PAYMENT_BATCH_MAX_LINES", "10000"))
+
+PAYMENT_BATCH_CHUNK_SIZE = int(getenv("PAYMENT_BATCH_CHUNK_SIZE", "500"))
+
+
+def validate_payment_lines(
+    sender_account: BankAccount, lines: List[dict]
+) -> Tuple[Dict[str, BankAccount], Dict[int, str]]:
+    """
+    Check every line against a single prefetch of the receiver accounts.
+
+    Returns the receivers by account number and an error message per invalid
+    line number (lines are numbered from 1).
+    """
+    account_numbers = {line["receiver_account"] for line in lines}
+    receivers = {
+        account.account_number: account
+        for account in BankAccount.objects.filter(account_number__in=account_numbers)
+    }
+
+    errors = {}
+    for line_number, line in enumerate(lines, start=1):
+        receiver_account = receivers.get(line["receiver_account"])
+        if receiver_account is None:
+            errors[line_number] = "Receiver account not found"
+        elif receiver_account.pk == sender_account.pk:
+            errors[line_number] = "Sender and receiver accounts must be different"
+        elif receiver_account.currency != sender_account.currency:
+            errors[line_number] = (
+                "Transfers are only allowed between accounts with the same currency"
+            )
+    return receivers, errors
+
+
+@transaction.atomic
+def create_payment_batch(
+    user,
+    sender_account: BankAccount,
+    lines: List[dict],
+    receivers: Dict[str, BankAccount],
+) -> PaymentBatch:
+    batch = PaymentBatch.objects.create(
+        user=user,
+        sender_account=sender_account,
+        total_lines=len(lines),
+        total_amount=sum((line["amount"] for line in lines), Decimal("0.00")),
+    )
+    PaymentBatchLine.objects.bulk_create(
+        [
+            PaymentBatchLine(
+                batch=batch,
+                line_number=line_number,
+                receiver_account=receivers[line["receiver_account"]],
+                amount=line["amount"],
+                description=line.get("description", ""),
+            )
+            for line_number, line in enumerate(lines, start=1)
+        ],
+        batch_size=1000,
+    )
+    return batch
+
+
+def _process_chunk(batch: PaymentBatch, lines: List[PaymentBatchLine]) -> None:
+    """
+    Execute one chunk of lines in a single database transaction.
+
+    The sender and every receiver in the chunk are locked in primary key order,
+    the sender is debited once for the chunk total and the receivers are
+    credited with one UPDATE. Lines the remaining balance cannot cover fail
+    individually instead of failing the chunk.
+
+    The lines are locked and read again first, so a line another run already
+    processed is skipped rather than paid twice.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        lines = list(
+            PaymentBatchLine.objects.select_for_update()
+            .filter(
+                pk__in=[line.pk for line in lines],
+                status=PaymentBatchLine.LineStatus.PENDING,
+            )
+            .order_by("line_number")
+        )
+        if not lines:
+            return
+
+        account_ids = {batch.sender_account_id}
+        account_ids.update(line.receiver_account_id for line in lines)
+        accounts = {
+            account.pk: account
+            for account in BankAccount.objects.select_for_update()
+            .filter(pk__in=account_ids)
+            .order_by("pk")
+        }
+        sender_account = accounts[batch.sender_account_id]
+
+        available = sender_account.account_balance
+        total_debit = Decimal("0.00")
+        credits = defaultdict(Decimal)
+        transactions = []
+        for line in lines:
+            line.updated_at = now
+            if line.amount > available:
+                line.status = PaymentBatchLine.LineStatus.FAILED
+                line.error = "Insufficient funds for transfer"
+                line.transaction = None
+                continue
+
+            available -= line.amount
+            total_debit += line.amount
+            credits[line.receiver_account_id] += line.amount
+            line.status = PaymentBatchLine.LineStatus.SUCCEEDED
+            line.error = ""
+            line.transaction = Transaction(
+                user_id=batch.user_id,
+                sender_id=batch.user_id,
+                sender_account=sender_account,
+                receiver_id=accounts[line.receiver_account_id].user_id,
+                receiver_account_id=line.receiver_account_id,
+                amount=line.amount,
+                description=line.description,
+                transaction_type=Transaction.TransactionType.TRANSFER,
+                status=Transaction.TransactionStatus.COMPLETED,
+            )
+            transactions.append(line.transaction)
+
+        if total_debit:
+            adjust_account_balance(sender_account, -total_debit)
+            credit_accounts(credits)
+            Transaction.objects.bulk_create(transactions)
+            post_movements(
+                movement
+                for bank_transaction in transactions
+                for movement in [
+                    (
+                        bank_transaction.sender_account_id,
+                        -bank_transaction.amount,
+                        bank_transaction,
+                        bank_transaction.description,
+                    ),
+                    (
+                        bank_transaction.receiver_account_id,
+                        bank_transaction.amount,
+                        bank_transaction,
+                        bank_transaction.description,
+                    ),
+                ]
+            )
+
+        PaymentBatchLine.objects.bulk_update(
+            lines, ["status", "error", "transaction", "updated_at"]
+        )
+        PaymentBatch.objects.filter(pk=batch.pk).update(
+            succeeded_lines=F("succeeded_lines") + len(transactions),
+            failed_lines=F("failed_lines") + len(lines) - len(transactions),
+            updated_at=now,
+        )
+        for bank_transaction in transactions:
+            score_transaction_on_commit(bank_transaction)
+
+
+def stale_payment_batches() -> QuerySet:
+    """
+    Batches still PROCESSING although no chunk has committed for longer than a
+    task may run, so the worker that claimed them must have died.
+    """
+    stale_before = timezone.now() - timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT)
+    return PaymentBatch.objects.filter(
+        status=PaymentBatch.BatchStatus.PROCESSING, updated_at__lt=stale_before
+    )
+
+
+def run_payment_batch(batch_id, chunk_size: Optional[int] = None) -> PaymentBatch:
+    """
+    Execute the pending lines of a confirmed batch, one chunk at a time.
+
+    Each chunk commits on its own, so a failed or abandoned batch can be resumed
+    by running it again: only lines still pending are picked up.
+    """
+    chunk_size = chunk_size or PAYMENT_BATCH_CHUNK_SIZE
+    # Only one run can claim a batch, overlapping deliveries of the task stop here
+    claimable = PaymentBatch.objects.filter(
+        status__in=[PaymentBatch.BatchStatus.QUEUED, PaymentBatch.BatchStatus.FAILED]
+    ) | stale_payment_batches()
+    claimed = claimable.filter(pk=batch_id).update(
+        status=PaymentBatch.BatchStatus.PROCESSING, updated_at=timezone.now()
+    )
+    batch = PaymentBatch.objects.get(id=batch_id)
+    if not claimed:
+        logger.info(f"Payment batch {batch_id} is {batch.status}, nothing to run")
+        return batch
+
+    if batch.started_at is None:
+        batch.started_at = timezone.now()
+        batch.save(update_fields=["started_at", "updated_at"])
+
+    started = time.monotonic()
+    processed = 0
+    last_line_number = 0
+    pending = batch.lines.filter(status=PaymentBatchLine.LineStatus.PENDING).order_by(
+        "line_number"
+    )
+    try:
+        while True:
+            lines = list(pending.filter(line_number__gt=last_line_number)[:chunk_size])
+            if not lines:
+                break
+            last_line_number = lines[-1].line_number
+            run_with_retry(
+                lambda: _process_chunk(batch, lines),
+                f"Payment batch {batch_id} lines up to {last_line_number}",
+            )
+            processed += len(lines)
+    except Exception as e:
+        logger.error(f"Payment batch {batch_id} failed: {str(e)}")
+        batch.status = PaymentBatch.BatchStatus.FAILED
+        batch.save(update_fields=["status", "updated_at"])
+        raise
+
+    batch.status = PaymentBatch.BatchStatus.COMPLETED
+    batch.finished_at = timezone.now()
+    batch.save(update_fields=["status", "finished_at", "updated_at"])
+    batch.refresh_from_db(fields=["succeeded_lines", "failed_lines"])
+
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"Payment batch {batch_id} completed: {batch.succeeded_lines} succeeded, "
+        f"{batch.failed_lines} failed ({processed / max(elapsed, 0.001):.1f} lines/s)"
+    )
+    return batch
@@ -0,0 +1,121 @@
+"""
+Server-side state of the multi-step withdrawal and transfer flows.
+
+Each step claims the operation's next state with cache.add, which only one
+request can win, so a replayed step cannot run twice.
+"""
+
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+CACHE_PREFIX = "pending_operation"
+
+
+class OperationKind(models.TextChoices):
+    WITHDRAWAL = ("withdrawal", _("Withdrawal"))
+    TRANSFER = ("transfer", _("Transfer"))
+
+
+class OperationState(models.TextChoices):
+    INITIATED = ("initiated", _("Initiated"))
+    QUESTION_VERIFIED = ("question_verified", _("Question Verified"))
+    EXECUTED = ("executed", _("Executed"))
+
+
+class PendingOperationError(Exception):
+    pass
+
+
+@dataclass
+class PendingOperation:
+    id: str
+    kind: str
+    user_id: str
+    state: str
+    data: dict
+
+
+def _timeout() -> int:
+    return int(settings.OTP_EXPIRATION.total_seconds())
+
+
+def _key(operation_id: str) -> str:
+    return f"{CACHE_PREFIX}:{operation_id}"
+
+
+def _latest_key(user, kind: str) -> str:
+    return f"{CACHE_PREFIX}:latest:{user.pk}:{kind}"
+
+
+def _save(operation: PendingOperation) -> None:
+    cache.set(_key(operation.id), asdict(operation), _timeout())
+
+
+def start_operation(user, kind: str, data: dict) -> PendingOperation:
+    operation = PendingOperation(
+        id=str(uuid.uuid4()),
+        kind=kind,
+        user_id=str(user.pk),
+        state=OperationState.INITIATED,
+        data=data,
+    )
+    # The latest operation is used when a client does not send the ID back
+    cache.set_many(
+        {_key(operation.id): asdict(operation), _latest_key(user, kind): operation.id},
+        _timeout(),
+    )
+    return operation
+
+
+def get_operation(
+    user, kind: str, operation_id: Optional[str] = None
+) -> PendingOperation:
+    operation_id = operation_id or cache.get(_latest_key(user, kind))
+    stored = cache.get(_key(operation_id)) if operation_id else None
+    if stored is None or stored["user_id"] != str(user.pk) or stored["kind"] != kind:
+        raise PendingOperationError(
+            f"No pending {kind} found. Please initiate a {kind} first"
+        )
+    return PendingOperation(**stored)
+
+
+def advance_operation(
+    user,
+    kind: str,
+    from_state: str,
+    to_state: str,
+    operation_id: Optional[str] = None,
+) -> PendingOperation:
+    """
+    Move the operation from ``from_state`` to ``to_state``. Raises
+    PendingOperationError when it is missing, expired, in another state, or
+    when a concurrent request already made the same move.
+    """
+    operation = get_operation(user, kind, operation_id)
+    if operation.state == to_state or not cache.add(
+        f"{_key(operation.id)}:{to_state}", 1, _timeout()
+    ):
+        raise PendingOperationError(f"This {kind} step has already been completed")
+    if operation.state != from_state:
+        cache.delete(f"{_key(operation.id)}:{to_state}")
+        raise PendingOperationError(
+            f"This {kind} is not ready for this step. Please complete the previous "
+            f"step first"
+        )
+
+    operation.state = to_state
+    _save(operation)
+    return operation
+
+
+def revert_operation(operation: PendingOperation, to_state: str) -> None:
+    """Undo a move whose step failed, so the step can be retried."""
+    cache.delete(f"{_key(operation.id)}:{operation.state}")
+    operation.state = to_state
+    _save(operation)
@@ -0,0 +1,220 @@
+import calendar
+import uuid
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from loguru import logger
+
+from .models import ArchivedTransaction, LedgerEntry, Transaction, TransactionRollup
+
+# (account_id, day, transaction_type, delta, count), a negative delta is an outflow
+RollupRow = Tuple[object, date, str, Decimal, int]
+
+TYPE_COLUMNS = {
+    Transaction.TransactionType.DEPOSIT: "deposit_amount",
+    Transaction.TransactionType.WITHDRAWAL: "withdrawal_amount",
+    Transaction.TransactionType.TRANSFER: "transfer_amount",
+    Transaction.TransactionType.INTEREST: "interest_amount",
+}
+
+COUNTER_COLUMNS = ["transaction_count", "inflow", "outflow", *TYPE_COLUMNS.values()]
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _accumulate(rows: Iterable[RollupRow]) -> Dict[Tuple, Dict[str, Decimal]]:
+    """Fold rows into daily and monthly counters keyed by (account, period, start)."""
+    totals = defaultdict(lambda: defaultdict(Decimal))
+    for account_id, day, transaction_type, delta, count in rows:
+        for period, period_start in [
+            (TransactionRollup.Period.DAY, day),
+            (TransactionRollup.Period.MONTH, _month_start(day)),
+        ]:
+            counters = totals[(account_id, period, period_start)]
+            counters["transaction_count"] += count
+            if delta >= 0:
+                counters["inflow"] += delta
+            else:
+                counters["outflow"] += -delta
+            counters[TYPE_COLUMNS[transaction_type]] += abs(delta)
+    return totals
+
+
+def _upsert(totals: Dict[Tuple, Dict[str, Decimal]]) -> None:
+    """
+    Add the counters to their rollup rows with one INSERT ... ON CONFLICT DO UPDATE.
+
+    Rows are written in key order so concurrent commits touching the same
+    accounts lock the rollup rows in the same order.
+    """
+    if not totals:
+        return
+
+    table = connection.ops.quote_name(TransactionRollup._meta.db_table)
+    columns = ["account_id", "period", "period_start", *COUNTER_COLUMNS]
+    now = timezone.now()
+    pk_field = TransactionRollup._meta.pk
+
+    values_sql = []
+    params = []
+    for key in sorted(totals, key=lambda key: (str(key[0]), key[1], key[2])):
+        account_id, period, period_start = key
+        counters = totals[key]
+        values_sql.append(f"({', '.join(['%s'] * (len(columns) + 3))})")
+        params.extend(
+            [
+                pk_field.get_db_prep_value(uuid.uuid4(), connection),
+                now,
+                now,
+                account_id,
+                period,
+                period_start,
+                int(counters["transaction_count"]),
+                *[counters[column] for column in COUNTER_COLUMNS[1:]],
+            ]
+        )
+
+    updates = ", ".join(
+        f"{column} = {table}.{column} + EXCLUDED.{column}" for column in COUNTER_COLUMNS
+    )
+    sql = f"""
+        INSERT INTO {table} (id, created_at, updated_at, {', '.join(columns)})
+        VALUES {', '.join(values_sql)}
+        ON CONFLICT (account_id, period, period_start)
+        DO UPDATE SET {updates}, updated_at = EXCLUDED.updated_at
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def record_ledger_entries(entries: Iterable[LedgerEntry]) -> None:
+    """
+    Add freshly posted ledger entries to the rollups. Runs in the same database
+    transaction as the entries, so the rollups change exactly when they commit.
+
+    Entries are bucketed by the day their transaction (or, for teller deposits,
+    the entry itself) was created, the same day a rebuild puts them in.
+    """
+    rows = []
+    for entry in entries:
+        if entry.transaction is not None:
+            transaction_type = entry.transaction.transaction_type
+            created_at = entry.transaction.created_at
+        else:
+            if entry.entry_type == LedgerEntry.EntryType.CREDIT:
+                transaction_type = Transaction.TransactionType.DEPOSIT
+            else:
+                transaction_type = Transaction.TransactionType.WITHDRAWAL
+            created_at = entry.created_at
+        day = timezone.localdate(created_at)
+        rows.append((entry.account_id, day, transaction_type, entry.signed_amount, 1))
+    _upsert(_accumulate(rows))
+
+
+def _history_rows(start_date: date, end_date: date) -> Iterable[RollupRow]:
+    """
+    Rebuild rollup rows from history with grouped queries over the hot and
+    archived transactions and the ledger. A transaction whose sender and
+    receiver account are the same (a card top-up) only counts as money leaving
+    the account, like its ledger entry.
+    """
+    for model in (Transaction, ArchivedTransaction):
+        transactions = model.objects.filter(
+            created_at__date__range=[start_date, end_date]
+        ).order_by()
+
+        outgoing = (
+            transactions.filter(sender_account__isnull=False)
+            .annotate(day=TruncDate("created_at"))
+            .values("sender_account", "day", "transaction_type")
+            .annotate(count=Count("id"), total=Sum("amount"))
+        )
+        for row in outgoing:
+            yield (
+                row["sender_account"],
+                row["day"],
+                row["transaction_type"],
+                -row["total"],
+                row["count"],
+            )
+
+        incoming = (
+            transactions.filter(receiver_account__isnull=False)
+            .exclude(receiver_account=F("sender_account"))
+            .annotate(day=TruncDate("created_at"))
+            .values("receiver_account", "day", "transaction_type")
+            .annotate(count=Count("id"), total=Sum("amount"))
+        )
+        for row in incoming:
+            yield (
+                row["receiver_account"],
+                row["day"],
+                row["transaction_type"],
+                row["total"],
+                row["count"],
+            )
+
+    # Teller deposits are only recorded in the ledger
+    teller_deposits = (
+        LedgerEntry.objects.filter(
+            transaction__isnull=True,
+            account__isnull=False,
+            created_at__date__range=[start_date, end_date],
+        )
+        .order_by()
+        .annotate(day=TruncDate("created_at"))
+        .values("account", "day", "entry_type")
+        .annotate(count=Count("id"), total=Sum("amount"))
+    )
+    for row in teller_deposits:
+        if row["entry_type"] == LedgerEntry.EntryType.CREDIT:
+            yield (
+                row["account"],
+                row["day"],
+                Transaction.TransactionType.DEPOSIT,
+                row["total"],
+                row["count"],
+            )
+        else:
+            yield (
+                row["account"],
+                row["day"],
+                Transaction.TransactionType.WITHDRAWAL,
+                -row["total"],
+                row["count"],
+            )
+
+
+def rebuild_rollups(start_date: date, end_date: date) -> Tuple[date, date]:
+    """
+    Recompute the rollups of every month touched by ``start_date``..``end_date``.
+
+    The range is widened to whole months so monthly rows are rebuilt from
+    complete data. Returns the range that was actually rebuilt.
+    """
+    start_date = _month_start(start_date)
+    end_date = end_date.replace(
+        day=calendar.monthrange(end_date.year, end_date.month)[1]
+    )
+
+    with transaction.atomic():
+        TransactionRollup.objects.filter(
+            period_start__range=[start_date, end_date]
+        ).delete()
+        totals = _accumulate(_history_rows(start_date, end_date))
+        keys = list(totals)
+        for offset in range(0, len(keys), 1000):
+            _upsert({key: totals[key] for key in keys[offset : offset + 1000]})
+
+    logger.info(
+        f"Rebuilt {len(totals)} transaction rollups from {start_date} to {end_date}"
+    )
+    return start_date, end_date
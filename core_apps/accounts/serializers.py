@@ -1,6 +1,14 @@
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from .models import BankAccount, Transaction
+from core_apps.user_auth import otp as otp_store
+from .models import (
+    BankAccount,
+    PaymentBatch,
+    PaymentBatchLine,
+    Transaction,
+    TransactionRollup,
+)
+from .payments import PAYMENT_BATCH_MAX_LINES
 from decimal import Decimal
 
 
@@ -219,6 +227,55 @@ class TransactionSerializer(serializers.ModelSerializer):
         return data
 
 
+# Columns of one joined .values() query that serves a whole transaction page
+TRANSACTION_ROW_FIELDS = [
+    "id",
+    "amount",
+    "description",
+    "status",
+    "transaction_type",
+    "created_at",
+    "sender__first_name",
+    "sender__last_name",
+    "receiver__first_name",
+    "receiver__last_name",
+    "sender_account__account_number",
+    "receiver_account__account_number",
+]
+
+
+def _row_full_name(row: dict, prefix: str):
+    first_name = row[f"{prefix}__first_name"]
+    if first_name is None:
+        return None
+    # Same formatting as User.full_name
+    return f"{first_name} {row[f'{prefix}__last_name']}".title().strip()
+
+
+class TransactionRowSerializer(serializers.BaseSerializer):
+    """
+    Read-only representation of the rows of a Transaction queryset projected with
+    .values(*TRANSACTION_ROW_FIELDS). Produces the same output as
+    TransactionSerializer without hydrating a model instance per row.
+    """
+
+    created_at_field = serializers.DateTimeField()
+
+    def to_representation(self, row: dict) -> dict:
+        return {
+            "id": str(row["id"]),
+            "amount": str(row["amount"]),
+            "description": row["description"],
+            "status": row["status"],
+            "transaction_type": row["transaction_type"],
+            "created_at": self.created_at_field.to_representation(row["created_at"]),
+            "sender": _row_full_name(row, "sender"),
+            "receiver": _row_full_name(row, "receiver"),
+            "sender_account": row["sender_account__account_number"],
+            "receiver_account": row["receiver_account__account_number"],
+        }
+
+
 class SecurityQuestionSerializer(serializers.Serializer):
     security_answer = serializers.CharField(max_length=30)
 
@@ -234,7 +291,8 @@ class OTPVerificationSerializer(serializers.Serializer):
 
     def validate(self, data: dict) -> dict:
         user = self.context["request"].user
-        if not user.verify_otp(data["otp"]):
+        purpose = self.context.get("otp_purpose", otp_store.TRANSACTION)
+        if not user.verify_otp(data["otp"], purpose):
             raise serializers.ValidationError("Invalid or expired OTP.")
         return data
 
@@ -246,4 +304,99 @@ class UsernameVerificationSerializer(serializers.Serializer):
         user = self.context["request"].user
         if user.username != value:
             raise serializers.ValidationError("Invalid username.")
-        return value
\ No newline at end of file
+        return value
+
+
+class PaymentLineInputSerializer(serializers.Serializer):
+    receiver_account = serializers.CharField(max_length=20)
+    amount = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=Decimal("0.1")
+    )
+    description = serializers.CharField(
+        max_length=500, required=False, allow_blank=True, default=""
+    )
+
+
+class PaymentBatchCreateSerializer(serializers.Serializer):
+    sender_account = serializers.CharField(max_length=20)
+    lines = PaymentLineInputSerializer(
+        many=True, min_length=1, max_length=PAYMENT_BATCH_MAX_LINES
+    )
+
+
+class PaymentBatchLineSerializer(serializers.ModelSerializer):
+    id = UUIDField(read_only=True)
+    receiver_account = serializers.CharField(source="receiver_account.account_number")
+    transaction = UUIDField(source="transaction_id", read_only=True)
+
+    class Meta:
+        model = PaymentBatchLine
+        fields = [
+            "id",
+            "line_number",
+            "receiver_account",
+            "amount",
+            "description",
+            "status",
+            "error",
+            "transaction",
+        ]
+
+    def to_representation(self, instance: PaymentBatchLine) -> str:
+        representation = super().to_representation(instance)
+        representation["amount"] = str(representation["amount"])
+        return representation
+
+
+class PaymentBatchSerializer(serializers.ModelSerializer):
+    id = UUIDField(read_only=True)
+    sender_account = serializers.CharField(source="sender_account.account_number")
+    processed_lines = serializers.IntegerField(read_only=True)
+    lines_per_second = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = PaymentBatch
+        fields = [
+            "id",
+            "sender_account",
+            "status",
+            "total_lines",
+            "total_amount",
+            "processed_lines",
+            "succeeded_lines",
+            "failed_lines",
+            "lines_per_second",
+            "started_at",
+            "finished_at",
+            "created_at",
+        ]
+
+    def to_representation(self, instance: PaymentBatch) -> str:
+        representation = super().to_representation(instance)
+        representation["total_amount"] = str(representation["total_amount"])
+        return representation
+
+
+class TransactionRollupSerializer(serializers.ModelSerializer):
+    account_number = serializers.CharField(source="account.account_number")
+
+    class Meta:
+        model = TransactionRollup
+        fields = [
+            "account_number",
+            "period",
+            "period_start",
+            "transaction_count",
+            "inflow",
+            "outflow",
+            "deposit_amount",
+            "withdrawal_amount",
+            "transfer_amount",
+            "interest_amount",
+        ]
+
+    def to_representation(self, instance: TransactionRollup) -> str:
+        representation = super().to_representation(instance)
+        for field in self.Meta.fields[4:]:
+            representation[field] = str(representation[field])
+        return representation
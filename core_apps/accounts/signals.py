@@ -0,0 +1,25 @@
+from typing import Any, Type
+
+from django.db.models.base import Model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core_apps.accounts.models import Transaction
+from core_apps.accounts.statement_cache import invalidate_statements
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def invalidate_backdated_statements(
+    sender: Type[Model], instance: Transaction, **kwargs: Any
+) -> None:
+    """
+    Cached statements only cover closed ranges, so only a transaction dated
+    before today can change one of them.
+    """
+    if instance.created_at is None:
+        return
+    transaction_date = timezone.localdate(instance.created_at)
+    if transaction_date < timezone.localdate():
+        invalidate_statements([instance.sender_id, instance.receiver_id], transaction_date)
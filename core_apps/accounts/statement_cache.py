@@ -0,0 +1,134 @@
+import hashlib
+from datetime import date, timedelta
+from os import getenv
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db.models import Sum
+from django.utils import timezone
+from loguru import logger
+
+from .models import StatementArtifact
+
+STATEMENT_CACHE_TTL_DAYS = int(getenv("STATEMENT_CACHE_TTL_DAYS", "30"))
+
+STATEMENT_CACHE_MAX_BYTES = int(getenv("STATEMENT_CACHE_MAX_BYTES", str(1024**3)))
+
+# Artifacts are content addressed (<sha256>.pdf), so identical statements
+# share one file
+statement_storage = FileSystemStorage(location=settings.STATEMENT_CACHE_DIR)
+
+
+def is_closed_range(end_date: date) -> bool:
+    """Only ranges that ended before today are immutable enough to cache."""
+    return end_date < timezone.localdate()
+
+
+def _delete_file_if_unused(file_name: str) -> None:
+    if not StatementArtifact.objects.filter(file_name=file_name).exists():
+        statement_storage.delete(file_name)
+
+
+def _delete_artifacts(artifacts: Iterable[StatementArtifact]) -> int:
+    deleted = 0
+    for artifact in artifacts:
+        artifact.delete()
+        _delete_file_if_unused(artifact.file_name)
+        deleted += 1
+    return deleted
+
+
+def get_cached_statement(
+    user, account_number: Optional[str], start_date: date, end_date: date
+) -> Optional[bytes]:
+    """Return the cached PDF for this statement, or None on a miss."""
+    if not is_closed_range(end_date):
+        return None
+
+    artifact = StatementArtifact.objects.filter(
+        user=user,
+        account_number=account_number or "",
+        start_date=start_date,
+        end_date=end_date,
+    ).first()
+    if artifact is None:
+        return None
+
+    now = timezone.now()
+    if artifact.expires_at <= now or not statement_storage.exists(artifact.file_name):
+        _delete_artifacts([artifact])
+        return None
+
+    with statement_storage.open(artifact.file_name, "rb") as f:
+        pdf = f.read()
+    if hashlib.sha256(pdf).hexdigest() != artifact.content_hash:
+        logger.warning(f"Discarding corrupt cached statement {artifact.file_name}")
+        _delete_artifacts([artifact])
+        return None
+
+    StatementArtifact.objects.filter(pk=artifact.pk).update(last_accessed_at=now)
+    return pdf
+
+
+def store_statement(
+    user, account_number: Optional[str], start_date: date, end_date: date, pdf: bytes
+) -> Optional[StatementArtifact]:
+    if not is_closed_range(end_date):
+        return None
+
+    content_hash = hashlib.sha256(pdf).hexdigest()
+    file_name = f"{content_hash}.pdf"
+    if not statement_storage.exists(file_name):
+        file_name = statement_storage.save(file_name, ContentFile(pdf))
+
+    now = timezone.now()
+    artifact, _ = StatementArtifact.objects.update_or_create(
+        user=user,
+        account_number=account_number or "",
+        start_date=start_date,
+        end_date=end_date,
+        defaults={
+            "file_name": file_name,
+            "content_hash": content_hash,
+            "size": len(pdf),
+            "last_accessed_at": now,
+            "expires_at": now + timedelta(days=STATEMENT_CACHE_TTL_DAYS),
+        },
+    )
+    return artifact
+
+
+def invalidate_statements(user_ids: Iterable, on_date: date) -> int:
+    """Drop every cached statement of these users whose range covers ``on_date``."""
+    user_ids = [user_id for user_id in user_ids if user_id]
+    if not user_ids:
+        return 0
+    return _delete_artifacts(
+        StatementArtifact.objects.filter(
+            user_id__in=user_ids, start_date__lte=on_date, end_date__gte=on_date
+        )
+    )
+
+
+def evict_statements(max_bytes: int = STATEMENT_CACHE_MAX_BYTES) -> int:
+    """
+    Remove expired statements, then the least recently used ones until the
+    cache fits in ``max_bytes``. Returns the number of statements removed.
+    """
+    evicted = _delete_artifacts(
+        StatementArtifact.objects.filter(expires_at__lte=timezone.now())
+    )
+
+    total = StatementArtifact.objects.aggregate(total=Sum("size"))["total"] or 0
+    if total > max_bytes:
+        oldest_first = StatementArtifact.objects.order_by("last_accessed_at")
+        for artifact in oldest_first.iterator():
+            if total <= max_bytes:
+                break
+            total -= artifact.size
+            evicted += _delete_artifacts([artifact])
+
+    logger.info(f"Evicted {evicted} cached statements")
+    return evicted
@@ -0,0 +1,163 @@
+from os import getenv
+from typing import BinaryIO, Iterator, List, Sequence, Union
+
+from django.db.models import QuerySet
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph, Table, TableStyle
+
+from .models import Transaction
+
+STATEMENT_ROWS_PER_PAGE = int(getenv("STATEMENT_ROWS_PER_PAGE", "20"))
+
+STATEMENT_CHUNK_SIZE = int(getenv("STATEMENT_CHUNK_SIZE", "2000"))
+
+# The canvas keeps every page until save() and the email needs the whole PDF,
+# so the size of a statement is what bounds the memory of rendering it
+STATEMENT_MAX_ROWS = int(getenv("STATEMENT_MAX_ROWS", "20000"))
+
+PAGE_SIZE = landscape(letter)
+
+LEFT_MARGIN = 30
+RIGHT_MARGIN = 30
+TOP_MARGIN = 30
+BOTTOM_MARGIN = 18
+
+HEADER = ["Date", "Type", "Amount", "Description", "Status", "Sender", "Receiver"]
+
+COLUMN_WIDTHS = [
+    1.8 * inch,
+    0.8 * inch,
+    1.2 * inch,
+    2.5 * inch,
+    0.8 * inch,
+    1.2 * inch,
+    1.2 * inch,
+]
+
+TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.gray),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 12),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+        ("TEXTCOLOR", (0, 1), (-1, -1), colors.black),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 1), (-1, -1), 10),
+        ("TOPPADDING", (0, 1), (-1, -1), 6),
+        ("BOTTOMPADDING", (0, 1), (-1, -1), 6),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+        ("WORDWRAP", (0, 0), (-1, -1), True),
+    ]
+)
+
+
+class StatementTooLargeError(Exception):
+    pass
+
+
+def _transaction_row(transaction: Transaction) -> List[str]:
+    description = transaction.description or ""
+    return [
+        transaction.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        transaction.get_transaction_type_display(),
+        f"${transaction.amount:.2f}",
+        description[:30] + "..." if len(description) > 30 else description,
+        transaction.get_status_display(),
+        transaction.sender.full_name if transaction.sender else "N/A",
+        transaction.receiver.full_name if transaction.receiver else "N/A",
+    ]
+
+
+def _pages(
+    querysets: Sequence[QuerySet], rows_per_page: int
+) -> Iterator[List[List[str]]]:
+    """Yield the statement rows one page at a time, streaming from the database."""
+    page = []
+    for transactions in querysets:
+        for transaction in transactions.select_related("sender", "receiver").iterator(
+            chunk_size=STATEMENT_CHUNK_SIZE
+        ):
+            page.append(_transaction_row(transaction))
+            if len(page) == rows_per_page:
+                yield page
+                page = []
+    if page:
+        yield page
+
+
+def render_transaction_statement(
+    transactions: Union[QuerySet, Sequence[QuerySet]],
+    title: str,
+    output: BinaryIO,
+    rows_per_page: int = STATEMENT_ROWS_PER_PAGE,
+) -> int:
+    """
+    Render ``transactions`` as a paginated PDF table into ``output``.
+
+    Rows are read in chunks and every page is drawn before the next one is
+    built, so only one page of rows and flowables is held at a time instead of
+    a single Table with every transaction. Several querysets, e.g. the hot and
+    archived transactions, are rendered one after the other. Returns the row
+    count.
+
+    The canvas still keeps every compressed page until save(), so statements
+    are capped at STATEMENT_MAX_ROWS rows to bound the memory they take.
+    """
+    if isinstance(transactions, QuerySet):
+        transactions = [transactions]
+    return render_statement_pages(_pages(transactions, rows_per_page), title, output)
+
+
+def render_statement_pages(
+    pages: Iterator[List[List[str]]],
+    title: str,
+    output: BinaryIO,
+    max_rows: int = STATEMENT_MAX_ROWS,
+) -> int:
+    """
+    Draw pages of statement rows, one table per PDF page, into ``output``.
+    Raises StatementTooLargeError once there are more than ``max_rows`` rows.
+    """
+    width, height = PAGE_SIZE
+    frame_width = width - LEFT_MARGIN - RIGHT_MARGIN
+    pdf = canvas.Canvas(output, pagesize=PAGE_SIZE, pageCompression=1)
+
+    rows = 0
+    page_number = 0
+    while True:
+        page = next(pages, None)
+        if page is None and page_number > 0:
+            break
+        rows += len(page or [])
+        if rows > max_rows:
+            raise StatementTooLargeError(
+                f"Statements are limited to {max_rows} transactions"
+            )
+        page_number += 1
+        top = height - TOP_MARGIN
+
+        if page_number == 1:
+            heading = Paragraph(title, getSampleStyleSheet()["Title"])
+            _, heading_height = heading.wrapOn(pdf, frame_width, top - BOTTOM_MARGIN)
+            heading.drawOn(pdf, LEFT_MARGIN, top - heading_height)
+            top -= heading_height + 12
+
+        table = Table([HEADER] + (page or []), colWidths=COLUMN_WIDTHS)
+        table.setStyle(TABLE_STYLE)
+        table_width, table_height = table.wrapOn(pdf, frame_width, top - BOTTOM_MARGIN)
+        table.drawOn(pdf, LEFT_MARGIN + (frame_width - table_width) / 2, top - table_height)
+        pdf.showPage()
+
+        if page is None:
+            break
+
+    pdf.save()
+    return rows
@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from os import getenv
+from typing import Callable, List, Optional
+
+from django.contrib.auth import get_user_model
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    Q,
+    QuerySet,
+    Sum,
+    When,
+)
+from django.utils import timezone
+
+from .models import BankAccount, LedgerEntry, Transaction
+
+User = get_user_model()
+
+
+@dataclass
+class SuspiciousActivityScope:
+    """What a single run of the detector looks at, shared by every rule."""
+
+    accounts: QuerySet
+    users: QuerySet
+    transactions: QuerySet
+    time_threshold: datetime
+    large_transaction_threshold: Decimal
+    frequent_transaction_threshold: int
+
+
+def large_transactions_rule(scope: SuspiciousActivityScope) -> List[str]:
+    large_transactions = (
+        scope.transactions.filter(
+            amount__gte=scope.large_transaction_threshold,
+            created_at__lte=scope.time_threshold,
+        )
+        .select_related("user")
+        .order_by()
+    )
+    return [
+        f"Large transaction detected: {transaction.amount} by user {transaction.user.email}"
+        for transaction in large_transactions
+    ]
+
+
+def frequent_transactions_rule(scope: SuspiciousActivityScope) -> List[str]:
+    frequent_users = (
+        Transaction.objects.filter(
+            user__in=scope.users, created_at__gte=scope.time_threshold
+        )
+        .order_by()
+        .values("user__email")
+        .annotate(transaction_count=Count("id"))
+        .filter(transaction_count__gte=scope.frequent_transaction_threshold)
+    )
+    return [
+        f"Frequent transactions detected: {row['transaction_count']} by user {row['user__email']}"
+        for row in frequent_users
+    ]
+
+
+def large_balance_change_rule(scope: SuspiciousActivityScope) -> List[str]:
+    """
+    Net change of every account over the window, in one GROUP BY account over
+    the ledger entries of its transactions.
+    """
+    threshold = scope.large_transaction_threshold
+    balance_changes = (
+        LedgerEntry.objects.filter(
+            account__in=scope.accounts,
+            transaction__isnull=False,
+            created_at__gte=scope.time_threshold,
+        )
+        .order_by()
+        .values("account__account_number")
+        .annotate(
+            total_change=Sum(
+                Case(
+                    When(entry_type=LedgerEntry.EntryType.DEBIT, then=-F("amount")),
+                    default=F("amount"),
+                    output_field=DecimalField(max_digits=14, decimal_places=2),
+                )
+            )
+        )
+        # abs(total_change) > threshold, evaluated by the database
+        .filter(Q(total_change__gt=threshold) | Q(total_change__lt=-threshold))
+        .values_list("account__account_number", "total_change")
+    )
+    return [
+        f"Large balance change detected: {total_change} by user {account_number}"
+        for account_number, total_change in balance_changes
+    ]
+
+
+# Each rule returns one description per finding, using a fixed number of
+# grouped queries however many accounts are in scope
+SUSPICIOUS_ACTIVITY_RULES: List[Callable[[SuspiciousActivityScope], List[str]]] = [
+    large_transactions_rule,
+    frequent_transactions_rule,
+    large_balance_change_rule,
+]
+
+
+def find_suspicious_activities(
+    accounts: Optional[QuerySet] = None,
+    now: Optional[datetime] = None,
+    rules: Optional[List[Callable[[SuspiciousActivityScope], List[str]]]] = None,
+) -> List[str]:
+    """
+    Run the suspicious activity rules and return a description per finding.
+
+    ``accounts`` restricts the scan to a subset of bank accounts (and the
+    users owning them), so the detector can run one shard at a time.
+    """
+    LARGE_TRANSACTION_THRESHOLD = Decimal(getenv("LARGE_TRANSACTION_THRESHOLD"))
+
+    FREQUENT_TRANSACTION_THRESHOLD = int(getenv("FREQUENT_TRANSACTION_THRESHOLD"))
+
+    TIME_WINDOW_HOURS = int(getenv("TIME_WINDOW_HOURS"))
+
+    TIME_WINDOW = timedelta(hours=TIME_WINDOW_HOURS)
+
+    now = now or timezone.now()
+
+    if accounts is None:
+        accounts = BankAccount.objects.all()
+        users = User.objects.all()
+        transactions = Transaction.objects.all()
+    else:
+        users = User.objects.filter(bank_accounts__in=accounts).distinct()
+        transactions = Transaction.objects.filter(
+            Q(sender_account__in=accounts) | Q(receiver_account__in=accounts)
+        )
+
+    scope = SuspiciousActivityScope(
+        accounts=accounts,
+        users=users,
+        transactions=transactions,
+        time_threshold=now - TIME_WINDOW,
+        large_transaction_threshold=LARGE_TRANSACTION_THRESHOLD,
+        frequent_transaction_threshold=FREQUENT_TRANSACTION_THRESHOLD,
+    )
+
+    suspicious_activities = []
+    for rule in rules if rules is not None else SUSPICIOUS_ACTIVITY_RULES:
+        suspicious_activities.extend(rule(scope))
+
+    return suspicious_activities
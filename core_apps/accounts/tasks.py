@@ -1,4 +1,4 @@
-from io import BytesIO
+from tempfile import TemporaryFile
 
 from celery import shared_task
 from dateutil import parser
@@ -8,19 +8,17 @@ from django.core.mail import EmailMessage
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from loguru import logger
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import landscape, letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
-from .models import BankAccount, Transaction
-from django.db import transaction
-from os import getenv
-from decimal import Decimal
-from datetime import timedelta
-from django.utils import timezone
-from django.db.models import Q, Sum
+from core_apps.common.db_router import read_from_replica
+from .batch import SHARDED_JOBS, dispatch_sharded_job
 from .emails import send_suspicious_activity_alert
+from .models import BankAccount, BatchShard
+from .ledger import create_checkpoints
+from .partitions import archive_partitions, ensure_partitions, transaction_history
+from .payments import run_payment_batch, stale_payment_batches
+from .statement_cache import evict_statements, get_cached_statement, store_statement
+from .statements import STATEMENT_MAX_ROWS, render_transaction_statement
+from django.utils import timezone
+from django.db.models import Max, Min
 
 User = get_user_model()
 
@@ -33,96 +31,49 @@ def generate_transaction_pdf(user_id, start_date, end_date, account_number=None)
         start_date = parser.parse(start_date).date()
         end_date = parser.parse(end_date).date()
 
-        transactions = Transaction.objects.filter(
-            Q(sender=user) | Q(receiver=user),
-            created_at__date__range=[start_date, end_date],
-        ).order_by("-created_at")
-
-        if account_number:
-            account = BankAccount.objects.get(account_number=account_number, user=user)
-            transactions = transactions.filter(
-                Q(sender_account=account) | Q(receiver_account=account)
+        pdf = get_cached_statement(user, account_number, start_date, end_date)
+        if pdf is None:
+            # Statements are read from a replica unless the user just moved money
+            with read_from_replica(user_id):
+                filters = Q(sender=user) | Q(receiver=user)
+                if account_number:
+                    account = BankAccount.objects.get(
+                        account_number=account_number, user=user
+                    )
+                    filters &= Q(sender_account=account) | Q(receiver_account=account)
+
+                # Reads the archived months as well when the range reaches them
+                transactions = transaction_history(filters, start_date, end_date)
+                num_rows = sum(queryset.count() for queryset in transactions)
+                if num_rows > STATEMENT_MAX_ROWS:
+                    EmailMessage(
+                        _("Your Transaction History PDF"),
+                        f"Dear {user.full_name}, the range from {start_date} to "
+                        f"{end_date} has {num_rows} transactions, more than the "
+                        f"{STATEMENT_MAX_ROWS} a statement can hold. Please "
+                        f"request a shorter range.",
+                        settings.DEFAULT_FROM_EMAIL,
+                        [user.email],
+                    ).send()
+                    return f"Statement of {num_rows} transactions is too large"
+
+                # Spooled to a temp file while rendering. The finished PDF is
+                # read back whole for the email, which the row cap bounds
+                with TemporaryFile() as output:
+                    render_transaction_statement(
+                        transactions,
+                        f"Transaction History from ({start_date} to {end_date})",
+                        output,
+                    )
+                    output.seek(0)
+                    pdf = output.read()
+
+            store_statement(user, account_number, start_date, end_date, pdf)
+        else:
+            logger.info(
+                f"Serving cached transaction PDF {start_date} - {end_date} to {user.email}"
             )
 
-        #Saves in memory not in disk
-        buffer = BytesIO()
-
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=landscape(letter),
-            rightMargin=30,
-            leftMargin=30,
-            topMargin=30,
-            bottomMargin=18,
-        )
-        elements = []
-        styles = getSampleStyleSheet()
-        elements.append(
-            Paragraph(
-                f"Transaction History from ({start_date} to {end_date})",
-                styles["Title"],
-            )
-        )
-        elements.append(Spacer(1, 12))
-
-        data = [
-            ["Date", "Type", "Amount", "Description", "Status", "Sender", "Receiver"]
-        ]
-        for transaction in transactions:
-            data.append(
-                [
-                    transaction.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    transaction.get_transaction_type_display(),
-                    f"${transaction.amount:.2f}",
-                    (
-                        transaction.description[:30] + "..."
-                        if len(transaction.description) > 30
-                        else transaction.description
-                    ),
-                    transaction.get_status_display(),
-                    transaction.sender.full_name if transaction.sender else "N/A",
-                    transaction.receiver.full_name if transaction.receiver else "N/A",
-                ]
-            )
-
-        col_widths = [
-            1.8 * inch,
-            0.8 * inch,
-            1.2 * inch,
-            2.5 * inch,
-            0.8 * inch,
-            1.2 * inch,
-            1.2 * inch,
-        ]
-        table = Table(data, colWidths=col_widths)
-
-        styles = TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.gray),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 12),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                ("TEXTCOLOR", (0, 1), (-1, -1), colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 1), (-1, -1), 10),
-                ("TOPPADDING", (0, 1), (-1, -1), 6),
-                ("BOTTOMPADDING", (0, 1), (-1, -1), 6),
-                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ("WORDWRAP", (0, 0), (-1, -1), True),
-            ]
-        )
-        table.setStyle(styles)
-        elements.append(table)
-
-        doc.build(elements)
-        buffer.seek(0)
-        pdf = buffer.getvalue()
-        buffer.close()
-
         subject = _("Your Transaction History PDF")
         message = (
             f"Dear {user.full_name}, Please find attached your transaction history PDF"
@@ -148,85 +99,114 @@ def generate_transaction_pdf(user_id, start_date, end_date, account_number=None)
 
 
 @shared_task
-def apply_daily_interest():
-    savings_account = BankAccount.objects.filter(
-        account_type=BankAccount.AccountType.SAVINGS
-    )
+def apply_daily_interest(business_date=None):
+    if business_date:
+        business_date = parser.parse(business_date).date()
+    else:
+        business_date = timezone.localdate()
 
-    for account in savings_account:
-        with transaction.atomic():
-            account.apply_daily_interest()
-    logger.info(
-        f"Done applying daily interest to {savings_account.count()} savings accounts"
-    )
-    return f"Applied daily interest to {savings_account.count()} savings accounts"
+    num_shards = dispatch_sharded_job("daily_interest", business_date.isoformat())
+    return f"Dispatched {num_shards} daily interest shards for {business_date}"
 
 
 @shared_task
 def detect_suspicious_activities():
-    LARGE_TRANSACTION_THRESHOLD = Decimal(getenv("LARGE_TRANSACTION_THRESHOLD"))
+    run_key = timezone.now().isoformat()
+    num_shards = dispatch_sharded_job("suspicious_activities", run_key)
+    return f"Dispatched {num_shards} suspicious activity shards for {run_key}"
 
-    FREQUENT_TRANSACTION_THRESHOLD = int(getenv("FREQUENT_TRANSACTION_THRESHOLD"))
 
-    TIME_WINDOW_HOURS = int(getenv("TIME_WINDOW_HOURS"))
+@shared_task
+def alert_suspicious_activities(suspicious_activities):
+    num_activities = send_suspicious_activity_alert(suspicious_activities)
+    if num_activities:
+        return f"{num_activities} suspicious activities reported"
+    return "Suspicious activities detected but alert email failed to send"
 
-    TIME_WINDOW = timedelta(hours=TIME_WINDOW_HOURS)
 
-    now = timezone.now()
+@shared_task
+def checkpoint_ledger_balances():
+    num_checkpoints = create_checkpoints()
+    return f"Wrote {num_checkpoints} balance checkpoints"
 
-    time_threshold = now - TIME_WINDOW
 
-    suspicious_activities = []
+@shared_task
+def evict_statement_cache():
+    num_evicted = evict_statements()
+    return f"Evicted {num_evicted} cached statements"
 
-    large_transactions = Transaction.objects.filter(
-        amount__gte=LARGE_TRANSACTION_THRESHOLD, created_at__lte=time_threshold
-    )
 
-    for transaction in large_transactions:
-        suspicious_activities.append(
-            f"Large transaction detected: {transaction.amount} by user {transaction.user.email}"
+@shared_task
+def run_batch_shard(shard_id):
+    shard = BatchShard.objects.get(id=shard_id)
+    shard.status = BatchShard.ShardStatus.RUNNING
+    shard.attempts += 1
+    shard.started_at = timezone.now()
+    shard.save(update_fields=["status", "attempts", "started_at", "updated_at"])
+
+    run_shard = SHARDED_JOBS[shard.job_name]["run_shard"]
+    try:
+        shard.result = run_shard(shard.get_accounts(), shard.run_key)
+        shard.status = BatchShard.ShardStatus.SUCCEEDED
+        shard.error = ""
+    except Exception as e:
+        logger.error(f"Shard {shard} failed: {str(e)}")
+        shard.status = BatchShard.ShardStatus.FAILED
+        shard.error = str(e)
+    shard.finished_at = timezone.now()
+    shard.save(update_fields=["status", "result", "error", "finished_at", "updated_at"])
+    return {"shard": shard_id, "status": shard.status}
+
+
+@shared_task
+def aggregate_batch_shards(shard_results, job_name, run_key):
+    shards = BatchShard.objects.filter(job_name=job_name, run_key=run_key)
+    failed = shards.exclude(status=BatchShard.ShardStatus.SUCCEEDED).count()
+    if failed:
+        logger.warning(
+            f"{failed} shards of {job_name} [{run_key}] did not succeed. Run "
+            f"resume_failed_shards to retry them"
         )
+        return f"{job_name} [{run_key}]: {failed} shards did not succeed"
 
-    users = User.objects.all()
-    for user in users:
-        transaction_count = Transaction.objects.filter(
-            user=user, created_at__gte=time_threshold
-        ).count()
+    summary = shards.aggregate(started=Min("started_at"), finished=Max("finished_at"))
+    results = [shard.result for shard in shards]
+    processed = sum(result.get("processed", 0) for result in results)
+    elapsed = (summary["finished"] - summary["started"]).total_seconds()
+    logger.info(
+        f"{job_name} [{run_key}] finished: {processed} accounts across "
+        f"{len(results)} shards ({processed / max(elapsed, 0.001):.1f} accounts/s)"
+    )
+    return SHARDED_JOBS[job_name]["finalize"](run_key, results)
 
-        if transaction_count >= FREQUENT_TRANSACTION_THRESHOLD:
-            suspicious_activities.append(
-                f"Frequent transactions detected: {transaction_count} by user {user.email}"
-            )
 
-    accounts = BankAccount.objects.all()
+@shared_task
+def resume_failed_shards(job_name, run_key):
+    num_shards = dispatch_sharded_job(job_name, run_key, only_failed=True)
+    return f"Resumed {num_shards} failed or stale shards for {job_name} [{run_key}]"
+
+
+@shared_task
+def execute_payment_batch(batch_id):
+    batch = run_payment_batch(batch_id)
+    return (
+        f"Payment batch {batch_id}: {batch.succeeded_lines} lines succeeded, "
+        f"{batch.failed_lines} failed"
+    )
 
-    for account in accounts:
-        balance_change = Transaction.objects.filter(
-            Q(sender_account=account) | Q(receiver_account=account),
-            created_at__gte=time_threshold,
-        ).aggregate(
-            total_sent=Sum("amount", filter=Q(sender_account=account)),
-            total_received=Sum("amount", filter=Q(receiver_account=account)),
-        )
-        total_change = (balance_change["total_received"] or Decimal("0")) - (
-            balance_change["total_sent"] or Decimal("0")
-        )
-        #abs(x) means → Always make the number positive.
-        if abs(total_change) > LARGE_TRANSACTION_THRESHOLD:
-            suspicious_activities.append(
-                f"Large balance change detected: {total_change} by user {account.account_number}"
-            )
 
-        if suspicious_activities:
-            num_activities = send_suspicious_activity_alert(suspicious_activities)
-            if num_activities > 0:
-                return (
-                    f"Suspicious activity check completed. {num_activities} suspicious "
-                    f"activities detected and reported "
-                )
-            else:
-                return (
-                    f"Suspicious activity check completed. Activities "
-                    f"detected but alert email failed to send "
-                )
-    return "Suspicious activity check completed. No suspicious activities detected"
\ No newline at end of file
+@shared_task
+def resume_stale_payment_batches():
+    batch_ids = list(stale_payment_batches().values_list("id", flat=True))
+    for batch_id in batch_ids:
+        execute_payment_batch.delay(str(batch_id))
+    return f"Resumed {len(batch_ids)} stale payment batches"
+
+
+@shared_task
+def maintain_transaction_partitions():
+    created = ensure_partitions()
+    archived = archive_partitions()
+    return (
+        f"Created {len(created)} transaction partitions, archived {len(archived)}"
+    )
@@ -0,0 +1,153 @@
+import random
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from os import getenv
+from typing import Callable, TypeVar
+
+from django.db import OperationalError, transaction
+from loguru import logger
+
+from .balances import adjust_account_balance
+from .fraud import score_transaction_on_commit
+from .ledger import post_movements
+from .models import BankAccount, Transaction
+
+TRANSFER_MAX_RETRIES = int(getenv("TRANSFER_MAX_RETRIES", "5"))
+
+TRANSFER_RETRY_BACKOFF_SECONDS = float(getenv("TRANSFER_RETRY_BACKOFF_SECONDS", "0.02"))
+
+# PostgreSQL serialization_failure and deadlock_detected
+RETRYABLE_PGCODES = {"40001", "40P01"}
+
+T = TypeVar("T")
+
+
+class TransferError(Exception):
+    pass
+
+
+class AccountNotFoundError(TransferError):
+    pass
+
+
+class InsufficientFundsError(TransferError):
+    pass
+
+
+@dataclass
+class TransferResult:
+    transaction: Transaction
+    sender_account: BankAccount
+    receiver_account: BankAccount
+    attempts: int
+
+
+def _is_retryable(error: OperationalError) -> bool:
+    return getattr(error.__cause__, "pgcode", None) in RETRYABLE_PGCODES
+
+
+def run_with_retry(operation: Callable[[], T], description: str) -> T:
+    """
+    Run ``operation`` and retry it with jittered exponential backoff when the
+    database aborts it because of a deadlock or a serialization failure.
+    ``operation`` must open its own atomic block so every attempt starts clean.
+    """
+    for attempt in range(1, TRANSFER_MAX_RETRIES + 1):
+        try:
+            return operation()
+        except OperationalError as e:
+            if not _is_retryable(e) or attempt == TRANSFER_MAX_RETRIES:
+                raise
+            delay = TRANSFER_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+            delay += random.uniform(0, delay)
+            logger.warning(
+                f"{description} aborted by the database (attempt {attempt}), "
+                f"retrying in {delay:.3f}s: {str(e)}"
+            )
+            time.sleep(delay)
+
+
+def _transfer_once(
+    user,
+    sender_account_number: str,
+    receiver_account_number: str,
+    amount: Decimal,
+    description: str,
+) -> TransferResult:
+    with transaction.atomic():
+        # Always lock the two rows in primary key order, so two opposite
+        # transfers between the same accounts cannot deadlock each other.
+        accounts = {
+            account.account_number: account
+            for account in BankAccount.objects.select_related("user")
+            .select_for_update(of=("self",))
+            .filter(account_number__in=[sender_account_number, receiver_account_number])
+            .order_by("pk")
+        }
+        sender_account = accounts.get(sender_account_number)
+        receiver_account = accounts.get(receiver_account_number)
+        if sender_account is None or receiver_account is None:
+            raise AccountNotFoundError("One or both accounts not found")
+
+        if adjust_account_balance(sender_account, -amount) is None:
+            raise InsufficientFundsError("Insufficient funds for transfer")
+        adjust_account_balance(receiver_account, amount)
+
+        transfer_transaction = Transaction.objects.create(
+            user=user,
+            sender=user,
+            sender_account=sender_account,
+            receiver=receiver_account.user,
+            receiver_account=receiver_account,
+            amount=amount,
+            description=description,
+            transaction_type=Transaction.TransactionType.TRANSFER,
+            status=Transaction.TransactionStatus.COMPLETED,
+        )
+        post_movements(
+            [
+                (sender_account.pk, -amount, transfer_transaction, description),
+                (receiver_account.pk, amount, transfer_transaction, description),
+            ]
+        )
+        score_transaction_on_commit(transfer_transaction)
+
+    return TransferResult(
+        transaction=transfer_transaction,
+        sender_account=sender_account,
+        receiver_account=receiver_account,
+        attempts=1,
+    )
+
+
+def execute_transfer(
+    user,
+    sender_account_number: str,
+    receiver_account_number: str,
+    amount: Decimal,
+    description: str = "",
+) -> TransferResult:
+    """
+    Move ``amount`` between two accounts under row locks.
+
+    Raises AccountNotFoundError or InsufficientFundsError when the transfer
+    cannot be made; both are TransferError subclasses.
+    """
+    if sender_account_number == receiver_account_number:
+        raise TransferError("Sender and receiver accounts must be different")
+
+    attempts = 0
+
+    def attempt() -> TransferResult:
+        nonlocal attempts
+        attempts += 1
+        return _transfer_once(
+            user, sender_account_number, receiver_account_number, amount, description
+        )
+
+    result = run_with_retry(
+        attempt, f"Transfer from {sender_account_number} to {receiver_account_number}"
+    )
+    result.attempts = attempts
+    return result
@@ -1,5 +1,6 @@
 from django.urls import path
 from .views import (
+    AccountLookupAsyncView,
     AccountVerificationView,
     DepositView,
     InitiateWithdrawalView,
@@ -8,7 +9,13 @@ from .views import (
     VerifyOTPView,
     VerifySecurityQuestionView,
     TransactionListAPIView,
+    TransactionListAsyncView,
     TransactionPDFView,
+    TransactionSummaryAPIView,
+    PaymentBatchCreateView,
+    PaymentBatchConfirmView,
+    PaymentBatchDetailView,
+    PaymentBatchLineListView,
 )
 
 urlpatterns = [
@@ -18,6 +25,9 @@ urlpatterns = [
         name="account_verification",
     ),
     path("deposit/", DepositView.as_view(), name="account_deposit"),
+    path(
+        "deposit/lookup/", AccountLookupAsyncView.as_view(), name="account_lookup"
+    ),
     path(
         "initiate-withdrawal/",
         InitiateWithdrawalView.as_view(),
@@ -38,5 +48,33 @@ urlpatterns = [
     ),
     path("transfer/verify-otp/", VerifyOTPView.as_view(), name="verify_otp"),
     path("transactions/", TransactionListAPIView.as_view(), name="transaction_list"),
+    path(
+        "transactions/async/",
+        TransactionListAsyncView.as_view(),
+        name="transaction_list_async",
+    ),
     path("transactions/pdf/", TransactionPDFView.as_view(), name="transaction_pdf"),
+    path(
+        "transactions/summary/",
+        TransactionSummaryAPIView.as_view(),
+        name="transaction_summary",
+    ),
+    path(
+        "batch-payments/", PaymentBatchCreateView.as_view(), name="payment_batch_create"
+    ),
+    path(
+        "batch-payments/<uuid:pk>/",
+        PaymentBatchDetailView.as_view(),
+        name="payment_batch_detail",
+    ),
+    path(
+        "batch-payments/<uuid:pk>/confirm/",
+        PaymentBatchConfirmView.as_view(),
+        name="payment_batch_confirm",
+    ),
+    path(
+        "batch-payments/<uuid:pk>/lines/",
+        PaymentBatchLineListView.as_view(),
+        name="payment_batch_lines",
+    ),
 ]
\ No newline at end of file
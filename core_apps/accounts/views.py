@@ -6,23 +6,34 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 import random
 
+from core_apps.common.async_views import AsyncAPIView
+from core_apps.common.db_router import ais_sticky, read_from_replica
+from core_apps.common.idempotency import idempotent
+from core_apps.user_auth import otp as otp_store
 from core_apps.common.permissions import IsAccountExecutive, IsTeller
 from core_apps.common.renderers import GenericJSONRenderer
+from .balances import adjust_account_balance
+from .ledger import post_movement
+from .fraud import score_on_commit, score_transaction_on_commit
+from .transfers import AccountNotFoundError, TransferError, execute_transfer
 from .emails import send_full_activation_email, send_deposit_email, send_withdrawal_email, send_transfer_email, send_transfer_otp_email
-from .models import BankAccount, Transaction
+from .models import BankAccount, PaymentBatch, PaymentBatchLine, Transaction, TransactionRollup
+from .payments import create_payment_batch, validate_payment_lines
+from .pending import OperationKind, OperationState, PendingOperationError, advance_operation, revert_operation, start_operation
+from .rollups import COUNTER_COLUMNS
 from decimal import Decimal
-from .serializers import AccountVerificationSerializer, CustomerInfoSerializer, DepositSerializer, TransactionSerializer, UsernameVerificationSerializer, SecurityQuestionSerializer, OTPVerificationSerializer
+from .serializers import AccountVerificationSerializer, CustomerInfoSerializer, DepositSerializer, TransactionSerializer, UsernameVerificationSerializer, SecurityQuestionSerializer, OTPVerificationSerializer, TRANSACTION_ROW_FIELDS, TransactionRowSerializer, PaymentBatchCreateSerializer, PaymentBatchSerializer, PaymentBatchLineSerializer, TransactionRollupSerializer
 from django.db import transaction
 from loguru import logger
-from .pagination import StandardResultsSetPagination
+from .pagination import KeysetPagination, StandardResultsSetPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from dateutil import parser
-from django.db.models import Q
+from django.db.models import Q, Sum
 from rest_framework.filters import OrderingFilter
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework import status
-from .tasks import generate_transaction_pdf
+from .tasks import execute_payment_batch, generate_transaction_pdf
 
 class AccountVerificationView(generics.UpdateAPIView):
     queryset = BankAccount.objects.all()
@@ -59,7 +70,9 @@ class AccountVerificationView(generics.UpdateAPIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             instance.kyc_submitted = kyc_submitted
-            instance.save()
+            # Only the verification fields, a full save would write back a stale
+            # account_balance over a concurrent deposit or transfer
+            instance.save(update_fields=["kyc_submitted", "updated_at"])
 
             """
             When you make changes to the instance and apply custom logic, you need to save the instance manually. 
@@ -77,7 +90,17 @@ class AccountVerificationView(generics.UpdateAPIView):
                 instance.verified_by = request.user
                 instance.fully_activated = True
                 instance.account_status = BankAccount.AccountStatus.ACTIVE
-                instance.save()
+                instance.save(
+                    update_fields=[
+                        "kyc_verified",
+                        "verification_date",
+                        "verification_notes",
+                        "verified_by",
+                        "fully_activated",
+                        "account_status",
+                        "updated_at",
+                    ]
+                )
 
                 """
                     When you make changes to the instance and apply custom logic, you need to save the instance manually. 
@@ -118,6 +141,7 @@ class DepositView(generics.CreateAPIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+    @idempotent("deposit")
     @transaction.atomic
     def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         serializer = self.get_serializer(data=request.data)
@@ -127,9 +151,11 @@ class DepositView(generics.CreateAPIView):
         amount = serializer.validated_data["amount"]
 
         try:
-            account.account_balance += amount
-            account.full_clean()
-            account.save()
+            adjust_account_balance(account, amount)
+            post_movement(
+                account, amount, description=f"Deposit by teller {request.user.email}"
+            )
+            score_on_commit(user=account.user, amount=amount, receiver_account=account)
 
             logger.info(
                 f"Deposit of {amount} made to account {account.account_number} by teller "
@@ -155,10 +181,38 @@ class DepositView(generics.CreateAPIView):
 
         except Exception as e:
             logger.error(f"Error during deposit: {str(e)}")
+            # Returning a response here would commit the partial deposit
+            raise
+
+
+class AccountLookupAsyncView(AsyncAPIView):
+    """
+    Async variant of the teller account lookup of DepositView.get, reading the
+    account, its user and profile in one query.
+    """
+
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "deposit"
+    permission_classes = [IsTeller]
+
+    async def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        account_number = request.query_params.get("account_number")
+        if not account_number:
             return Response(
-                {"error": "An error occurred during the deposit"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"error": "Account number is required"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
+        account = await (
+            BankAccount.objects.select_related("user__profile")
+            .filter(account_number=account_number)
+            .afirst()
+        )
+        if account is None:
+            return Response(
+                {"error": "Account number does not exist"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(CustomerInfoSerializer(account).data)
 
 
 class InitiateWithdrawalView(generics.CreateAPIView):
@@ -215,17 +269,19 @@ class InitiateWithdrawalView(generics.CreateAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        request.session["withdrawal_data"] = {
-            "account_number": account_number,
-            "amount": str(amount),
-        }
-        logger.info("Withdrawal data stored in session")
+        operation = start_operation(
+            request.user,
+            OperationKind.WITHDRAWAL,
+            {"account_number": account_number, "amount": str(amount)},
+        )
+        logger.info(f"Withdrawal {operation.id} initiated")
 
         return Response(
             {
                 "message": "Withdrawal Initiated. Please verify your username to complete the "
                 "withdrawal",
                 "next_step": "Verify your username to complete the withdrawal",
+                "operation_id": operation.id,
             },
             status=status.HTTP_200_OK,
         )
@@ -236,6 +292,7 @@ class VerifyUsernameAndWithdrawAPIView(generics.CreateAPIView):
     renderer_classes = [GenericJSONRenderer]
     object_label = "verify_username_and_withdraw"
 
+    @idempotent("withdrawal")
     @transaction.atomic
     def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         serializer = self.get_serializer(
@@ -243,14 +300,26 @@ class VerifyUsernameAndWithdrawAPIView(generics.CreateAPIView):
         )
         serializer.is_valid(raise_exception=True)
 
-        withdrawal_data = request.session.get("withdrawal_data")
-        if not withdrawal_data:
-            return Response(
-                {
-                    "error": "No pending withdrawal found. Please initiate a withdrawal first"
-                },
-                status=status.HTTP_400_BAD_REQUEST,
+        try:
+            operation = advance_operation(
+                request.user,
+                OperationKind.WITHDRAWAL,
+                OperationState.INITIATED,
+                OperationState.EXECUTED,
+                request.data.get("operation_id"),
             )
+        except PendingOperationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            response = self.process_withdrawal(request, operation.data)
+        except Exception:
+            revert_operation(operation, OperationState.INITIATED)
+            raise
+        if response.status_code >= 400:
+            revert_operation(operation, OperationState.INITIATED)
+        return response
+
+    def process_withdrawal(self, request: Request, withdrawal_data: dict) -> Response:
         account_number = withdrawal_data["account_number"]
         amount = Decimal(withdrawal_data["amount"])
 
@@ -263,13 +332,11 @@ class VerifyUsernameAndWithdrawAPIView(generics.CreateAPIView):
                 {"error": f"Account number {account_number} does not exist"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        if account.account_balance < amount:
+        if adjust_account_balance(account, -amount) is None:
             return Response(
                 {"error": "Insufficient funds for withdrawal"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        account.account_balance -= amount
-        account.save()
 
         withdraw_transaction = Transaction.objects.create(
             user=request.user,
@@ -280,6 +347,10 @@ class VerifyUsernameAndWithdrawAPIView(generics.CreateAPIView):
             transaction_type=Transaction.TransactionType.WITHDRAWAL,
             status=Transaction.TransactionStatus.COMPLETED,
         )
+        post_movement(
+            account, -amount, withdraw_transaction, withdraw_transaction.description
+        )
+        score_transaction_on_commit(withdraw_transaction)
         logger.info(f"Withdrawal of {amount} made from account {account_number}")
 
         send_withdrawal_email(
@@ -291,8 +362,6 @@ class VerifyUsernameAndWithdrawAPIView(generics.CreateAPIView):
             account_number=account.account_number,
         )
 
-        del request.session["withdrawal_data"]
-
         return Response(
             {
                 "message": "Withdrawal completed successfully",
@@ -346,16 +415,21 @@ class InitiateTransferView(generics.CreateAPIView):
         serializer = self.get_serializer(data=data)
 
         if serializer.is_valid():
-            request.session["transfer_data"] = {
-                "sender_account": sender_account_number,
-                "receiver_account": receiver_account_number,
-                "amount": str(serializer.validated_data["amount"]),
-                "description": serializer.validated_data.get("description", ""),
-            }
+            operation = start_operation(
+                request.user,
+                OperationKind.TRANSFER,
+                {
+                    "sender_account": sender_account_number,
+                    "receiver_account": receiver_account_number,
+                    "amount": str(serializer.validated_data["amount"]),
+                    "description": serializer.validated_data.get("description", ""),
+                },
+            )
             return Response(
                 {
                     "message": "Please answer your security question to proceed with the transfer",
                     "next_step": "verify security question",
+                    "operation_id": operation.id,
                 },
                 status=status.HTTP_200_OK,
             )
@@ -372,13 +446,29 @@ class VerifySecurityQuestionView(generics.CreateAPIView):
             data=request.data, context={"request": request}
         )
         if serializer.is_valid():
-            otp = "".join([str(random.randint(0, 9)) for _ in range(6)])
-            request.user.set_otp(otp)
-            send_transfer_otp_email(request.user.email, otp)
+            try:
+                operation = advance_operation(
+                    request.user,
+                    OperationKind.TRANSFER,
+                    OperationState.INITIATED,
+                    OperationState.QUESTION_VERIFIED,
+                    request.data.get("operation_id"),
+                )
+            except PendingOperationError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                otp = "".join([str(random.randint(0, 9)) for _ in range(6)])
+                request.user.set_otp(otp, otp_store.TRANSACTION)
+                send_transfer_otp_email(request.user.email, otp)
+            except Exception:
+                # Without an OTP the next step could never be completed
+                revert_operation(operation, OperationState.INITIATED)
+                raise
             return Response(
                 {
                     "message": "Security question verified. An OTP has been sent to your email",
                     "next_step": "verify otp",
+                    "operation_id": operation.id,
                 },
                 status=status.HTTP_200_OK,
             )
@@ -390,6 +480,7 @@ class VerifyOTPView(generics.CreateAPIView):
     renderer_classes = [GenericJSONRenderer]
     object_label = "verify_otp"
 
+    @idempotent("transfer")
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(
             data=request.data, context={"request": request}
@@ -399,51 +490,40 @@ class VerifyOTPView(generics.CreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def process_transfer(self, request) -> Response:
-        transfer_data = request.session.get("transfer_data")
-        if not transfer_data:
-            return Response(
-                {"error": "Transfer data not found. Please start the process again."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
         try:
-            sender_account = BankAccount.objects.get(
-                account_number=transfer_data["sender_account"]
-            )
-            receiver_account = BankAccount.objects.get(
-                account_number=transfer_data["receiver_account"]
+            operation = advance_operation(
+                request.user,
+                OperationKind.TRANSFER,
+                OperationState.QUESTION_VERIFIED,
+                OperationState.EXECUTED,
+                request.data.get("operation_id"),
             )
-        except BankAccount.DoesNotExist:
-            return Response(
-                {"error": "One or both accounts not found"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-
-        amount = Decimal(transfer_data["amount"])
+        except PendingOperationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if sender_account.account_balance < amount:
-            return Response(
-                {"error": "Insufficient funds for transfer"},
-                status=status.HTTP_400_BAD_REQUEST,
+        transfer_data = operation.data
+        try:
+            result = execute_transfer(
+                user=request.user,
+                sender_account_number=transfer_data["sender_account"],
+                receiver_account_number=transfer_data["receiver_account"],
+                amount=Decimal(transfer_data["amount"]),
+                description=transfer_data.get("description", ""),
             )
+        except AccountNotFoundError as e:
+            revert_operation(operation, OperationState.QUESTION_VERIFIED)
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except TransferError as e:
+            revert_operation(operation, OperationState.QUESTION_VERIFIED)
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception:
+            revert_operation(operation, OperationState.QUESTION_VERIFIED)
+            raise
 
-        sender_account.account_balance -= amount
-        receiver_account.account_balance += amount
-        sender_account.save()
-        receiver_account.save()
-
-        transfer_transaction = Transaction.objects.create(
-            user=request.user,
-            sender=request.user,
-            sender_account=sender_account,
-            receiver=receiver_account.user,
-            receiver_account=receiver_account,
-            amount=amount,
-            description=transfer_data.get("description", ""),
-            transaction_type=Transaction.TransactionType.TRANSFER,
-            status=Transaction.TransactionStatus.COMPLETED,
-        )
-
-        del request.session["transfer_data"]
+        sender_account = result.sender_account
+        receiver_account = result.receiver_account
+        transfer_transaction = result.transaction
+        amount = transfer_transaction.amount
 
         send_transfer_email(
             sender_name=sender_account.user.full_name,
@@ -470,26 +550,16 @@ class VerifyOTPView(generics.CreateAPIView):
 
 
 
-class TransactionListAPIView(generics.ListAPIView):
-    serializer_class = TransactionSerializer
-    pagination_class = StandardResultsSetPagination
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
-    ordering_fields = ["created_at", "amount"]
-    ordering = ["-created_at"]
+class TransactionQueryMixin:
+    """Filters and keyset branches shared by the sync and async transaction lists."""
 
-    def get_queryset(self):
-        user = self.request.user
+    def get_filters(self) -> Q:
         """
-        Q is a special helper class in Django used to build OR, AND, and NOT queries in a clean
-        This line fetches all transactions where:
-        the current user is the sender, OR
-        the current user is the receiver
-        So it finds all transactions related to the user, regardless of whether they sent money or received money.
+        Date range filters from the query string, shared by both pagination modes.
         """
-        queryset = Transaction.objects.filter(Q(sender=user) | Q(receiver=user))
+        filters = Q()
         start_date = self.request.query_params.get("start_date")
         end_date = self.request.query_params.get("end_date")
-        account_number = self.request.query_params.get("account_number")
 
         if start_date:
             try:
@@ -501,37 +571,110 @@ class TransactionListAPIView(generics.ListAPIView):
                 """
                 __gte means greater than or equal to
                 """
-                queryset = queryset.filter(created_at__gte=start_date)
+                filters &= Q(created_at__gte=start_date)
             except ValueError:
                 pass
 
         if end_date:
             try:
                 end_date = parser.parse(end_date)
-                queryset = queryset.filter(created_at__lte=end_date)
+                filters &= Q(created_at__lte=end_date)
             except ValueError:
                 pass
+        return filters
 
-        if account_number:
-            try:
-                account = BankAccount.objects.get(
-                    account_number=account_number, user=user
-                )
-                queryset = queryset.filter(
-                    Q(sender_account=account) | Q(receiver_account=account)
-                )
-            except BankAccount.DoesNotExist:
-                """
-                objects.none() is a Django QuerySet method that creates an empty result set — like an empty list [], 
-                but still behaves like a queryset.
-                """
-                queryset = Transaction.objects.none()
+    def get_branches_for(self, user, account) -> list:
+        """
+        The transactions of the user, split so that each branch filters on a
+        single indexed column instead of an OR the planner cannot index.
+        """
+        filters = self.get_filters()
+
+        if account is False:
+            branches = [Transaction.objects.none()]
+        elif account:
+            involves_user = Q(sender=user) | Q(receiver=user)
+            branches = [
+                Transaction.objects.filter(involves_user, filters, sender_account=account),
+                Transaction.objects.filter(
+                    involves_user, filters, receiver_account=account
+                ),
+            ]
+        else:
+            branches = [
+                Transaction.objects.filter(filters, sender=user),
+                Transaction.objects.filter(filters, receiver=user),
+            ]
+        return [branch.values(*TRANSACTION_ROW_FIELDS) for branch in branches]
 
-        return queryset
+
+class TransactionListAPIView(TransactionQueryMixin, generics.ListAPIView):
+    serializer_class = TransactionRowSerializer
+    pagination_class = StandardResultsSetPagination
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    ordering_fields = ["created_at", "amount"]
+    ordering = ["-created_at"]
+
+    def get_account(self):
+        """
+        The account from the account_number query param. Returns False when the user
+        does not own an account with that number, and None when no account was given.
+        """
+        account_number = self.request.query_params.get("account_number")
+        if not account_number:
+            return None
+        try:
+            return BankAccount.objects.get(
+                account_number=account_number, user=self.request.user
+            )
+        except BankAccount.DoesNotExist:
+            return False
+
+    def get_queryset(self):
+        user = self.request.user
+        """
+        Q is a special helper class in Django used to build OR, AND, and NOT queries in a clean
+        This line fetches all transactions where:
+        the current user is the sender, OR
+        the current user is the receiver
+        So it finds all transactions related to the user, regardless of whether they sent money or received money.
+        """
+        queryset = Transaction.objects.filter(Q(sender=user) | Q(receiver=user))
+        queryset = queryset.filter(self.get_filters())
+
+        account = self.get_account()
+        if account:
+            queryset = queryset.filter(
+                Q(sender_account=account) | Q(receiver_account=account)
+            )
+        elif account is False:
+            """
+            objects.none() is a Django QuerySet method that creates an empty result set — like an empty list [], 
+            but still behaves like a queryset.
+            """
+            queryset = Transaction.objects.none()
+
+        return queryset.values(*TRANSACTION_ROW_FIELDS)
+
+    def get_branches(self) -> list:
+        return self.get_branches_for(self.request.user, self.get_account())
+
+    def uses_cursor_pagination(self, request) -> bool:
+        return (
+            KeysetPagination.cursor_query_param in request.query_params
+            or request.query_params.get("pagination") == "cursor"
+        )
 
     def list(self, request, *args, **kwargs) -> Response:
+        with read_from_replica(request.user.pk):
+            if self.uses_cursor_pagination(request):
+                paginator = KeysetPagination()
+                page = paginator.paginate_branches(self.get_branches(), request)
+                serializer = self.get_serializer(page, many=True)
+                response = paginator.get_paginated_response(serializer.data)
+            else:
+                response = super().list(request, *args, **kwargs)
 
-        response = super().list(request, *args, **kwargs)
         account_number = request.query_params.get("account_number")
         if account_number:
             logger.info(
@@ -544,6 +687,30 @@ class TransactionListAPIView(generics.ListAPIView):
         return response
 
 
+class TransactionListAsyncView(TransactionQueryMixin, AsyncAPIView):
+    """
+    Async variant of the cursor-paginated transaction list, for ASGI servers.
+    It always uses keyset pagination.
+    """
+
+    async def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        sticky = await ais_sticky(request.user.pk)
+        with read_from_replica(request.user.pk, sticky=sticky):
+            account = None
+            account_number = request.query_params.get("account_number")
+            if account_number:
+                account = await BankAccount.objects.filter(
+                    account_number=account_number, user=request.user
+                ).afirst() or False
+
+            paginator = KeysetPagination()
+            page = await paginator.apaginate_branches(
+                self.get_branches_for(request.user, account), request
+            )
+        serializer = TransactionRowSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
 class TransactionPDFView(APIView):
     renderer_classes = [GenericJSONRenderer]
     object_label = "transaction_pdf"
@@ -591,4 +758,221 @@ class TransactionPDFView(APIView):
                 "email": user.email,
             },
             status=status.HTTP_202_ACCEPTED,
-        )
\ No newline at end of file
+        )
+
+
+class TransactionSummaryAPIView(APIView):
+    """
+    Per-day or per-month totals of the user's accounts, read from the
+    precomputed rollups instead of aggregating the transaction table.
+    """
+
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "transaction_summary"
+
+    def get(self, request) -> Response:
+        period = request.query_params.get("period", TransactionRollup.Period.MONTH)
+        if period not in TransactionRollup.Period.values:
+            return Response(
+                {"error": "period must be 'day' or 'month'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        end_date = request.query_params.get("end_date")
+        start_date = request.query_params.get("start_date")
+        try:
+            end_date = parser.parse(end_date).date() if end_date else timezone.localdate()
+            start_date = (
+                parser.parse(start_date).date()
+                if start_date
+                else end_date - timezone.timedelta(days=365)
+            )
+        except ValueError as e:
+            return Response(
+                {"error": f"Invalid date format: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if period == TransactionRollup.Period.MONTH:
+            start_date = start_date.replace(day=1)
+
+        rollups = TransactionRollup.objects.filter(
+            account__user=request.user,
+            period=period,
+            period_start__range=[start_date, end_date],
+        ).select_related("account")
+
+        account_number = request.query_params.get("account_number")
+        if account_number:
+            if not BankAccount.objects.filter(
+                account_number=account_number, user=request.user
+            ).exists():
+                return Response(
+                    {"error": "You don't have an account with that number"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            rollups = rollups.filter(account__account_number=account_number)
+
+        totals = rollups.order_by().aggregate(
+            **{column: Sum(column) for column in COUNTER_COLUMNS}
+        )
+        totals = {
+            column: (value or 0) if column == "transaction_count" else str(value or 0)
+            for column, value in totals.items()
+        }
+        return Response(
+            {
+                "period": period,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "totals": totals,
+                "periods": TransactionRollupSerializer(
+                    rollups.order_by("period_start", "account__account_number"),
+                    many=True,
+                ).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class PaymentBatchCreateView(generics.CreateAPIView):
+    serializer_class = PaymentBatchCreateSerializer
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "payment_batch"
+
+    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        sender_account_number = serializer.validated_data["sender_account"]
+        lines = serializer.validated_data["lines"]
+
+        try:
+            sender_account = BankAccount.objects.get(
+                account_number=sender_account_number, user=request.user
+            )
+        except BankAccount.DoesNotExist:
+            return Response(
+                {
+                    "error": "Sender account number not found or you're not authorized to use "
+                    "this account."
+                },
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if not (sender_account.fully_activated and sender_account.kyc_verified):
+            return Response(
+                {
+                    "error": "This account is not fully verified. Please complete the "
+                    "verification process, by visiting any of our local bank branches"
+                },
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        receivers, line_errors = validate_payment_lines(sender_account, lines)
+        if line_errors:
+            return Response(
+                {
+                    "error": "Some payment lines are invalid",
+                    "lines": [
+                        {"line_number": line_number, "error": error}
+                        for line_number, error in line_errors.items()
+                    ],
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        batch = create_payment_batch(request.user, sender_account, lines, receivers)
+        if sender_account.account_balance < batch.total_amount:
+            logger.warning(
+                f"Payment batch {batch.id} totals {batch.total_amount}, more than the "
+                f"balance of {sender_account.account_number}. Lines that cannot be "
+                f"covered will fail"
+            )
+
+        otp = "".join([str(random.randint(0, 9)) for _ in range(6)])
+        request.user.set_otp(otp, otp_store.payment_batch_purpose(batch.id))
+        send_transfer_otp_email(request.user.email, otp)
+
+        return Response(
+            {
+                "message": "Payment batch created. An OTP has been sent to your email",
+                "next_step": "confirm the batch with the otp",
+                "batch": PaymentBatchSerializer(batch).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class PaymentBatchConfirmView(generics.CreateAPIView):
+    serializer_class = OTPVerificationSerializer
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "payment_batch"
+
+    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        try:
+            batch = PaymentBatch.objects.get(id=kwargs["pk"], user=request.user)
+        except PaymentBatch.DoesNotExist:
+            return Response(
+                {"error": "Payment batch not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if batch.status != PaymentBatch.BatchStatus.AWAITING_OTP:
+            return Response(
+                {"error": f"This payment batch is already {batch.status}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = self.get_serializer(
+            data=request.data,
+            context={
+                "request": request,
+                "otp_purpose": otp_store.payment_batch_purpose(batch.id),
+            },
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Only the request that moves the batch out of AWAITING_OTP queues it
+        queued = PaymentBatch.objects.filter(
+            pk=batch.pk, status=PaymentBatch.BatchStatus.AWAITING_OTP
+        ).update(status=PaymentBatch.BatchStatus.QUEUED, updated_at=timezone.now())
+        if not queued:
+            return Response(
+                {"error": "This payment batch has already been confirmed"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        batch.refresh_from_db(fields=["status", "updated_at"])
+        execute_payment_batch.delay(str(batch.id))
+        logger.info(f"Payment batch {batch.id} of {batch.total_lines} lines queued")
+
+        return Response(
+            {
+                "message": "Payment batch confirmed and queued for processing",
+                "batch": PaymentBatchSerializer(batch).data,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class PaymentBatchDetailView(generics.RetrieveAPIView):
+    serializer_class = PaymentBatchSerializer
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "payment_batch"
+
+    def get_queryset(self):
+        return PaymentBatch.objects.filter(user=self.request.user).select_related(
+            "sender_account"
+        )
+
+
+class PaymentBatchLineListView(generics.ListAPIView):
+    serializer_class = PaymentBatchLineSerializer
+    pagination_class = StandardResultsSetPagination
+
+    def get_queryset(self):
+        queryset = PaymentBatchLine.objects.filter(
+            batch_id=self.kwargs["pk"], batch__user=self.request.user
+        ).select_related("receiver_account")
+        line_status = self.request.query_params.get("status")
+        if line_status:
+            queryset = queryset.filter(status=line_status)
+        return queryset
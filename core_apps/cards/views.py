@@ -8,7 +8,11 @@ from rest_framework.exceptions import PermissionDenied
 #PermissionDenied is an exception you raise when
 #the user is not allowed to perform a certain action in an API.
 from rest_framework.response import Response
+from core_apps.accounts.balances import adjust_account_balance, adjust_card_balance
+from core_apps.accounts.fraud import score_on_commit
+from core_apps.accounts.ledger import post_movement
 from core_apps.accounts.models import Transaction
+from core_apps.common.idempotency import idempotent
 from core_apps.common.renderers import GenericJSONRenderer
 from .emails import send_virtual_card_topup_email
 from .models import VirtualCard
@@ -110,6 +114,7 @@ class VirtualCardTopUpAPIView(generics.UpdateAPIView):
     def get_queryset(self):
         return VirtualCard.objects.filter(user=self.request.user)
 
+    @idempotent("card_top_up")
     @transaction.atomic
     def update(self, request, *args, **kwargs):
         virtual_card = self.get_object()
@@ -147,18 +152,12 @@ class VirtualCardTopUpAPIView(generics.UpdateAPIView):
             )
         bank_account = virtual_card.bank_account
 
-        if bank_account.account_balance < amount:
+        if adjust_account_balance(bank_account, -amount) is None:
             return Response(
                 {"error": "Insufficient funds in the bank account."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-
-        bank_account.account_balance -= amount
-        virtual_card.balance += amount
-
-        bank_account.save()
-
-        virtual_card.save()
+        adjust_card_balance(virtual_card, amount)
 
         transaction = Transaction.objects.create(
             user=request.user,
@@ -171,6 +170,9 @@ class VirtualCardTopUpAPIView(generics.UpdateAPIView):
             sender_account=bank_account,
             receiver_account=bank_account,
         )
+        post_movement(bank_account, -amount, transaction, transaction.description)
+        # The money leaves the bank account for the card, so only debit it
+        score_on_commit(user=request.user, amount=amount, sender_account=bank_account)
         send_virtual_card_topup_email(
             request.user, virtual_card, amount, virtual_card.balance
         )
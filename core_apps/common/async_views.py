@@ -0,0 +1,46 @@
+"""
+APIView whose handlers are coroutines, for read endpoints served over ASGI.
+
+DRF itself is synchronous, so authentication, permissions and throttling run
+in a worker thread before the handler is awaited. Handlers use the async ORM
+or wrap anything else in sync_to_async.
+"""
+
+from typing import Any
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # csrf_exempt wraps the view in a plain function, so mark it again
+        markcoroutinefunction(view)
+        return view
+
+    async def dispatch(self, request, *args: Any, **kwargs: Any) -> Response:
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if not isinstance(response, Response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -2,11 +2,15 @@ from typing import Optional, Tuple
 
 from django.conf import settings
 from loguru import logger
+from django.utils.translation import gettext_lazy as _
 from rest_framework.request import Request
 from rest_framework_simplejwt.authentication import AuthUser, JWTAuthentication
-from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import Token
 
+from .user_cache import cache_user, get_cached_user
+
 
 class CookieAuthentication(JWTAuthentication):
     def authenticate(self, request: Request) -> Optional[Tuple[AuthUser, Token]]:
@@ -24,4 +28,22 @@ class CookieAuthentication(JWTAuthentication):
                 return self.get_user(validated_token), validated_token
             except TokenError as e:
                 logger.error(f"Token validation error: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+    def get_user(self, validated_token: Token) -> AuthUser:
+        """
+        Resolve the token's user from the user cache, falling back to the
+        database lookup of JWTAuthentication on a miss.
+        """
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        user = get_cached_user(user_id, jti)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_user(user, jti)
+        elif getattr(api_settings, "CHECK_USER_IS_ACTIVE", True) and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
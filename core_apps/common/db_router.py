@@ -0,0 +1,90 @@
+"""
+Read replica routing for the heavy read paths that opt in.
+
+Only code inside read_from_replica() reads from a replica. Users who just
+moved money read from the primary for REPLICA_STICKY_SECONDS.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from os import getenv
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+REPLICA_STICKY_SECONDS = int(getenv("REPLICA_STICKY_SECONDS", "10"))
+
+CACHE_PREFIX = "db_sticky"
+
+_use_replica: ContextVar[bool] = ContextVar("use_replica", default=False)
+
+
+def get_replica_aliases() -> List[str]:
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def _sticky_key(user_id) -> str:
+    return f"{CACHE_PREFIX}:{user_id}"
+
+
+def stick_to_primary(user_ids: Iterable) -> None:
+    """Send the reads of these users to the primary once the transaction commits."""
+    if not get_replica_aliases():
+        return
+    keys = {_sticky_key(user_id): 1 for user_id in user_ids if user_id is not None}
+    if keys:
+        transaction.on_commit(lambda: cache.set_many(keys, REPLICA_STICKY_SECONDS))
+
+
+def is_sticky(user_id) -> bool:
+    return user_id is not None and cache.get(_sticky_key(user_id)) is not None
+
+
+async def ais_sticky(user_id) -> bool:
+    if user_id is None or not get_replica_aliases():
+        return False
+    return await cache.aget(_sticky_key(user_id)) is not None
+
+
+@contextmanager
+def read_from_replica(user_id=None, sticky: Optional[bool] = None):
+    """
+    Route the reads inside the block to a replica, unless ``user_id`` moved
+    money too recently for the replicas to have caught up.
+
+    Async views pass ``sticky`` from ais_sticky(), so the cache is not read
+    on the event loop.
+    """
+    use_replica = bool(get_replica_aliases())
+    if use_replica:
+        if sticky is None:
+            sticky = is_sticky(user_id)
+        use_replica = not sticky
+    token = _use_replica.set(use_replica)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = get_replica_aliases()
+        if replicas and _use_replica.get():
+            return random.choice(replicas)
+        # Objects loaded from a replica fetch their relations from the primary
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Without this, saving an object read from a replica would write to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *get_replica_aliases()}
+        return obj1._state.db in aliases and obj2._state.db in aliases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,142 @@
+"""
+Idempotency-Key support for money-moving endpoints.
+
+The first response to a (user, endpoint, key) is replayed to retries for
+IDEMPOTENCY_KEY_TTL seconds, and a retry that arrives while the first request
+is still running gets a 409.
+"""
+
+import hashlib
+import json
+from functools import wraps
+from os import getenv
+from typing import Callable, Dict, List
+
+from django.core.cache import cache
+from loguru import logger
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_KEY_TTL = int(getenv("IDEMPOTENCY_KEY_TTL", str(24 * 60 * 60)))
+
+IDEMPOTENCY_LOCK_TIMEOUT = int(getenv("IDEMPOTENCY_LOCK_TIMEOUT", "60"))
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+MAX_KEY_LENGTH = 255
+
+CACHE_PREFIX = "idempotency"
+
+STATS = ["hit", "miss", "conflict"]
+
+# Scopes of every endpoint wrapped with @idempotent, for reporting
+IDEMPOTENT_SCOPES: List[str] = []
+
+
+def _fingerprint(request) -> str:
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{request.path}|{body}".encode()).hexdigest()
+
+
+def _count(scope: str, outcome: str) -> None:
+    key = f"{CACHE_PREFIX}:stats:{scope}:{outcome}"
+    cache.add(key, 0, None)
+    cache.incr(key)
+
+
+def get_idempotency_stats(scope: str) -> Dict[str, float]:
+    """Hit, miss and conflict counts of an endpoint and its replay hit ratio."""
+    keys = {outcome: f"{CACHE_PREFIX}:stats:{scope}:{outcome}" for outcome in STATS}
+    counts = cache.get_many(list(keys.values()))
+    stats = {outcome: counts.get(key, 0) for outcome, key in keys.items()}
+    requests = stats["hit"] + stats["miss"]
+    stats["hit_ratio"] = stats["hit"] / requests if requests else 0.0
+    return stats
+
+
+def _replay(stored: dict) -> Response:
+    response = Response(stored["data"], status=stored["status"])
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def idempotent(scope: str) -> Callable:
+    """
+    Make a view handler honour the Idempotency-Key header. Requests without
+    the header run as before. ``scope`` names the endpoint in cache keys and
+    stats. Apply it outside ``transaction.atomic`` so the response is only
+    stored once the transaction has committed.
+    """
+    IDEMPOTENT_SCOPES.append(scope)
+
+    def decorator(handler: Callable) -> Callable:
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key:
+                return handler(view, request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return Response(
+                    {
+                        "error": f"{IDEMPOTENCY_HEADER} must be at most "
+                        f"{MAX_KEY_LENGTH} characters"
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            cache_key = f"{CACHE_PREFIX}:{scope}:{request.user.pk}:{key}"
+            lock_key = f"{cache_key}:lock"
+            fingerprint = _fingerprint(request)
+
+            stored = cache.get(cache_key)
+            if stored is None:
+                if not cache.add(lock_key, fingerprint, IDEMPOTENCY_LOCK_TIMEOUT):
+                    _count(scope, "conflict")
+                    return Response(
+                        {
+                            "error": "A request with this Idempotency-Key is still "
+                            "being processed"
+                        },
+                        status=status.HTTP_409_CONFLICT,
+                    )
+                # The first request may have finished between the get and the lock
+                stored = cache.get(cache_key)
+                if stored is not None:
+                    cache.delete(lock_key)
+
+            if stored is not None:
+                if stored["fingerprint"] != fingerprint:
+                    return Response(
+                        {
+                            "error": "This Idempotency-Key was already used for a "
+                            "different request"
+                        },
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                _count(scope, "hit")
+                logger.info(f"Replayed {scope} response for idempotency key {key}")
+                return _replay(stored)
+
+            _count(scope, "miss")
+            try:
+                response = handler(view, request, *args, **kwargs)
+                # Server errors are not final, the client may retry them
+                if response.status_code < 500:
+                    cache.set(
+                        cache_key,
+                        {
+                            "fingerprint": fingerprint,
+                            "status": response.status_code,
+                            "data": response.data,
+                        },
+                        IDEMPOTENCY_KEY_TTL,
+                    )
+                return response
+            finally:
+                cache.delete(lock_key)
+
+        return wrapper
+
+    return decorator
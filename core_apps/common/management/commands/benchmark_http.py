@@ -0,0 +1,173 @@
+import asyncio
+import itertools
+import statistics
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by the server")
+    length = None
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    if length is None:
+        raise ConnectionError("Response without a Content-Length")
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def _connection(
+    host, port, build_request, expected, deadline, latencies, failures, statuses
+) -> None:
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            writer.write(build_request())
+            await writer.drain()
+            status_code = await _read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            statuses[status_code] += 1
+            if status_code >= 400 and status_code not in expected:
+                failures.append(status_code)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError):
+            failures.append(None)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load an endpoint over many concurrent keep-alive connections and report "
+        "its throughput and latency, e.g. to compare the WSGI and ASGI servers or "
+        "to check the p99 of failed logins"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="Endpoint to load, e.g. http://localhost:8000/...")
+        parser.add_argument(
+            "--method", default="GET", choices=["GET", "POST"], help="(default: GET)"
+        )
+        parser.add_argument(
+            "--data",
+            default="",
+            help="JSON body to POST, where {i} is replaced by a request counter, "
+            'e.g. {"email": "user{i}@example.com", "password": "wrong"}',
+        )
+        parser.add_argument(
+            "--expect-status",
+            type=int,
+            action="append",
+            default=[],
+            help="Error status to count as expected rather than failed, e.g. 400 "
+            "when loading failed logins (repeatable)",
+        )
+        parser.add_argument(
+            "--max-p99-ms",
+            type=int,
+            help="Fail when the p99 latency is above this many milliseconds",
+        )
+        parser.add_argument(
+            "--connections",
+            type=int,
+            default=500,
+            help="Concurrent connections (default: 500)",
+        )
+        parser.add_argument(
+            "--duration", type=int, default=30, help="Seconds to run (default: 30)"
+        )
+        parser.add_argument(
+            "--cookie", default="", help="Cookie header to send, e.g. access=..."
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme != "http" or not url.hostname:
+            raise CommandError("Only plain http:// URLs are supported")
+        if options["connections"] < 1 or options["duration"] < 1:
+            raise CommandError("--connections and --duration must be at least 1")
+        if options["method"] == "POST" and not options["data"]:
+            raise CommandError("--data is required with --method POST")
+
+        path = url.path or "/"
+        if url.query:
+            path = f"{path}?{url.query}"
+        headers = [
+            f"{options['method']} {path} HTTP/1.1",
+            f"Host: {url.netloc}",
+            "Accept: application/json",
+        ]
+        if options["cookie"]:
+            headers.append(f"Cookie: {options['cookie']}")
+        counter = itertools.count()
+
+        def build_request() -> bytes:
+            if options["method"] == "GET":
+                return ("\r\n".join(headers) + "\r\n\r\n").encode()
+            body = options["data"].replace("{i}", str(next(counter))).encode()
+            request_headers = headers + [
+                "Content-Type: application/json",
+                f"Content-Length: {len(body)}",
+            ]
+            return ("\r\n".join(request_headers) + "\r\n\r\n").encode() + body
+
+        latencies, failures = [], []
+        statuses = Counter()
+
+        async def run():
+            deadline = time.perf_counter() + options["duration"]
+            await asyncio.gather(
+                *(
+                    _connection(
+                        url.hostname,
+                        url.port or 80,
+                        build_request,
+                        set(options["expect_status"]),
+                        deadline,
+                        latencies,
+                        failures,
+                        statuses,
+                    )
+                    for _ in range(options["connections"])
+                )
+            )
+
+        started = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - started
+
+        if not latencies:
+            raise CommandError(f"No request completed, {len(failures)} failed")
+        latencies.sort()
+        p99_ms = latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000
+        self.stdout.write(
+            f"{len(latencies)} responses in {elapsed:.1f}s over "
+            f"{options['connections']} connections: "
+            f"{len(latencies) / elapsed:.0f} requests/s, "
+            f"p50 {statistics.median(latencies) * 1000:.0f}ms, "
+            f"p99 {p99_ms:.0f}ms, "
+            f"{len(failures)} failed"
+        )
+        self.stdout.write(
+            "Status codes: "
+            + ", ".join(f"{code} x {count}" for code, count in sorted(statuses.items()))
+        )
+        if options["max_p99_ms"] is not None and p99_ms > options["max_p99_ms"]:
+            raise CommandError(
+                f"p99 of {p99_ms:.0f}ms is above {options['max_p99_ms']}ms"
+            )
@@ -0,0 +1,68 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+
+from core_apps.common.db_router import (
+    _sticky_key,
+    get_replica_aliases,
+    read_from_replica,
+    stick_to_primary,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that reads inside read_from_replica() go to a replica, writes and "
+        "other reads go to the primary, and a user who just moved money reads "
+        "from the primary. Run it with config.settings.router_check when no "
+        "replica is configured."
+    )
+
+    def _expect(self, what, alias, expected):
+        if alias not in expected:
+            raise CommandError(f"{what} went to {alias!r}, expected {expected}")
+        self.stdout.write(f"{what}: {alias}")
+
+    def handle(self, *args, **options):
+        replicas = get_replica_aliases()
+        if not replicas:
+            raise CommandError(
+                "No DATABASE_REPLICAS configured, run with "
+                "DJANGO_SETTINGS_MODULE=config.settings.router_check"
+            )
+        primary = [DEFAULT_DB_ALIAS]
+        user_id, other_user_id = uuid.uuid4(), uuid.uuid4()
+
+        self._expect("Read outside read_from_replica", User.objects.all().db, primary)
+        with read_from_replica(user_id):
+            self._expect(
+                "Read inside read_from_replica", User.objects.all().db, replicas
+            )
+            self._expect(
+                "Write inside read_from_replica", router.db_for_write(User), primary
+            )
+
+        try:
+            with transaction.atomic():
+                stick_to_primary([user_id])
+            with read_from_replica(user_id):
+                self._expect(
+                    "Read after the money movement commits",
+                    User.objects.all().db,
+                    primary,
+                )
+            with read_from_replica(other_user_id):
+                self._expect(
+                    "Read by another user after the commit",
+                    User.objects.all().db,
+                    replicas,
+                )
+        finally:
+            cache.delete(_sticky_key(user_id))
+
+        self.stdout.write(self.style.SUCCESS("Replica routing is correct"))
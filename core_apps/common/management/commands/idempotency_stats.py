@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from core_apps.common.idempotency import IDEMPOTENT_SCOPES, get_idempotency_stats
+
+
+class Command(BaseCommand):
+    help = "Show the Idempotency-Key replay hit ratio of every idempotent endpoint"
+
+    def handle(self, *args, **options):
+        # Importing the URLconf imports the views, which register their scopes
+        get_resolver().url_patterns
+
+        for scope in IDEMPOTENT_SCOPES:
+            stats = get_idempotency_stats(scope)
+            self.stdout.write(
+                f"{scope}: {stats['hit']} hits, {stats['miss']} misses, "
+                f"{stats['conflict']} in-flight conflicts, "
+                f"hit ratio {stats['hit_ratio']:.1%}"
+            )
@@ -0,0 +1,135 @@
+"""
+Transactional email pipeline.
+
+Views queue a compact event once their transaction commits, and a Celery
+worker renders and sends each batch over one SMTP connection.
+"""
+
+import json
+from os import getenv
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.template.loader import get_template
+from django.utils.html import strip_tags
+from loguru import logger
+
+NOTIFICATION_MAX_RETRIES = int(getenv("NOTIFICATION_MAX_RETRIES", "5"))
+
+NOTIFICATION_RETRY_BACKOFF = int(getenv("NOTIFICATION_RETRY_BACKOFF", "10"))
+
+# The worker sends through the real backend, since EMAIL_BACKEND hands emails
+# to Celery again
+NOTIFICATION_EMAIL_BACKEND = getattr(
+    settings, "CELERY_EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"
+)
+
+EMAIL_TEMPLATES = [
+    "deposit_confirmation",
+    "withdrawal_confirmation",
+    "transfer_notification",
+    "transfer_otp_email",
+    "virtual_card_topup",
+]
+
+_compiled_templates: Dict[str, object] = {}
+
+_connection = None
+
+
+def email_event(template: str, subject: str, recipient: str, context: dict) -> dict:
+    return {
+        "template": template,
+        "subject": str(subject),
+        "to": recipient,
+        "context": json.loads(json.dumps(context, cls=DjangoJSONEncoder)),
+    }
+
+
+def queue_emails(*events: dict) -> None:
+    """
+    Hand the emails to the worker once the current transaction commits, as
+    one batch. Outside a transaction they are queued right away.
+    """
+    from .tasks import send_email_batch
+
+    events = list(events)
+
+    def publish() -> None:
+        # The money has already moved, a broker outage must not fail the request
+        try:
+            send_email_batch.delay(events)
+        except Exception as e:
+            logger.error(
+                f"Failed to queue {len(events)} emails "
+                f"({', '.join(event['template'] for event in events)}). Error: {str(e)}"
+            )
+
+    transaction.on_commit(publish)
+
+
+def get_compiled_template(name: str):
+    if name not in _compiled_templates:
+        _compiled_templates[name] = get_template(f"emails/{name}.html")
+    return _compiled_templates[name]
+
+
+def precompile_templates() -> None:
+    for name in EMAIL_TEMPLATES:
+        get_compiled_template(name)
+
+
+def _build_message(event: dict) -> EmailMultiAlternatives:
+    context = {**event["context"], "site_name": settings.SITE_NAME}
+    html_email = get_compiled_template(event["template"]).render(context)
+    message = EmailMultiAlternatives(
+        event["subject"],
+        strip_tags(html_email),
+        settings.DEFAULT_FROM_EMAIL,
+        [event["to"]],
+    )
+    message.attach_alternative(html_email, "text/html")
+    return message
+
+
+def _get_connection(reconnect: bool = False):
+    """The worker process's SMTP connection, opened once and reused."""
+    global _connection
+    if reconnect and _connection is not None:
+        _connection.close()
+        _connection = None
+    if _connection is None:
+        _connection = get_connection(NOTIFICATION_EMAIL_BACKEND)
+        _connection.open()
+    return _connection
+
+
+def _send(message: EmailMultiAlternatives) -> None:
+    try:
+        _get_connection().send_messages([message])
+    except Exception:
+        # The server may have dropped the idle connection, try once on a new one
+        _get_connection(reconnect=True).send_messages([message])
+
+
+def deliver_emails(events: List[dict]) -> List[dict]:
+    """Send the emails of a batch and return the events that failed."""
+    failed = []
+    for event in events:
+        try:
+            _send(_build_message(event))
+            logger.info(f"{event['template']} email sent to: {event['to']}")
+        except Exception as e:
+            logger.error(
+                f"Failed to send {event['template']} email to {event['to']}. "
+                f"Error: {str(e)}"
+            )
+            failed.append(event)
+    return failed
+
+
+def retry_countdown(retries: int) -> int:
+    return NOTIFICATION_RETRY_BACKOFF * 2**retries
@@ -1,30 +1,33 @@
+from typing import Dict, FrozenSet
+
 from rest_framework import permissions
 from rest_framework.request import Request
 from rest_framework.views import View
 
+from .role_claims import get_request_role
 
-class IsAccountExecutive(permissions.BasePermission):
-    def has_permission(self, request: Request, view: View) -> bool:
-        is_authenticated = request.user.is_authenticated
-        has_role_attr = hasattr(request.user, "role")
-        return (
-            is_authenticated
-            and has_role_attr
-            and request.user.role == "account_executive"
-        )
+# Which roles every staff permission lets through
+PERMISSION_MATRIX: Dict[str, FrozenSet[str]] = {
+    "account_executive": frozenset({"account_executive"}),
+    "teller": frozenset({"teller"}),
+    "branch_manager": frozenset({"branch_manager"}),
+}
 
 
-class IsTeller(permissions.BasePermission):
+class RolePermission(permissions.BasePermission):
+    permission_name: str
+
     def has_permission(self, request: Request, view: View) -> bool:
-        is_authenticated = request.user.is_authenticated
-        has_role_attr = hasattr(request.user, "role")
-        return is_authenticated and has_role_attr and request.user.role == "teller"
+        return get_request_role(request) in PERMISSION_MATRIX[self.permission_name]
 
 
-class IsBranchManager(permissions.BasePermission):
-    def has_permission(self, request: Request, view: View) -> bool:
-        is_authenticated = request.user.is_authenticated
-        has_role_attr = hasattr(request.user, "role")
-        return (
-            is_authenticated and has_role_attr and request.user.role == "branch_manager"
-        )
\ No newline at end of file
+class IsAccountExecutive(RolePermission):
+    permission_name = "account_executive"
+
+
+class IsTeller(RolePermission):
+    permission_name = "teller"
+
+
+class IsBranchManager(RolePermission):
+    permission_name = "branch_manager"
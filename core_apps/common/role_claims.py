@@ -0,0 +1,56 @@
+"""
+Role claims carried in the signed JWTs.
+
+Tokens issued before the user's role last changed fall back to the role on
+the user until they expire.
+
+The claim does not spare loading the user. Authentication still resolves it
+through the user cache, because throttles and CustomHeaderMiddleware read
+request.user on every request.
+"""
+
+import time
+from typing import Optional
+
+from django.core.cache import cache
+from rest_framework.request import Request
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+ROLE_CLAIM = "role"
+
+CACHE_PREFIX = "role_claims"
+
+
+def _stale_key(user_id) -> str:
+    return f"{CACHE_PREFIX}:changed:{user_id}"
+
+
+def add_role_claim(token: Token, user) -> None:
+    token[ROLE_CLAIM] = user.role
+
+
+def mark_claims_stale(user_id) -> None:
+    # Older access tokens have expired by the time the marker does
+    cache.set(
+        _stale_key(user_id),
+        time.time(),
+        int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+def _is_stale(token: Token) -> bool:
+    changed_at = cache.get(_stale_key(token.get(api_settings.USER_ID_CLAIM)))
+    return changed_at is not None and token.get("iat", 0) <= changed_at
+
+
+def get_request_role(request: Request) -> Optional[str]:
+    """The role of the request's user, read from its token whenever it can be."""
+    token = request.auth
+    if token is None:
+        return None
+    role = token.get(ROLE_CLAIM) if isinstance(token, Token) else None
+    if role is None or _is_stale(token):
+        user = request.user
+        return getattr(user, "role", None) if user.is_authenticated else None
+    return role
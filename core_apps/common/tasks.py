@@ -0,0 +1,31 @@
+from celery import shared_task
+from celery.exceptions import MaxRetriesExceededError
+from celery.signals import worker_process_init
+from loguru import logger
+
+from .notifications import (
+    NOTIFICATION_MAX_RETRIES,
+    deliver_emails,
+    precompile_templates,
+    retry_countdown,
+)
+
+
+@worker_process_init.connect
+def compile_email_templates(**kwargs):
+    precompile_templates()
+
+
+@shared_task(bind=True, max_retries=NOTIFICATION_MAX_RETRIES)
+def send_email_batch(self, events):
+    failed = deliver_emails(events)
+    if not failed:
+        return f"Sent {len(events)} emails"
+    try:
+        # Only the emails that failed are retried
+        raise self.retry(args=[failed], countdown=retry_countdown(self.request.retries))
+    except MaxRetriesExceededError:
+        logger.error(
+            f"Gave up on {len(failed)} emails after {self.request.retries} retries"
+        )
+        return f"Sent {len(events) - len(failed)} emails, {len(failed)} failed"
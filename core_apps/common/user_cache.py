@@ -0,0 +1,110 @@
+"""
+Two-level cache of the users that authenticated requests resolve to.
+
+A process-local dict lives AUTH_USER_LOCAL_TTL seconds, and the shared cache
+AUTH_USER_CACHE_TTL seconds or until the user is saved. Every request gets
+its own unpickled copy.
+"""
+
+import pickle
+import threading
+import time
+from collections import Counter
+from os import getenv
+from typing import Dict, Optional
+
+from django.core.cache import cache
+
+AUTH_USER_CACHE_TTL = int(getenv("AUTH_USER_CACHE_TTL", "300"))
+
+AUTH_USER_LOCAL_TTL = int(getenv("AUTH_USER_LOCAL_TTL", "5"))
+
+AUTH_USER_LOCAL_MAX_ENTRIES = int(getenv("AUTH_USER_LOCAL_MAX_ENTRIES", "10000"))
+
+# Counts are added to the shared totals in batches
+STATS_FLUSH_EVERY = int(getenv("AUTH_USER_STATS_FLUSH_EVERY", "100"))
+
+CACHE_PREFIX = "auth_user"
+
+STATS = ["local_hit", "shared_hit", "miss"]
+
+_local: Dict[tuple, tuple] = {}
+
+_local_lock = threading.Lock()
+
+_pending_stats = Counter()
+
+
+def _shared_key(user_id) -> str:
+    return f"{CACHE_PREFIX}:{user_id}"
+
+
+def _count(outcome: str) -> None:
+    with _local_lock:
+        _pending_stats[outcome] += 1
+        if sum(_pending_stats.values()) < STATS_FLUSH_EVERY:
+            return
+        counts = dict(_pending_stats)
+        _pending_stats.clear()
+    for name, count in counts.items():
+        key = f"{CACHE_PREFIX}:stats:{name}"
+        cache.add(key, 0, None)
+        cache.incr(key, count)
+
+
+def get_user_cache_stats() -> Dict[str, float]:
+    """Shared hit and miss totals of every process and the overall hit ratio."""
+    keys = {outcome: f"{CACHE_PREFIX}:stats:{outcome}" for outcome in STATS}
+    counts = cache.get_many(list(keys.values()))
+    stats = {outcome: counts.get(key, 0) for outcome, key in keys.items()}
+    lookups = sum(stats.values())
+    hits = stats["local_hit"] + stats["shared_hit"]
+    stats["hit_ratio"] = hits / lookups if lookups else 0.0
+    return stats
+
+
+def get_cached_user(user_id, jti: Optional[str]):
+    local_key = (str(user_id), jti)
+    now = time.monotonic()
+    with _local_lock:
+        entry = _local.get(local_key)
+    if entry is not None and entry[0] > now:
+        _count("local_hit")
+        return pickle.loads(entry[1])
+
+    data = cache.get(_shared_key(user_id))
+    if data is None:
+        _count("miss")
+        return None
+
+    _count("shared_hit")
+    _store_local(local_key, data, now)
+    return pickle.loads(data)
+
+
+def _store_local(local_key: tuple, data: bytes, now: float) -> None:
+    with _local_lock:
+        if len(_local) >= AUTH_USER_LOCAL_MAX_ENTRIES:
+            for key in [key for key, (expires, _) in _local.items() if expires <= now]:
+                del _local[key]
+            if len(_local) >= AUTH_USER_LOCAL_MAX_ENTRIES:
+                _local.clear()
+        _local[local_key] = (now + AUTH_USER_LOCAL_TTL, data)
+
+
+def cache_user(user, jti: Optional[str]) -> None:
+    fields_cache = user._state.fields_cache
+    user._state.fields_cache = {}
+    try:
+        data = pickle.dumps(user)
+    finally:
+        user._state.fields_cache = fields_cache
+    cache.set(_shared_key(user.pk), data, AUTH_USER_CACHE_TTL)
+    _store_local((str(user.pk), jti), data, time.monotonic())
+
+
+def invalidate_user(user_id) -> None:
+    cache.delete(_shared_key(user_id))
+    with _local_lock:
+        for key in [key for key in _local if key[0] == str(user_id)]:
+            del _local[key]
@@ -5,3 +5,6 @@ class UserAuthConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core_apps.user_auth'
     verbose_name = _('User Auth')
+
+    def ready(self) -> None:
+        import core_apps.user_auth.signals
@@ -0,0 +1,80 @@
+"""
+Failed login attempts per email and per client IP, counted in the cache.
+
+The user row is only written when an account actually gets locked.
+"""
+
+import time
+from os import getenv
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+LOGIN_ATTEMPT_WINDOW = int(getenv("LOGIN_ATTEMPT_WINDOW", "900"))
+
+LOGIN_WINDOW_BUCKETS = int(getenv("LOGIN_WINDOW_BUCKETS", "15"))
+
+LOGIN_IP_MAX_ATTEMPTS = int(getenv("LOGIN_IP_MAX_ATTEMPTS", "100"))
+
+CACHE_PREFIX = "login"
+
+
+def bucket_seconds() -> int:
+    return max(LOGIN_ATTEMPT_WINDOW // LOGIN_WINDOW_BUCKETS, 1)
+
+
+def _bucket_keys(name: str, now: float) -> list:
+    current_bucket = int(now // bucket_seconds())
+    return [
+        f"{CACHE_PREFIX}:{name}:{bucket}"
+        for bucket in range(current_bucket - LOGIN_WINDOW_BUCKETS + 1, current_bucket + 1)
+    ]
+
+
+def _window_total(name: str, add: int = 0, now: Optional[float] = None) -> int:
+    """Add ``add`` to the current bucket of ``name`` and return the window total."""
+    keys = _bucket_keys(name, now or time.time())
+    if add:
+        cache.add(keys[-1], 0, LOGIN_ATTEMPT_WINDOW + bucket_seconds())
+        cache.incr(keys[-1], add)
+    return sum(cache.get_many(keys).values())
+
+
+def _email_name(email: str) -> str:
+    return f"email:{(email or '').strip().lower()}"
+
+
+def _ip_name(ip: str) -> str:
+    return f"ip:{ip}"
+
+
+def record_failed_login(email: str, ip: Optional[str]) -> int:
+    """Count a failed login and return the failures of ``email`` in the window."""
+    if ip:
+        _window_total(_ip_name(ip), add=1)
+    return _window_total(_email_name(email), add=1)
+
+
+def failed_logins_from_ip(ip: str) -> int:
+    return _window_total(_ip_name(ip))
+
+
+def clear_failed_logins(email: str) -> None:
+    cache.delete_many(
+        _bucket_keys(_email_name(email), time.time())
+        + [f"{CACHE_PREFIX}:locked:{_email_name(email)}"]
+    )
+
+
+def lock_out(email: str) -> None:
+    cache.set(
+        f"{CACHE_PREFIX}:locked:{_email_name(email)}",
+        1,
+        int(settings.LOCKOUT_DURATION.total_seconds()),
+    )
+
+
+def is_locked_out(email: str) -> bool:
+    """Whether ``email`` was locked recently, answered without the database."""
+    return cache.get(f"{CACHE_PREFIX}:locked:{_email_name(email)}") is not None
@@ -0,0 +1,43 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core_apps.user_auth.refresh_tokens import (
+    issue_tokens,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Measure how many refresh token rotations one worker process can do per second"
+
+    def add_arguments(self, parser):
+        parser.add_argument("email", help="User whose tokens are rotated")
+        parser.add_argument(
+            "--iterations", type=int, default=1000, help="Rotations to run (default: 1000)"
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(email=options["email"]).first()
+        if user is None:
+            raise CommandError(f"No user with email {options['email']}")
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1")
+
+        _, refresh_token = issue_tokens(user)
+        started = time.perf_counter()
+        for _ in range(options["iterations"]):
+            _, refresh_token = rotate_refresh_token(refresh_token)
+        elapsed = time.perf_counter() - started
+        revoke_refresh_token(refresh_token)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{options['iterations']} rotations in {elapsed:.2f}s, "
+                f"{options['iterations'] / elapsed:.0f} refreshes per second per worker"
+            )
+        )
@@ -1,9 +1,34 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject
+
+
 class CustomHeaderMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        # Under ASGI the whole chain stays async instead of being adapted
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         response = self.get_response(request)
-        if request.user.is_authenticated:
-            response["X-Django-User"] = request.user.email
+        self._add_user_header(request.user, response)
         return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        user = request.user
+        if isinstance(user, SimpleLazyObject):
+            # DRF did not authenticate this request, load the session user
+            # without blocking the event loop
+            user = await request.auser()
+        self._add_user_header(user, response)
+        return response
+
+    def _add_user_header(self, user, response) -> None:
+        if user.is_authenticated:
+            response["X-Django-User"] = user.email
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.15 on 2026-10-18 22:57
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user_auth", "0002_alter_user_role"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="user",
+            name="otp",
+        ),
+        migrations.RemoveField(
+            model_name="user",
+            name="otp_expiry_time",
+        ),
+    ]
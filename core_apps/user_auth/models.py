@@ -8,6 +8,7 @@ from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from . import login_limiter, otp as otp_store
 from .emails import send_account_locked_email
 from .managers import UserManager
 
@@ -69,47 +70,63 @@ class User(AbstractUser):
     role = models.CharField(_("Role"), max_length=20, choices=RoleChoices.choices, default=RoleChoices.CUSTOMER)
     failed_login_attempts = models.PositiveSmallIntegerField(_("Failed Login Attempts"), default=0)
     last_failed_login = models.DateTimeField(_("Last Login Attempt"), blank=True, null=True)
-    otp = models.CharField(_("OTP"), max_length=6, blank=True)
-    otp_expiry_time = models.DateTimeField(_("OTP Expiry"), blank=True, null=True)
 
     objects = UserManager()
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["first_name", "last_name", "id_no", "security_questions", "security_answer"]
 
-    def set_otp(self, otp: str) -> None:
-        self.otp =  otp
-        self.otp_expiry_time = timezone.now() + settings.OTP_EXPIRATION
-        self.save()
-
-    def verify_otp(self, otp:str) -> bool:
-        if self.otp == otp and self.otp_expiry_time > timezone.now():
-            self.otp = ""
-            self.otp_expiry_time = None
-            self.save()
-            return True
-        return False
-
-    def handle_failed_login_attempts(self) -> None:
-        self.failed_login_attempts += 1
+    def set_otp(self, otp: str, purpose: str = otp_store.LOGIN) -> None:
+        otp_store.issue_otp(self.pk, purpose, otp)
+
+    def verify_otp(self, otp: str, purpose: str = otp_store.LOGIN) -> bool:
+        return otp_store.verify_otp(self.pk, purpose, otp)
+
+    def handle_failed_login_attempts(self, failed_attempts: int) -> None:
+        """
+        Lock the account once ``failed_attempts`` reaches LOGIN_ATTEMPTS. The
+        failures before that are only counted by the login limiter, so this is
+        the one write a failed login makes to the user row.
+        """
+        if (
+            failed_attempts < settings.LOGIN_ATTEMPTS
+            or self.account_status == self.AccountStatus.LOCKED
+        ):
+            return
+        self.failed_login_attempts = failed_attempts
         self.last_failed_login = timezone.now()
-        if self.failed_login_attempts >= settings.LOGIN_ATTEMPTS:
-            self.account_status = self.AccountStatus.LOCKED
-            self.save()
-            send_account_locked_email(self)
-        self.save()
+        self.account_status = self.AccountStatus.LOCKED
+        self.save(
+            update_fields=["failed_login_attempts", "last_failed_login", "account_status"]
+        )
+        send_account_locked_email(self)
 
     def reset_failed_login_attempts(self) -> None:
+        if (
+            self.failed_login_attempts == 0
+            and self.last_failed_login is None
+            and self.account_status == self.AccountStatus.ACTIVE
+        ):
+            return
         self.failed_login_attempts = 0
         self.last_failed_login = None
         self.account_status = self.AccountStatus.ACTIVE
-        self.save()
+        self.save(
+            update_fields=["failed_login_attempts", "last_failed_login", "account_status"]
+        )
 
     def unlock_account(self) -> None:
         if self.account_status == self.AccountStatus.LOCKED:
             self.account_status = self.AccountStatus.ACTIVE
             self.failed_login_attempts = 0
             self.last_failed_login = None
-            self.save()
+            self.save(
+                update_fields=[
+                    "failed_login_attempts",
+                    "last_failed_login",
+                    "account_status",
+                ]
+            )
+            login_limiter.clear_failed_logins(self.email)
 
     @property
     def is_locked_out(self) -> bool:
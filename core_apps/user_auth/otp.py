@@ -0,0 +1,64 @@
+"""
+One-time passwords, stored in the cache as an HMAC of the code.
+
+A code can only be used once, and too many wrong guesses burn it.
+"""
+
+import hashlib
+import hmac
+from os import getenv
+
+from django.conf import settings
+from django.core.cache import cache
+
+LOGIN = "login"
+
+TRANSACTION = "transaction"
+
+PAYMENT_BATCH = "payment_batch"
+
+OTP_MAX_ATTEMPTS = int(getenv("OTP_MAX_ATTEMPTS", "5"))
+
+CACHE_PREFIX = "otp"
+
+
+def payment_batch_purpose(batch_id) -> str:
+    """Each payment batch has its own code, apart from single transfers."""
+    return f"{PAYMENT_BATCH}:{batch_id}"
+
+
+def _key(user_id, purpose: str) -> str:
+    return f"{CACHE_PREFIX}:{purpose}:{user_id}"
+
+
+def _digest(user_id, purpose: str, otp: str) -> str:
+    message = f"{purpose}:{user_id}:{otp}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def _timeout() -> int:
+    return int(settings.OTP_EXPIRATION.total_seconds())
+
+
+def issue_otp(user_id, purpose: str, otp: str) -> None:
+    """Store a new code for the user, replacing any earlier one."""
+    key = _key(user_id, purpose)
+    cache.set(key, _digest(user_id, purpose, otp), _timeout())
+    cache.delete(f"{key}:attempts")
+
+
+def verify_otp(user_id, purpose: str, otp: str) -> bool:
+    key = _key(user_id, purpose)
+    stored = cache.get(key)
+    if stored is None:
+        return False
+
+    if not hmac.compare_digest(stored, _digest(user_id, purpose, otp)):
+        attempts_key = f"{key}:attempts"
+        cache.add(attempts_key, 0, _timeout())
+        if cache.incr(attempts_key) >= OTP_MAX_ATTEMPTS:
+            cache.delete_many([key, attempts_key])
+        return False
+
+    # Only the request that deletes the code gets to use it
+    return bool(cache.delete(key))
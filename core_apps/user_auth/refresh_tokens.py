@@ -0,0 +1,110 @@
+"""
+Refresh token rotation with reuse detection.
+
+Every token belongs to a family started at login. Presenting an already
+rotated token revokes the whole family, as does logging out.
+"""
+
+import time
+import uuid
+from typing import Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core_apps.common.role_claims import add_role_claim
+from core_apps.common.user_cache import cache_user, get_cached_user
+
+User = get_user_model()
+
+FAMILY_CLAIM = "fid"
+
+CACHE_PREFIX = "refresh"
+
+
+def _used_key(jti: str) -> str:
+    return f"{CACHE_PREFIX}:used:{jti}"
+
+
+def _revoked_key(family: str) -> str:
+    return f"{CACHE_PREFIX}:revoked:{family}"
+
+
+def _family_timeout() -> int:
+    # A family outlives its last rotation by at most one refresh token lifetime
+    return int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def _remaining_lifetime(token: RefreshToken) -> int:
+    return max(int(token[api_settings.TOKEN_EXP_CLAIM] - time.time()), 1)
+
+
+def issue_tokens(user) -> Tuple[str, str]:
+    """Start a new token family for the user and return its access and refresh tokens."""
+    refresh = RefreshToken.for_user(user)
+    refresh[FAMILY_CLAIM] = uuid.uuid4().hex
+    add_role_claim(refresh, user)
+    return str(refresh.access_token), str(refresh)
+
+
+def revoke_family(family: str) -> None:
+    cache.set(_revoked_key(family), 1, _family_timeout())
+
+
+def revoke_refresh_token(raw_token: str) -> None:
+    """Revoke the family of a refresh token, ignoring tokens that are already invalid."""
+    try:
+        refresh = RefreshToken(raw_token)
+    except TokenError:
+        return
+    revoke_family(refresh.get(FAMILY_CLAIM) or refresh[api_settings.JTI_CLAIM])
+
+
+def _get_active_user(user_id):
+    user = get_cached_user(user_id, None)
+    if user is None:
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).first()
+        if user is None:
+            raise TokenError(_("User not found"))
+        cache_user(user, None)
+    if not user.is_active or user.account_status == User.AccountStatus.LOCKED:
+        raise TokenError(_("User is inactive"))
+    return user
+
+
+def rotate_refresh_token(raw_token: str) -> Tuple[str, str]:
+    """
+    Exchange a refresh token for a new access and refresh token pair.
+
+    Raises TokenError when the token is invalid or expired, its family has
+    been revoked, it has already been used, or its user can no longer log in.
+    """
+    refresh = RefreshToken(raw_token)
+    jti = refresh[api_settings.JTI_CLAIM]
+    # Tokens issued before families existed start one of their own
+    family = refresh.get(FAMILY_CLAIM) or jti
+
+    if cache.get(_revoked_key(family)) is not None:
+        raise TokenError(_("Token is revoked"))
+
+    # Only the first request to present a token gets to rotate it
+    if not cache.add(_used_key(jti), family, _remaining_lifetime(refresh)):
+        revoke_family(family)
+        raise TokenError(_("Token has already been used"))
+
+    user = _get_active_user(refresh[api_settings.USER_ID_CLAIM])
+    add_role_claim(refresh, user)
+
+    access_token = str(refresh.access_token)
+    refresh.set_jti()
+    refresh.set_exp()
+    refresh.set_iat()
+    refresh[FAMILY_CLAIM] = family
+    return access_token, str(refresh)
+
@@ -0,0 +1,41 @@
+from typing import Any, Type
+
+from django.db import transaction
+from django.db.models.base import Model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.settings.base import AUTH_USER_MODEL
+from core_apps.common.role_claims import mark_claims_stale
+from core_apps.common.user_cache import invalidate_user
+
+
+@receiver(post_save, sender=AUTH_USER_MODEL)
+@receiver(post_delete, sender=AUTH_USER_MODEL)
+def invalidate_cached_user(sender: Type[Model], instance: Model, **kwargs: Any) -> None:
+    """
+    Lockouts, unlocks and status changes all go through save(), so dropping
+    the cached user here keeps authentication from serving a stale one. It is
+    dropped once the save commits, otherwise a concurrent request could cache
+    the old row again. QuerySet.update() sends no signal, so code updating
+    users in bulk must call invalidate_user itself.
+    """
+    pk = instance.pk
+    transaction.on_commit(lambda: invalidate_user(pk))
+
+
+@receiver(post_save, sender=AUTH_USER_MODEL)
+@receiver(post_delete, sender=AUTH_USER_MODEL)
+def invalidate_role_claims(
+    sender: Type[Model], instance: Model, update_fields=None, **kwargs: Any
+) -> None:
+    """
+    Tokens minted before a change to the user's role or access stop being
+    trusted for role checks. Saves limited to other fields leave them alone.
+    """
+    if update_fields is not None and not (
+        {"role", "is_active", "account_status"} & set(update_fields)
+    ):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: mark_claims_stale(pk))
@@ -0,0 +1,24 @@
+from rest_framework.throttling import BaseThrottle
+
+from .login_limiter import (
+    LOGIN_IP_MAX_ATTEMPTS,
+    bucket_seconds,
+    failed_logins_from_ip,
+)
+
+
+class LoginAttemptThrottle(BaseThrottle):
+    """
+    Refuse login requests from an IP with too many recent failed attempts.
+
+    Unlike AnonRateThrottle, which keeps and rewrites a list of request
+    timestamps per client, this reads the bucketed failure counters of the
+    login limiter, so a burst of attempts costs a fixed number of cache calls
+    and successful logins are never counted against the client.
+    """
+
+    def allow_request(self, request, view) -> bool:
+        return failed_logins_from_ip(self.get_ident(request)) < LOGIN_IP_MAX_ATTEMPTS
+
+    def wait(self) -> float:
+        return bucket_seconds()
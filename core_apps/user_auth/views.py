@@ -1,7 +1,6 @@
 from typing import Any, Optional
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.utils import timezone
 from djoser.views import TokenCreateView
 from djoser.views import User
 from loguru import logger
@@ -9,10 +8,12 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.views import TokenRefreshView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
+from . import login_limiter
 from .emails import send_otp_email
+from .refresh_tokens import issue_tokens, revoke_refresh_token, rotate_refresh_token
+from .throttling import LoginAttemptThrottle
 from .utils import generate_otp
 
 User = get_user_model()
@@ -44,18 +45,25 @@ def set_auth_cookies(
     response.set_cookie("logged_in", "true", **logged_in_cookie_settings)
 
 
+def locked_out_response() -> Response:
+    return Response(
+        {
+            "error": f"Account is locked due to multiple failed login attempts. Please "
+            f"try again after {settings.LOCKOUT_DURATION.total_seconds() / 60} minutes. ",
+        },
+        status=status.HTTP_403_FORBIDDEN,
+    )
+
+
 class CustomTokenCreateView(TokenCreateView):
+    throttle_classes = [LoginAttemptThrottle]
+
     def _action(self, serializer):
         user = serializer.user
         if user.is_locked_out:
-            return Response(
-                {
-                    "error": f"Account is locked due to multiple failed login attempts. Please "
-                    f"try again after {settings.LOCKOUT_DURATION.total_seconds() / 60} minutes. ",
-                },
-                status=status.HTTP_403_FORBIDDEN,
-            )
+            return locked_out_response()
         user.reset_failed_login_attempts()
+        login_limiter.clear_failed_logins(user.email)
 
         otp = generate_otp()
         user.set_otp(otp)
@@ -72,30 +80,37 @@ class CustomTokenCreateView(TokenCreateView):
         )
 
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        email = request.data.get("email")
+        # A recently locked account is refused before checking the password
+        if email and login_limiter.is_locked_out(email):
+            return locked_out_response()
+
         serializer = self.get_serializer(data=request.data)
 
         try:
             serializer.is_valid(raise_exception=True)
         except Exception:
-            email = request.data.get("email")
-            user = User.objects.filter(email=email).first()
+            failed_attempts = login_limiter.record_failed_login(
+                email, LoginAttemptThrottle().get_ident(request)
+            )
+            logger.error(f"Failed login attempts: {failed_attempts}  for user: {email}")
+            # The user row is only loaded and written when the account gets locked
+            user = None
+            if failed_attempts >= settings.LOGIN_ATTEMPTS:
+                user = User.objects.filter(email=email).first()
             if user:
-                user.handle_failed_login_attempts()
-                failed_attempts = user.failed_login_attempts
-                logger.error(
-                    f"Failed login attempts: {failed_attempts}  for user: {email}"
+                user.handle_failed_login_attempts(failed_attempts)
+                login_limiter.lock_out(email)
+                return Response(
+                    {
+                        "error": f"You have exceeded the maximum number of login attempts. "
+                                 f"Your account has been locked for "
+                                 f"{settings.LOCKOUT_DURATION.total_seconds() / 60} minutes. "
+                                 f"An email has been sent to you with further instructions",
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
                 )
-                if failed_attempts >= settings.LOGIN_ATTEMPTS:
-                    return Response(
-                        {
-                            "error": f"You have exceeded the maximum number of login attempts. "
-                                     f"Your account has been locked for "
-                                     f"{settings.LOCKOUT_DURATION.total_seconds() / 60} minutes. "
-                                     f"An email has been sent to you with further instructions",
-                        },
-                        status=status.HTTP_403_FORBIDDEN,
-                    )
-            else:
+            elif failed_attempts >= settings.LOGIN_ATTEMPTS:
                 logger.error(f"Failed login attempt for non-existent user: {email}")
 
             return Response(
@@ -104,75 +119,64 @@ class CustomTokenCreateView(TokenCreateView):
             )
         return self._action(serializer)
 
-class CustomTokenRefreshView(TokenRefreshView):
-    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        refresh_token = request.COOKIES.get("refresh")
+class CustomTokenRefreshView(APIView):
+    """
+    Rotate the refresh token from the cookie (or the request body) and set the
+    new token pair as cookies. Reusing a rotated token revokes its whole family.
+    """
 
-        if refresh_token:
-            request.data["refresh"] = refresh_token
-
-        refresh_res = super().post(request, *args, **kwargs)
-
-        if refresh_res.status_code == status.HTTP_200_OK:
-            access_token = refresh_res.data.get("access")
-            refresh_token = refresh_res.data.get("refresh")
-
-            if access_token and refresh_token:
-                set_auth_cookies(
-                    refresh_res,
-                    access_token=access_token,
-                    refresh_token=refresh_token,
-                )
-
-                refresh_res.data.pop("access", None)
-                refresh_res.data.pop("refresh", None)
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
 
-                refresh_res.data["message"] = "Access tokens refreshed successfully."
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        raw_token = request.COOKIES.get("refresh") or request.data.get("refresh")
+        if not raw_token:
+            return Response(
+                {"detail": "Refresh token not provided"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
 
-            else:
-                refresh_res.data["message"] = (
-                    "Access or refresh token not found in refresh response data"
-                )
-                logger.error(
-                    "Access or refresh token not found in refresh response data"
-                )
+        try:
+            access_token, refresh_token = rotate_refresh_token(raw_token)
+        except TokenError as e:
+            logger.warning(f"Refresh token rejected: {str(e)}")
+            raise InvalidToken(e.args[0])
 
-        return refresh_res
+        response = Response(
+            {"message": "Access tokens refreshed successfully."},
+            status=status.HTTP_200_OK,
+        )
+        set_auth_cookies(
+            response, access_token=access_token, refresh_token=refresh_token
+        )
+        return response
 
 
 class OTPVerifyView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginAttemptThrottle]
 
     def post(self, request):
         otp = request.data.get("otp")
+        email = request.data.get("email")
 
-        if not otp:
+        if not otp or not email:
             return Response(
-                {"error": "OTP is required"},
+                {"error": "Email and OTP are required"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        user = User.objects.filter(otp=otp, otp_expiry_time__gt=timezone.now()).first()
+        # The code is looked up by its owner, never by scanning for the code
+        user = User.objects.filter(email=email).first()
 
-        if not user:
+        if not user or not user.verify_otp(otp):
             return Response(
                 {"error": "Invalid or expired OTP"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
         if user.is_locked_out:
-            return Response(
-                {
-                    "error": f"Account is locked due to multiple failed login attempts. "
-                             f"Please try again after "
-                             f"{settings.LOCKOUT_DURATION.total_seconds() / 60} minutes "
-                },
-                status=status.HTTP_403_FORBIDDEN,
-            )
+            return locked_out_response()
 
-        user.verify_otp(otp)
-
-        refresh = RefreshToken.for_user(user)
-        access_token = str(refresh.access_token)
-        refresh_token = str(refresh)
+        access_token, refresh_token = issue_tokens(user)
 
         response = Response(
             {
@@ -188,6 +192,10 @@ class OTPVerifyView(APIView):
 
 class LogoutAPIView(APIView):
     def post(self, request, *args, **kwargs):
+        refresh_token = request.COOKIES.get("refresh")
+        if refresh_token:
+            revoke_refresh_token(refresh_token)
+
         response = Response(status=status.HTTP_204_NO_CONTENT)
         response.delete_cookie("access")
         response.delete_cookie("refresh")
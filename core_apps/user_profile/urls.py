@@ -4,12 +4,18 @@ from .views import (
     NextOfKinAPIView,
     NextOfKinDetailAPIView,
     ProfileDetailAPIView,
+    ProfileDetailAsyncView,
     ProfileListAPIView,
 )
 
 urlpatterns = [
     path("all/", ProfileListAPIView.as_view(), name="all_profiles"),
     path("my-profile/", ProfileDetailAPIView.as_view(), name="profile_detail"),
+    path(
+        "my-profile/async/",
+        ProfileDetailAsyncView.as_view(),
+        name="profile_detail_async",
+    ),
     path(
         "my-profile/next-of-kin/", NextOfKinAPIView.as_view(), name="next-of-kin-list"
     ),
@@ -1,5 +1,6 @@
 from typing import Any, List
 
+from asgiref.sync import sync_to_async
 from django.db import transaction
 from django.contrib.contenttypes.models import ContentType
 from django.http import Http404
@@ -13,6 +14,8 @@ from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.request import Request
 
+from core_apps.common.async_views import AsyncAPIView
+from core_apps.common.db_router import read_from_replica
 from core_apps.common.models import ContentView
 from core_apps.common.permissions import IsBranchManager
 from core_apps.accounts.utils import create_bank_account
@@ -22,6 +25,15 @@ from .models import NextOfKin, Profile
 from .serializers import NextOfKinSerializer, ProfileListSerializer, ProfileSerializer
 
 
+def get_client_ip(request: Request) -> str:
+    x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+    if x_forwarded_for:
+        ip = x_forwarded_for.split(",")[0]
+    else:
+        ip = request.META.get("REMOTE_ADDR")
+    return ip
+
+
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
@@ -60,6 +72,10 @@ class ProfileListAPIView(generics.ListAPIView):
             user__is_superuser=True
         )
 
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        with read_from_replica():
+            return super().list(request, *args, **kwargs)
+
 
 class ProfileDetailAPIView(generics.RetrieveUpdateAPIView):
     serializer_class = ProfileSerializer
@@ -91,12 +107,7 @@ class ProfileDetailAPIView(generics.RetrieveUpdateAPIView):
         )
 
     def get_client_ip(self) -> str:
-        x_forwarded_for = self.request.META.get("HTTP_X_FORWARDED_FOR")
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(",")[0]
-        else:
-            ip = self.request.META.get("REMOTE_ADDR")
-        return ip
+        return get_client_ip(self.request)
 
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         instance = self.get_object()
@@ -165,6 +176,44 @@ class ProfileDetailAPIView(generics.RetrieveUpdateAPIView):
     def perform_update(self, serializer: ProfileSerializer) -> None:
         serializer.save()
 
+
+class ProfileDetailAsyncView(AsyncAPIView):
+    """
+    Async variant of the profile read of ProfileDetailAPIView, for ASGI
+    servers. Serializing the profile still queries its next of kin and view
+    count, so it runs on a worker thread.
+    """
+
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "profile"
+
+    async def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        profile = await (
+            Profile.objects.select_related("user")
+            .filter(user=request.user)
+            .afirst()
+        )
+        if profile is None:
+            raise Http404("Profile does not exist")
+
+        content_type = await sync_to_async(ContentType.objects.get_for_model)(profile)
+        await ContentView.objects.aupdate_or_create(
+            content_type=content_type,
+            object_id=profile.id,
+            user=request.user,
+            viewer_ip=get_client_ip(request),
+            defaults={
+                "last_viewed": timezone.now(),
+            },
+        )
+
+        serializer = ProfileSerializer(profile, context=self.get_serializer_context())
+        return Response(await sync_to_async(lambda: serializer.data)())
+
+    def get_serializer_context(self) -> dict:
+        return {"request": self.request, "format": self.format_kwarg, "view": self}
+
+
 class NextOfKinAPIView(generics.ListCreateAPIView):
     serializer_class = NextOfKinSerializer
     pagination_class = StandardResultsSetPagination
@@ -0,0 +1,21 @@
+#!/bin/bash
+
+set -o errexit
+
+set -o pipefail
+
+set -o nounset
+
+python manage.py migrate --no-input
+python manage.py collectstatic --no-input
+
+# Without Redis each worker has its own LocMem cache, so OTPs, login limits and
+# sticky reads would not be shared between workers
+if [ -z "${REDIS_CACHE_URL:-}" ]; then
+    ASGI_WORKERS=1
+fi
+
+exec gunicorn config.asgi:application \
+    --bind 0.0.0.0:8000 \
+    --worker-class uvicorn.workers.UvicornWorker \
+    --workers "${ASGI_WORKERS:-2}"
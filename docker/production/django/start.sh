@@ -0,0 +1,13 @@
+#!/bin/bash
+
+set -o errexit
+
+set -o pipefail
+
+set -o nounset
+
+export DJANGO_SETTINGS_MODULE=config.settings.production
+
+python manage.py migrate --no-input
+python manage.py collectstatic --no-input
+exec gunicorn config.wsgi:application --config config/gunicorn.py